@@ -0,0 +1,232 @@
+# azothbot/analytics_snapshot.py
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from supabase_client import supabase
+
+# Local mirror of the analytics tables, for exploring balance data without
+# running heavy queries against production.
+SNAPSHOT_PATH = os.getenv(
+	"ANALYTICS_SNAPSHOT_PATH",
+	os.path.join(os.path.dirname(__file__), "analytics_snapshot.sqlite3"),
+)
+
+# table -> (primary key, watermark column). Each sync pulls rows past the last
+# (watermark, key) seen; rows with no watermark yet (e.g. unfinished games) are
+# picked up once they get one. A row only comes back if its watermark moves
+# forward, so the watermark must change whenever the row does: games are
+# written once when they finish, and drafts, draft_items and boss_fights are
+# append-only game logs (they have no updated_at), so created_at covers them.
+SNAPSHOT_TABLES = {
+	"games": ("uuid", "finished_at"),
+	"drafts": ("uuid", "created_at"),
+	"draft_items": ("id", "created_at"),
+	"boss_fights": ("id", "created_at"),
+}
+# Rows fetched per request and written per SQLite transaction (the cursor
+# advances after each). At most supabase_helpers.MAX_PAGE_SIZE.
+SYNC_BATCH_SIZE = 500
+
+# Canned local queries: name -> (title, SQL). `:version` may be NULL for all versions.
+LOCAL_QUERIES = {
+	"pick_rates": (
+		"Pick Rates",
+		"""
+		SELECT di.item_type, di.item_id, COUNT(*) AS offered, SUM(di.picked) AS picked,
+			ROUND(1.0 * SUM(di.picked) / COUNT(*), 3) AS pick_rate
+		FROM draft_items di
+		JOIN drafts d ON d.uuid = di.draft_uuid
+		JOIN games g ON g.uuid = d.game_uuid
+		WHERE (:version IS NULL OR g.version = :version)
+		GROUP BY di.item_type, di.item_id
+		HAVING COUNT(*) >= 2
+		ORDER BY pick_rate DESC, offered DESC
+		""",
+	),
+	"game_results": (
+		"Game Results",
+		"""
+		SELECT g.version, g.result, COUNT(*) AS games,
+			ROUND(AVG(g.level_reached), 2) AS avg_level, MAX(g.highest_combo) AS best_combo
+		FROM games g
+		WHERE (:version IS NULL OR g.version = :version)
+		GROUP BY g.version, g.result
+		ORDER BY g.version DESC, games DESC
+		""",
+	),
+	"daily_activity": (
+		"Daily Activity (UTC)",
+		"""
+		SELECT substr(g.finished_at, 1, 10) AS day, COUNT(*) AS games,
+			COUNT(DISTINCT g.player_uuid) AS players, MAX(g.highest_combo) AS best_combo
+		FROM games g
+		WHERE (:version IS NULL OR g.version = :version)
+		GROUP BY day
+		ORDER BY day DESC
+		""",
+	),
+	"boss_fights": (
+		"Boss Fights",
+		"""
+		SELECT b.result, COUNT(*) AS fights
+		FROM boss_fights b
+		GROUP BY b.result
+		ORDER BY fights DESC
+		""",
+	),
+}
+
+
+def _quote(name: str) -> str:
+	"""Quote an identifier taken from row data."""
+	return '"' + name.replace('"', '""') + '"'
+
+
+def _filter_value(value) -> str:
+	"""Quote a value for a PostgREST logical (or / and) filter."""
+	return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _to_sqlite(value):
+	if isinstance(value, (dict, list)):
+		return json.dumps(value)
+	if isinstance(value, bool):
+		return int(value)
+	return value
+
+
+class SnapshotStore:
+	"""
+	SQLite mirror of SNAPSHOT_TABLES, synced incrementally by (watermark, key).
+	Local tables take their columns from the synced rows (new columns are
+	added as they appear) and are upserted by primary key, so re-syncing
+	overlapping rows is harmless.
+	"""
+
+	def __init__(self, path: str = SNAPSHOT_PATH, tables: dict = None):
+		self.tables = dict(SNAPSHOT_TABLES if tables is None else tables)
+		self._conn = sqlite3.connect(path, check_same_thread=False)
+		self._conn.row_factory = sqlite3.Row
+		self._lock = threading.Lock()
+		self._columns: dict[str, set[str]] = {}
+		with self._lock, self._conn:
+			self._conn.execute(
+				"CREATE TABLE IF NOT EXISTS _snapshot_meta ("
+				" table_name TEXT PRIMARY KEY, watermark TEXT, last_key TEXT, synced_at TEXT, row_count INTEGER)"
+			)
+			columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(_snapshot_meta)")}
+			if "last_key" not in columns:
+				self._conn.execute("ALTER TABLE _snapshot_meta ADD COLUMN last_key TEXT")
+
+	def _ensure_columns(self, table: str, key: str, rows: list[dict]):
+		columns = self._columns.get(table)
+		if columns is None:
+			existing = self._conn.execute(f"PRAGMA table_info({_quote(table)})").fetchall()
+			columns = self._columns[table] = {row["name"] for row in existing}
+		needed = {column for row in rows for column in row}
+		if not columns:
+			rest = sorted(needed - {key})
+			column_defs = ", ".join([f"{_quote(key)} PRIMARY KEY"] + [_quote(c) for c in rest])
+			self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({column_defs})")
+			columns.update(needed | {key})
+			return
+		for column in sorted(needed - columns):
+			self._conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)}")
+			columns.add(column)
+
+	def _write_batch(self, table: str, key: str, cursor: tuple, rows: list[dict]):
+		"""Upsert one page and move the table's cursor to its last (watermark, key)."""
+		with self._lock, self._conn:
+			self._ensure_columns(table, key, rows)
+			for row in rows:
+				columns = list(row)
+				self._conn.execute(
+					f"INSERT OR REPLACE INTO {_quote(table)} ({', '.join(_quote(c) for c in columns)}) "
+					f"VALUES ({', '.join('?' for _ in columns)})",
+					[_to_sqlite(row[c]) for c in columns],
+				)
+			watermark, last_key = cursor
+			self._conn.execute(
+				"INSERT INTO _snapshot_meta (table_name, watermark, last_key, synced_at, row_count)"
+				f" VALUES (?, ?, ?, ?, (SELECT COUNT(*) FROM {_quote(table)}))"
+				" ON CONFLICT(table_name) DO UPDATE SET watermark = excluded.watermark, last_key = excluded.last_key,"
+				" synced_at = excluded.synced_at, row_count = excluded.row_count",
+				(table, watermark, last_key, datetime.now(timezone.utc).isoformat()),
+			)
+
+	def cursor(self, table: str) -> tuple[str | None, str | None]:
+		"""(watermark, key) of the last row synced, or (None, None) before the first sync."""
+		row = self._conn.execute("SELECT watermark, last_key FROM _snapshot_meta WHERE table_name = ?", (table,)).fetchone()
+		return (row["watermark"], row["last_key"]) if row else (None, None)
+
+	def sync_table(self, table: str) -> int:
+		"""Pull rows changed since the table's cursor. Returns rows written. Blocking."""
+		key, watermark_column = self.tables[table]
+
+		def fetch(since, since_key) -> list[dict]:
+			query = supabase.table(table).select("*")
+			if since is None:
+				query = query.not_.is_(watermark_column, "null")
+			elif since_key is None:
+				# Cursor saved before keys were stored: re-read the boundary timestamp once
+				query = query.gte(watermark_column, since)
+			else:
+				# Keyset on (watermark, key), so rows sharing a timestamp are neither skipped nor re-read
+				since, since_key = _filter_value(since), _filter_value(since_key)
+				query = query.or_(
+					f"{watermark_column}.gt.{since},and({watermark_column}.eq.{since},{key}.gt.{since_key})"
+				)
+			return query.order(watermark_column).order(key).limit(SYNC_BATCH_SIZE).execute().data or []
+
+		# Read until a page comes back empty: a short page may just be the server's
+		# max-rows cap. The next page is fetched while the current one is written.
+		written = 0
+		executor = ThreadPoolExecutor(max_workers=1)
+		try:
+			rows = fetch(*self.cursor(table))
+			while rows:
+				cursor = (rows[-1][watermark_column], rows[-1][key])
+				pending = executor.submit(fetch, *cursor)
+				self._write_batch(table, key, cursor, rows)
+				written += len(rows)
+				rows = pending.result()
+		finally:
+			executor.shutdown(wait=False, cancel_futures=True)
+		return written
+
+	def sync_all(self) -> dict[str, int]:
+		"""Sync every snapshot table in turn. Returns rows written per table. Blocking."""
+		return {table: self.sync_table(table) for table in self.tables}
+
+	def status(self) -> list[dict]:
+		rows = self._conn.execute("SELECT * FROM _snapshot_meta ORDER BY table_name").fetchall()
+		return [dict(row) for row in rows]
+
+	def query(self, sql: str, params: dict | tuple = ()) -> list[dict]:
+		"""Run a read query against the snapshot. Blocking."""
+		with self._lock:
+			rows = self._conn.execute(sql, params).fetchall()
+		return [dict(row) for row in rows]
+
+	def run_local_query(self, name: str, version: str = None, limit: int = None, offset: int = 0) -> list[dict]:
+		"""One page of a LOCAL_QUERIES result."""
+		_title, sql = LOCAL_QUERIES[name]
+		params = {"version": version}
+		if limit is not None:
+			sql += " LIMIT :limit OFFSET :offset"
+			params.update(limit=limit, offset=offset)
+		return self.query(sql, params)
+
+
+_snapshot: SnapshotStore | None = None
+
+
+def get_snapshot() -> SnapshotStore:
+	"""The process-wide snapshot store, opened on first use."""
+	global _snapshot
+	if _snapshot is None:
+		_snapshot = SnapshotStore()
+	return _snapshot
@@ -1,4 +1,6 @@
 from nextcord.ext import commands
+from http_session import get_http_session
+from item_names import item_names
 
 # Import command modules
 from .decks import add_deck_commands
@@ -9,11 +11,17 @@ from .events import add_event_commands
 from .stats import add_stats_commands
 from .misc import add_misc_commands
 from .daily_update import add_daily_update_commands
+from .regen_job import add_regen_commands
 
 
 class AzothCommands(commands.Cog):
 	def __init__(self, bot):
 		self.bot = bot
+		# Warm the shared HTTP pool before the first command needs it
+		bot.loop.create_task(get_http_session())
+		# Load content names once so reports / autocomplete skip per-id lookups
+		bot.loop.create_task(item_names.warm_async())
+		# The shared sessions are closed by AzothBot.close (bot.py), which is awaited at shutdown
 
 # Attach commands to the Cog
 add_deck_commands(AzothCommands)
@@ -24,3 +32,4 @@ add_event_commands(AzothCommands)
 add_stats_commands(AzothCommands)
 add_misc_commands(AzothCommands)
 add_daily_update_commands(AzothCommands)
+add_regen_commands(AzothCommands)
@@ -0,0 +1,170 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from supabase_client import supabase
+from supabase_helpers import execute_async, aiter_query
+from azoth_commands.activity_stats import (
+    REPORT_QUERY_CONCURRENCY,
+    today_cst,
+    day_range_utc,
+    fetch_day_partials,
+    fetch_range_partials,
+    merge_day_rows,
+    finalize_summary,
+    draft_stats_from_items,
+    resolve_item_names,
+)
+
+# Per-day rollups (sql/daily_rollups.sql). A finished CST day is scanned once and
+# stored here; reports then read one summary row plus that day's item rows.
+ROLLUP_TABLE = "daily_activity_rollups"
+ITEM_ROLLUP_TABLE = "daily_item_rollups"
+
+# Rows per upsert request when storing a day's item partials
+ITEM_UPSERT_CHUNK = 500
+# Days scanned at once during a backfill (each scan fans out its own queries)
+BACKFILL_CONCURRENCY = 2
+
+
+async def load_rollups(days: list[date]) -> dict[str, tuple[dict, list[dict]]]:
+    """Stored rollups for `days`, keyed by ISO date -> (day_row, item_rows).
+
+    Days without a summary row are absent, even if some item rows exist (a
+    store that was interrupted before it completed).
+    """
+    if not days:
+        return {}
+    day_keys = [d.isoformat() for d in days]
+
+    def item_query():
+        # Ordered by the primary key so range pages are stable
+        return (
+            supabase.table(ITEM_ROLLUP_TABLE)
+            .select("day, item_type, item_id, offered, picked, score_sum, score_count")
+            .in_("day", day_keys)
+            .order("day").order("item_type").order("item_id")
+        )
+
+    async def load_items() -> list[dict]:
+        return [row async for row in aiter_query(item_query, prefetch=True)]
+
+    day_rows, item_rows = await asyncio.gather(
+        execute_async(
+            supabase.table(ROLLUP_TABLE)
+            .select("day, summary, player_uuids, has_null_player, total_drafts")
+            .in_("day", day_keys)
+        ),
+        load_items(),
+    )
+
+    items_by_day = {}
+    for row in item_rows:
+        items_by_day.setdefault(row["day"], []).append(row)
+    return {row["day"]: (row, items_by_day.get(row["day"], [])) for row in day_rows}
+
+
+async def store_rollup(day_row: dict, item_rows: list[dict]):
+    """Store a day's rollup, replacing any stored before. Idempotent.
+
+    The old summary row is removed first and the new one written last, so a day
+    only counts as rolled up once all of its items are stored. Old item rows are
+    deleted before the new ones go in, so an item that no longer appears on
+    recompute doesn't keep its stale counts.
+    """
+    day = day_row["day"]
+    await execute_async(supabase.table(ROLLUP_TABLE).delete().eq("day", day))
+    await execute_async(supabase.table(ITEM_ROLLUP_TABLE).delete().eq("day", day))
+
+    rows = [{**row, "day": day} for row in item_rows]
+    for i in range(0, len(rows), ITEM_UPSERT_CHUNK):
+        await execute_async(supabase.table(ITEM_ROLLUP_TABLE).upsert(rows[i:i + ITEM_UPSERT_CHUNK]))
+
+    await execute_async(
+        supabase.table(ROLLUP_TABLE).upsert({
+            **day_row,
+            "computed_at": datetime.now(timezone.utc).isoformat(),
+        })
+    )
+
+
+async def _compute_and_store(day: date, sem: asyncio.Semaphore) -> tuple[dict, list[dict]]:
+    day_row, item_rows = await fetch_day_partials(day, sem)
+    # Only finished days are frozen; today's numbers are still moving
+    if day < today_cst():
+        await store_rollup(day_row, item_rows)
+    return day_row, item_rows
+
+
+async def ensure_rollups(days: list[date]) -> dict[str, tuple[dict, list[dict]]]:
+    """Rollups for `days`, scanning and storing any finished day not yet rolled up."""
+    rollups = await load_rollups(days)
+    missing = [d for d in days if d.isoformat() not in rollups]
+    if not missing:
+        return rollups
+
+    sem = asyncio.Semaphore(REPORT_QUERY_CONCURRENCY)
+    day_limit = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+
+    async def build(day: date):
+        async with day_limit:
+            return day.isoformat(), await _compute_and_store(day, sem)
+
+    for key, rollup in await asyncio.gather(*(build(d) for d in missing)):
+        rollups[key] = rollup
+    return rollups
+
+
+async def backfill_rollups(start: date, end: date, recompute: bool = False) -> int:
+    """Roll up every finished day in [start, end]. Returns the number of days scanned.
+
+    Already-stored days are skipped unless `recompute` is set.
+    """
+    last = min(end, today_cst() - timedelta(days=1))
+    days = [start + timedelta(days=i) for i in range((last - start).days + 1)]
+    if not days:
+        return 0
+
+    if recompute:
+        sem = asyncio.Semaphore(REPORT_QUERY_CONCURRENCY)
+        day_limit = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+
+        async def rebuild(day: date):
+            async with day_limit:
+                await _compute_and_store(day, sem)
+
+        await asyncio.gather(*(rebuild(d) for d in days))
+        return len(days)
+
+    stored = await load_rollups(days)
+    missing = [d for d in days if d.isoformat() not in stored]
+    await ensure_rollups(missing)
+    return len(missing)
+
+
+async def load_window_stats(start: date, end: date, version: str = None) -> dict:
+    """Report stats for the CST days [start, end], optionally for one game version.
+
+    Unfiltered windows are merged from daily rollups; only days without one are
+    scanned (and stored, once finished), so a month costs about the same as a
+    day once rolled up. Rollups aren't split by version, so version reports
+    scan the window's raw rows.
+    """
+    if version:
+        window_start, _ = day_range_utc(start)
+        _, window_end = day_range_utc(end)
+        window_row, item_rows = await fetch_range_partials(window_start, window_end, version=version)
+    else:
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        rollups = await ensure_rollups(days)
+        window_row = merge_day_rows([rollups[d.isoformat()][0] for d in days])
+        item_rows = [row for d in days for row in rollups[d.isoformat()][1]]
+
+    name_map = await resolve_item_names({(r["item_type"], r["item_id"]) for r in item_rows})
+
+    stats = finalize_summary(window_row["summary"])
+    stats["draft"] = draft_stats_from_items(item_rows, window_row.get("total_drafts") or 0, name_map)
+    return stats
+
+
+async def load_day_stats(day: date) -> dict:
+    """Report stats for one CST day, read from its rollup (computed on first use)."""
+    return await load_window_stats(day, day)
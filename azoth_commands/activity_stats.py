@@ -0,0 +1,287 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from supabase_client import supabase
+from supabase_helpers import execute_async, aiter_query, make_item_label
+from item_names import item_names
+from azoth_logic.draft_analytics import DraftItemColumns, draft_report
+
+# Reports are bucketed by calendar day in CST (UTC-6, no DST)
+CST = timezone(timedelta(hours=-6))
+
+# Report queries run concurrently where independent; this caps how many
+# PostgREST requests are in flight at once (chunks included).
+REPORT_QUERY_CONCURRENCY = 8
+# UUIDs per `in_` filter, to keep request URLs under PostgREST's length limit
+DRAFT_CHUNK_SIZE = 50
+
+# Everything summarize_activity and the draft chain read from a game
+GAME_COLUMNS = "uuid, player_uuid, level_reached, highest_combo, turns_played, elapsed_sec, result, act_reached"
+
+# Summary fields that add up across days / that take the max across days
+ADDITIVE_SUMMARY_FIELDS = (
+    "total_games", "new_players", "duration_sum", "duration_count", "turns_sum", "turns_count",
+    "total_boss_fights", "boss_wins", "boss_losses",
+)
+MAX_SUMMARY_FIELDS = ("max_level", "max_combo", "max_act")
+
+
+def today_cst() -> date:
+    return datetime.now(timezone.utc).astimezone(CST).date()
+
+
+def yesterday_cst() -> date:
+    return today_cst() - timedelta(days=1)
+
+
+def day_range_utc(day: date) -> tuple[str, str]:
+    """Return (start, end) ISO strings covering a CST calendar day."""
+    start = datetime(day.year, day.month, day.day, tzinfo=CST)
+    end = start + timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+
+# ---------------------------------------------------------------------------
+# Supabase data fetching
+# ---------------------------------------------------------------------------
+
+async def resolve_item_names(keys) -> dict[tuple[str, int], str]:
+    """Resolve (item_type, item_id) keys -> display name via the shared name cache."""
+    return await item_names.resolve_async(keys)
+
+
+async def stream_chunked(table: str, columns: str, column: str, values: list, consume, sem: asyncio.Semaphore,
+                         key: str = None, order: str = None):
+    """Page through rows whose `column` is in `values`, passing each to `consume`.
+
+    One paged query per chunk of values, chunks in parallel; rows are never
+    collected, so memory stays flat however many match. `key` selects keyset
+    paging, otherwise range paging ordered by `order`.
+    """
+    chunks = [values[i:i + DRAFT_CHUNK_SIZE] for i in range(0, len(values), DRAFT_CHUNK_SIZE)]
+
+    async def run(chunk: list):
+        def make_query():
+            query = supabase.table(table).select(columns).in_(column, chunk)
+            return query.order(order) if order and not key else query
+
+        async for row in aiter_query(make_query, key=key, prefetch=True, semaphore=sem):
+            consume(row)
+
+    await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+
+async def fetch_range(table: str, columns: str, time_column: str, start: str, end: str,
+                      sem: asyncio.Semaphore, key: str = None, order: str = None, match: dict = None) -> list[dict]:
+    """Every row of `table` with start <= time_column < end (and `match` equalities), page by page."""
+    def make_query():
+        query = supabase.table(table).select(columns).gte(time_column, start).lt(time_column, end)
+        for column, value in (match or {}).items():
+            query = query.eq(column, value)
+        return query.order(order) if order and not key else query
+
+    return [row async for row in aiter_query(make_query, key=key, prefetch=True, semaphore=sem)]
+
+
+def summarize_activity(games: list[dict], new_player_count: int, boss_fights: list[dict]) -> dict:
+    """Python fallback for the `daily_activity_summary` RPC: same fields, from raw rows.
+
+    Durations and turns are kept as sums + counts (not averages) so summaries
+    can be combined; finalize_summary turns them into report fields.
+    """
+    durations = [g["elapsed_sec"] for g in games if g.get("elapsed_sec")]
+    turns = [g["turns_played"] for g in games if g.get("turns_played")]
+
+    results = {}
+    for g in games:
+        r = g.get("result") or "unknown"
+        results[r] = results.get(r, 0) + 1
+
+    return {
+        "total_games": len(games),
+        "unique_players": len({g["player_uuid"] for g in games}),
+        "new_players": new_player_count,
+        "max_level": max((g.get("level_reached") or 0 for g in games), default=0),
+        "max_combo": max((g.get("highest_combo") or 0 for g in games), default=0),
+        "max_act": max((g.get("act_reached") or 0 for g in games), default=0),
+        "duration_sum": sum(durations),
+        "duration_count": len(durations),
+        "turns_sum": sum(turns),
+        "turns_count": len(turns),
+        "game_results": results,
+        "total_boss_fights": len(boss_fights),
+        "boss_wins": sum(1 for b in boss_fights if b.get("result") == "win"),
+        "boss_losses": sum(1 for b in boss_fights if b.get("result") == "loss"),
+    }
+
+
+def finalize_summary(summary: dict) -> dict:
+    """Turn an activity summary (RPC or Python) into the report's stats fields."""
+    duration_count = summary.get("duration_count") or 0
+    turns_count = summary.get("turns_count") or 0
+    return {
+        "total_games": summary.get("total_games") or 0,
+        "unique_players": summary.get("unique_players") or 0,
+        # None when the window can't attribute these (version-filtered reports)
+        "new_players": summary.get("new_players", 0),
+        "max_level": summary.get("max_level") or 0,
+        "max_combo": summary.get("max_combo") or 0,
+        "max_act": summary.get("max_act") or 0,
+        "avg_duration_sec": summary["duration_sum"] / duration_count if duration_count else 0,
+        "total_playtime_sec": summary.get("duration_sum") or 0,
+        "avg_turns": summary["turns_sum"] / turns_count if turns_count else 0,
+        "game_results": summary.get("game_results") or {},
+        "total_boss_fights": summary.get("total_boss_fights", 0),
+        "boss_wins": summary.get("boss_wins", 0),
+        "boss_losses": summary.get("boss_losses", 0),
+    }
+
+
+async def fetch_summary_rpc(start: str, end: str, sem: asyncio.Semaphore) -> dict | None:
+    """Aggregate a time range in Postgres (sql/daily_activity_summary.sql). None if unavailable."""
+    try:
+        summary = await execute_async(
+            supabase.rpc("daily_activity_summary", {"start_ts": start, "end_ts": end}), sem
+        )
+    except Exception as e:
+        print(f"Activity stats: summary RPC failed, falling back to row scan: {e}")
+        return None
+    return summary if isinstance(summary, dict) and summary else None
+
+
+async def fetch_summary_rows(start: str, end: str, sem: asyncio.Semaphore) -> dict:
+    """Fallback: pull the range's raw rows and aggregate them in Python."""
+    games, new_players, boss_fights = await asyncio.gather(
+        # Games finished in range
+        fetch_range("games", GAME_COLUMNS, "finished_at", start, end, sem, key="uuid"),
+        # Players created in range (new players)
+        fetch_range("players", "id", "created_at", start, end, sem, key="id"),
+        # Boss fights in range
+        fetch_range("boss_fights", "id, result", "created_at", start, end, sem, key="id"),
+    )
+    return summarize_activity(games, len(new_players), boss_fights)
+
+
+async def fetch_range_partials(start: str, end: str, version: str = None,
+                               sem: asyncio.Semaphore = None) -> tuple[dict, list[dict]]:
+    """Scan a time range's raw rows into report partials.
+
+    Returns (window_row, item_rows): window_row holds the activity summary, the
+    distinct player uuids (plus whether any game had no player) and draft count; item_rows hold per-item offer/pick
+    counts and score sums, keyed by (item_type, item_id). Summaries come from the
+    RPC when available; the games / drafts / draft_items chain runs alongside it.
+
+    With `version`, only games of that version count. New players and boss
+    fights aren't tied to a game version, so they are left as None.
+    """
+    sem = sem or asyncio.Semaphore(REPORT_QUERY_CONCURRENCY)
+
+    if version:
+        summary_task = None
+        games = await fetch_range(
+            "games", GAME_COLUMNS, "finished_at", start, end, sem, key="uuid", match={"version": version},
+        )
+    else:
+        summary_task = asyncio.create_task(fetch_summary_rpc(start, end, sem))
+        games = await fetch_range(
+            "games", "uuid, player_uuid, level_reached, highest_combo", "finished_at", start, end, sem, key="uuid",
+        )
+    game_uuids = [g["uuid"] for g in games if g.get("uuid")]
+    game_by_uuid = {g["uuid"]: g for g in games if g.get("uuid")}
+
+    # drafts -> draft_items is a chain; each step pages through its chunks in
+    # parallel, and draft items go straight into columns as they arrive
+    draft_to_game = {}
+    columns = DraftItemColumns()
+
+    def add_draft(draft: dict):
+        draft_to_game[draft["uuid"]] = draft["game_uuid"]
+
+    def add_item(item: dict):
+        # Score = level_reached + highest_combo of the game the pick was made in
+        game = game_by_uuid.get(draft_to_game.get(item["draft_uuid"]))
+        score = (game.get("level_reached") or 0) + (game.get("highest_combo") or 0) if game else None
+        columns.add_offer(item["item_type"], item["item_id"], item.get("picked"), score)
+
+    if game_uuids:
+        await stream_chunked("drafts", "uuid, game_uuid", "game_uuid", game_uuids, add_draft, sem, key="uuid")
+    if draft_to_game:
+        await stream_chunked(
+            "draft_items", "id, draft_uuid, item_type, item_id, picked", "draft_uuid", list(draft_to_game),
+            add_item, sem, key="id",
+        )
+
+    if version:
+        summary = summarize_activity(games, 0, [])
+        summary.update(new_players=None, total_boss_fights=None, boss_wins=None, boss_losses=None)
+    else:
+        summary = await summary_task
+        if summary is None:
+            summary = await fetch_summary_rows(start, end, sem)
+
+    window_row = {
+        "summary": summary,
+        "player_uuids": sorted({g["player_uuid"] for g in games if g.get("player_uuid")}),
+        # A NULL player counts as one distinct player (as in the RPC and summarize_activity)
+        "has_null_player": any(not g.get("player_uuid") for g in games),
+        "total_drafts": len(draft_to_game),
+    }
+    return window_row, columns.group().to_partials()
+
+
+async def fetch_day_partials(day: date, sem: asyncio.Semaphore = None) -> tuple[dict, list[dict]]:
+    """Scan one CST day into rollup partials (see fetch_range_partials)."""
+    start, end = day_range_utc(day)
+    day_row, item_rows = await fetch_range_partials(start, end, sem=sem)
+    return {"day": day.isoformat(), **day_row}, item_rows
+
+
+def merge_day_rows(day_rows: list[dict]) -> dict:
+    """Combine daily rollup rows into one window row (summary, player uuids, draft count)."""
+    summary = {field: 0 for field in ADDITIVE_SUMMARY_FIELDS + MAX_SUMMARY_FIELDS}
+    game_results = {}
+    players = set()
+    has_null_player = False
+    total_drafts = 0
+    for row in day_rows:
+        day_summary = row["summary"]
+        for field in ADDITIVE_SUMMARY_FIELDS:
+            summary[field] += day_summary.get(field) or 0
+        for field in MAX_SUMMARY_FIELDS:
+            summary[field] = max(summary[field], day_summary.get(field) or 0)
+        for result, count in (day_summary.get("game_results") or {}).items():
+            game_results[result] = game_results.get(result, 0) + count
+        players.update(row.get("player_uuids") or ())
+        has_null_player = has_null_player or bool(row.get("has_null_player"))
+        total_drafts += row.get("total_drafts") or 0
+
+    # A player active on several days counts once; games with no player count as one more
+    summary["unique_players"] = len(players) + has_null_player
+    summary["game_results"] = game_results
+    return {
+        "summary": summary,
+        "player_uuids": sorted(players),
+        "has_null_player": has_null_player,
+        "total_drafts": total_drafts,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Report stats
+# ---------------------------------------------------------------------------
+
+def item_labels(name_map: dict) -> dict[tuple[str, int], str]:
+    """Display label per (item_type, item_id): the name, or "Name (Card #12)" when names collide."""
+    name_uses = {}
+    for name in name_map.values():
+        name_uses[name] = name_uses.get(name, 0) + 1
+    return {
+        key: name if name_uses[name] == 1 else make_item_label(name, key[0], key[1])
+        for key, name in name_map.items()
+    }
+
+
+def draft_stats_from_items(item_rows: list[dict], total_drafts: int, name_map: dict) -> dict:
+    """Compute the report's draft section from per-item partials (one or many days)."""
+    columns = DraftItemColumns()
+    columns.add_partials(item_rows)
+    return draft_report(columns.group(), total_drafts, item_labels(name_map), known=set(name_map))
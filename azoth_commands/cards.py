@@ -3,7 +3,7 @@ import json
 import nextcord
 from nextcord.ext import commands
 from nextcord import SlashOption, Interaction
-from azoth_commands.helpers import safe_interaction, generate_and_upload_image, record_to_json, to_snake_case
+from azoth_commands.helpers import safe_interaction, run_blocking, generate_and_upload_image, record_to_json, to_snake_case
 from azoth_commands.autocomplete import autocomplete_from_table
 from constants import DEV_GUILD_ID, BOT_PLAYER_ID, ASSET_RENDER_PATHS, ASSET_BUCKET_NAMES, ASSET_DOWNLOAD_PATHS
 from supabase_helpers import fetch_all, update_record
@@ -77,7 +77,7 @@ def add_card_commands(cls):
 				return f"✅ Created `{name}`, but could not add to deck named `{deck}`:\n{result}."
 
 		# Generate and upload image
-		upload_success, file_path = generate_and_upload_image(created_record, bucket)
+		upload_success, file_path = await run_blocking(generate_and_upload_image, created_record, bucket)
 		if not upload_success:
 			return f"✅ Created `{name}`, but failed to upload image:\n{file_path}"
 
@@ -87,12 +87,12 @@ def add_card_commands(cls):
 			created_record["image"] = file_path
 
 		# Download image for local rendering
-		download_success, image_local_path = download_image(file_path, bucket, download_dir)
+		download_success, image_local_path = await run_blocking(download_image, file_path, bucket, download_dir)
 		if not download_success:
 			return f"✅ Created `{name}`, but failed to retrieve image:\n{image_local_path}"
 
 		# Render and send
-		render_path = renderer.render_card(created_record, output_dir=render_dir)
+		render_path = await run_blocking(renderer.render_card, created_record, output_dir=render_dir)
 		await interaction.followup.send(
 			content=f"✅ Created `{name}` successfully!",
 			file=nextcord.File(render_path)
@@ -141,7 +141,7 @@ def add_card_commands(cls):
 
 		# Optional image regeneration
 		if regenerate_image:
-			upload_success, file_path = generate_and_upload_image(record, bucket)
+			upload_success, file_path = await run_blocking(generate_and_upload_image, record, bucket)
 			if not upload_success:
 				return f"✅ Updated `{name}`, but failed to upload image: `{file_path}`"
 			update_data["image"] = file_path
@@ -165,9 +165,9 @@ def add_card_commands(cls):
 
 		# Optional re-download + render
 		if regenerate_image:
-			download_success, local_path = download_image(file_path, bucket, download_dir)
+			download_success, local_path = await run_blocking(download_image, file_path, bucket, download_dir)
 			if download_success:
-				render_path = renderer.render_card(record, output_dir=render_dir)
+				render_path = await run_blocking(renderer.render_card, record, output_dir=render_dir)
 				await interaction.followup.send(
 					content=f"✅ Updated `{name}` and regenerated image!",
 					file=nextcord.File(render_path)
@@ -229,11 +229,11 @@ def add_card_commands(cls):
 		record = matches[0]
 
 		# Download the art from Supabase
-		image_success, image_result = download_image(record["image"], bucket, download_dir)
+		image_success, image_result = await run_blocking(download_image, record["image"], bucket, download_dir)
 		if not image_success:
 			return f"⚠️ Could not load image for `{name}`:\n{image_result}"
 
-		render_path = renderer.render_card(record)
+		render_path = await run_blocking(renderer.render_card, record)
 		await interaction.followup.send(file=nextcord.File(render_path))
 
 
@@ -1,13 +1,17 @@
+import asyncio
+import heapq
 import json
 import os
 import tempfile
 import nextcord
 from datetime import datetime, time, timedelta, timezone
 from nextcord import Interaction, SlashOption
-from nextcord.ext import tasks
 from azoth_commands.helpers import safe_interaction, AUTHORIZED_USER_IDS
 from constants import DEV_GUILD_ID
-from supabase_client import supabase
+from azoth_commands.activity_stats import CST, today_cst, yesterday_cst
+from azoth_commands.activity_rollup import backfill_rollups, load_day_stats, load_window_stats
+from azoth_commands.autocomplete import autocomplete_from_table
+from azoth_commands.report_claims import ClaimStore, make_claim_store
 
 # State file stores per-channel config:
 # {
@@ -25,6 +29,20 @@ STATE_FILE = os.path.join(os.path.dirname(__file__), "..", "daily_update_state.j
 DEFAULT_SEND_HOUR = 12
 DEFAULT_UTC_OFFSET = -6
 
+# Longest single scheduler sleep, so a suspended host or clock jump is noticed
+# within the hour rather than at the next deadline
+MAX_SCHEDULER_SLEEP_SEC = 3600
+# Delay before retrying a channel that couldn't be resolved or failed to build
+CHANNEL_RETRY_SEC = 600
+# Channels sent to at once when several are due together
+SEND_CONCURRENCY = 5
+# Built reports kept in memory, by report day (a finished day's report never changes)
+REPORT_CACHE_DAYS = 2
+
+# Upper bound for /daily_rollup_backfill and the /report window
+MAX_BACKFILL_DAYS = 365
+MAX_REPORT_DAYS = 366
+
 
 def _load_state() -> dict:
     try:
@@ -54,31 +72,17 @@ def _save_state(state: dict):
         raise
 
 
-def _yesterday_range_utc():
-    """Return (start, end) ISO strings for yesterday in CST, converted to UTC."""
-    now_utc = datetime.now(timezone.utc)
-    cst = timezone(timedelta(hours=-6))
-    now_cst = now_utc.astimezone(cst)
-    yesterday_cst = now_cst.date() - timedelta(days=1)
-    start = datetime(yesterday_cst.year, yesterday_cst.month, yesterday_cst.day, tzinfo=cst)
-    end = start + timedelta(days=1)
-    return start.isoformat(), end.isoformat()
-
-
 def _today_cst_str():
-    cst = timezone(timedelta(hours=-6))
-    return datetime.now(timezone.utc).astimezone(cst).strftime("%Y-%m-%d")
+    return today_cst().strftime("%Y-%m-%d")
 
 
 def _yesterday_cst_str():
-    cst = timezone(timedelta(hours=-6))
-    return (datetime.now(timezone.utc).astimezone(cst) - timedelta(days=1)).strftime("%Y-%m-%d")
+    return yesterday_cst().strftime("%Y-%m-%d")
 
 
-def _is_past_send_time_utc(hour_utc: int, minute_utc: int) -> bool:
-    """Check if current UTC time is past the given hour:minute."""
-    now = datetime.now(timezone.utc).time()
-    return now >= time(hour=hour_utc, minute=minute_utc)
+def _parse_report_day(value: str):
+    """Parse a YYYY-MM-DD report date (CST calendar day)."""
+    return datetime.strptime(value.strip(), "%Y-%m-%d").date()
 
 
 def _parse_send_time(send_time: str, utc_offset: int) -> tuple[int, int]:
@@ -100,209 +104,6 @@ def _format_utc_to_local(hour_utc: int, minute_utc: int, utc_offset: int) -> str
     return f"{local_hour:02d}:{minute_utc:02d}"
 
 
-# ---------------------------------------------------------------------------
-# Supabase data fetching
-# ---------------------------------------------------------------------------
-
-def _resolve_item_names(items: list[dict]) -> dict[tuple[str, int], str]:
-    """Given draft_items rows, resolve (item_type, item_id) -> display name."""
-    grouped = {}
-    for item in items:
-        grouped.setdefault(item["item_type"], set()).add(item["item_id"])
-
-    name_map = {}
-    for item_type, ids in grouped.items():
-        table = f"{item_type}s"
-        name_col = "challenge_name" if item_type == "ritual" else "name"
-        records = (
-            supabase.table(table)
-            .select(f"id, {name_col}")
-            .in_("id", list(ids))
-            .execute()
-        ).data or []
-        for r in records:
-            name_map[(item_type, r["id"])] = r.get(name_col, f"Unknown {item_type}")
-
-    return name_map
-
-
-def _fetch_draft_stats(game_uuids: list[str], game_by_uuid: dict) -> dict:
-    """Compute draft pick analytics for a set of games."""
-    if not game_uuids:
-        return {}
-
-    # Fetch all drafts for these games (batch in chunks to avoid URL length issues)
-    all_drafts = []
-    for i in range(0, len(game_uuids), 50):
-        chunk = game_uuids[i:i + 50]
-        rows = (
-            supabase.table("drafts")
-            .select("uuid, game_uuid")
-            .in_("game_uuid", chunk)
-            .execute()
-        ).data or []
-        all_drafts.extend(rows)
-
-    if not all_drafts:
-        return {}
-
-    draft_uuids = [d["uuid"] for d in all_drafts]
-    draft_to_game = {d["uuid"]: d["game_uuid"] for d in all_drafts}
-
-    # Fetch all draft items
-    all_items = []
-    for i in range(0, len(draft_uuids), 50):
-        chunk = draft_uuids[i:i + 50]
-        rows = (
-            supabase.table("draft_items")
-            .select("id, draft_uuid, item_type, item_id, picked")
-            .in_("draft_uuid", chunk)
-            .execute()
-        ).data or []
-        all_items.extend(rows)
-
-    if not all_items:
-        return {}
-
-    # Resolve names
-    name_map = _resolve_item_names(all_items)
-
-    # Pick rate: how often each item was picked when offered
-    offer_count = {}   # name -> times offered
-    pick_count = {}    # name -> times picked
-    for item in all_items:
-        name = name_map.get((item["item_type"], item["item_id"]), f"{item['item_type']}#{item['item_id']}")
-        offer_count[name] = offer_count.get(name, 0) + 1
-        if item.get("picked"):
-            pick_count[name] = pick_count.get(name, 0) + 1
-
-    pick_rates = {}
-    for name, offered in offer_count.items():
-        picked = pick_count.get(name, 0)
-        if offered >= 2:  # only include items offered at least twice for meaningful rates
-            pick_rates[name] = {"picked": picked, "offered": offered, "rate": picked / offered}
-
-    # Sort for most/least picked
-    sorted_by_rate = sorted(pick_rates.items(), key=lambda x: (-x[1]["rate"], -x[1]["offered"]))
-    most_picked = sorted_by_rate[:5]
-    least_picked = sorted(
-        [(n, s) for n, s in pick_rates.items() if s["offered"] >= 3],
-        key=lambda x: (x[1]["rate"], -x[1]["offered"])
-    )[:5]
-
-    # Performance correlation: for each picked item, compute average game score
-    # Score = level_reached + highest_combo (simple composite metric)
-    item_game_scores = {}  # name -> list of scores
-    for item in all_items:
-        if not item.get("picked"):
-            continue
-        name = name_map.get((item["item_type"], item["item_id"]))
-        if not name:
-            continue
-        game_uuid = draft_to_game.get(item["draft_uuid"])
-        if not game_uuid:
-            continue
-        game = game_by_uuid.get(game_uuid)
-        if not game:
-            continue
-        score = (game.get("level_reached") or 0) + (game.get("highest_combo") or 0)
-        item_game_scores.setdefault(name, []).append(score)
-
-    # Items that appear in at least 2 games for meaningful averages
-    performance = {}
-    for name, scores in item_game_scores.items():
-        if len(scores) >= 2:
-            performance[name] = {"avg_score": sum(scores) / len(scores), "games": len(scores)}
-
-    top_performers = sorted(performance.items(), key=lambda x: -x[1]["avg_score"])[:5]
-
-    return {
-        "total_drafts": len(all_drafts),
-        "total_picks": sum(pick_count.values()),
-        "most_picked": most_picked,
-        "least_picked": least_picked,
-        "top_performers": top_performers,
-    }
-
-
-def _fetch_daily_stats():
-    """Query supabase for yesterday's game activity stats."""
-    start, end = _yesterday_range_utc()
-
-    # Games finished yesterday
-    games = (
-        supabase.table("games")
-        .select("id, uuid, player_uuid, level_reached, highest_combo, turns_played, elapsed_sec, result, act_reached")
-        .gte("finished_at", start)
-        .lt("finished_at", end)
-        .execute()
-    ).data or []
-
-    # Players created yesterday (new players)
-    new_players = (
-        supabase.table("players")
-        .select("id")
-        .gte("created_at", start)
-        .lt("created_at", end)
-        .execute()
-    ).data or []
-
-    # Boss fights from yesterday
-    boss_fights = (
-        supabase.table("boss_fights")
-        .select("id, result, damage_dealt, damage_received")
-        .gte("created_at", start)
-        .lt("created_at", end)
-        .execute()
-    ).data or []
-
-    # Draft data for yesterday's games
-    game_uuids = [g["uuid"] for g in games if g.get("uuid")]
-    game_by_uuid = {g["uuid"]: g for g in games if g.get("uuid")}
-    draft_stats = _fetch_draft_stats(game_uuids, game_by_uuid)
-
-    total_games = len(games)
-    unique_players = len({g["player_uuid"] for g in games})
-    new_player_count = len(new_players)
-
-    max_level = max((g.get("level_reached") or 0 for g in games), default=0)
-    max_combo = max((g.get("highest_combo") or 0 for g in games), default=0)
-    max_act = max((g.get("act_reached") or 0 for g in games), default=0)
-
-    durations = [g["elapsed_sec"] for g in games if g.get("elapsed_sec")]
-    avg_duration = sum(durations) / len(durations) if durations else 0
-    total_playtime = sum(durations)
-
-    turns = [g["turns_played"] for g in games if g.get("turns_played")]
-    avg_turns = sum(turns) / len(turns) if turns else 0
-
-    results = {}
-    for g in games:
-        r = g.get("result") or "unknown"
-        results[r] = results.get(r, 0) + 1
-
-    total_boss_fights = len(boss_fights)
-    boss_wins = sum(1 for b in boss_fights if b.get("result") == "win")
-    boss_losses = sum(1 for b in boss_fights if b.get("result") == "loss")
-
-    return {
-        "total_games": total_games,
-        "unique_players": unique_players,
-        "new_players": new_player_count,
-        "max_level": max_level,
-        "max_combo": max_combo,
-        "max_act": max_act,
-        "avg_duration_sec": avg_duration,
-        "total_playtime_sec": total_playtime,
-        "avg_turns": avg_turns,
-        "game_results": results,
-        "total_boss_fights": total_boss_fights,
-        "boss_wins": boss_wins,
-        "boss_losses": boss_losses,
-        "draft": draft_stats,
-    }
-
-
 # ---------------------------------------------------------------------------
 # Embed building
 # ---------------------------------------------------------------------------
@@ -333,15 +134,18 @@ def _embed_char_count(embed: nextcord.Embed) -> int:
     return total
 
 
-def _build_update_embeds(stats: dict) -> list[nextcord.Embed]:
-    """Build one or more embeds for the daily report, splitting if needed."""
-    yesterday = _yesterday_cst_str()
+def _build_update_embeds(stats: dict, title: str = None, period: str = "yesterday") -> list[nextcord.Embed]:
+    """Build one or more embeds for the daily report, splitting if needed.
+
+    `title` / `period` default to the daily report's; /report passes its window.
+    """
+    title = title or f"Daily Activity Report — {_yesterday_cst_str()}"
     color = 0x7B2D8E
 
     if stats["total_games"] == 0:
         embed = nextcord.Embed(
-            title=f"Daily Activity Report — {yesterday}",
-            description="No games were played yesterday.",
+            title=title,
+            description=f"No games were played {period}.",
             color=color,
         )
         return [embed]
@@ -350,11 +154,10 @@ def _build_update_embeds(stats: dict) -> list[nextcord.Embed]:
     fields = []
 
     # Player activity
-    player_lines = [
-        f"**{stats['unique_players']}** unique players",
-        f"**{stats['new_players']}** new players",
-        f"**{stats['total_games']}** games played",
-    ]
+    player_lines = [f"**{stats['unique_players']}** unique players"]
+    if stats["new_players"] is not None:
+        player_lines.append(f"**{stats['new_players']}** new players")
+    player_lines.append(f"**{stats['total_games']}** games played")
     fields.append(("Players & Games", "\n".join(player_lines), False))
 
     # Game highlights
@@ -379,7 +182,7 @@ def _build_update_embeds(stats: dict) -> list[nextcord.Embed]:
         fields.append(("Game Results", "\n".join(result_lines), True))
 
     # Boss fights
-    if stats["total_boss_fights"] > 0:
+    if stats["total_boss_fights"]:
         boss_lines = [
             f"**{stats['total_boss_fights']}** total fights",
             f"**{stats['boss_wins']}** wins / **{stats['boss_losses']}** losses",
@@ -417,7 +220,7 @@ def _build_update_embeds(stats: dict) -> list[nextcord.Embed]:
     MAX_FIELD_CHARS = 1024
     embeds = []
     current = nextcord.Embed(
-        title=f"Daily Activity Report — {yesterday}",
+        title=title,
         color=color,
     )
 
@@ -433,7 +236,7 @@ def _build_update_embeds(stats: dict) -> list[nextcord.Embed]:
             # Current embed is full, start a new one
             embeds.append(current)
             current = nextcord.Embed(
-                title=f"Daily Activity Report — {yesterday} (cont.)",
+                title=f"{title} (cont.)",
                 color=color,
             )
 
@@ -447,32 +250,40 @@ def _build_update_embeds(stats: dict) -> list[nextcord.Embed]:
 # Sending helper
 # ---------------------------------------------------------------------------
 
-async def _claim_and_send(bot, state: dict, channel_id: str, config: dict, today: str) -> bool:
+async def _claim_and_send(bot, state: dict, channel_id: str, config: dict, today: str, get_embeds,
+                          claims: ClaimStore) -> bool:
     """Send the daily report to a channel, claiming the day BEFORE sending.
 
-    The dedup field (last_sent_date) is persisted *before* the first channel.send,
-    so a partial or failed send can never cause the next loop/startup pass to
-    re-send the report (the cause of the duplicate-message flood). Trade-off: a
-    genuine send failure means that day's report is skipped rather than retried —
-    a safe failure mode for a single-instance bot.
+    The day is claimed in the shared claim store (an atomic insert that only one
+    bot instance can win) and recorded locally (last_sent_date) *before* the
+    first channel.send, so neither a partial/failed send nor a second instance
+    can cause the report to go out twice (the cause of the duplicate-message
+    flood). Trade-off: a genuine send failure means that day's report is skipped
+    rather than retried. If the claim store can't be reached, nothing is sent
+    and the error propagates so the channel is retried later.
 
-    Returns True if a send was attempted (channel was available), False if the
-    channel could not be resolved (no claim made, safe to retry next cycle).
+    Returns True if the day was handled here or by another instance, False if
+    the channel could not be resolved (no claim made, safe to retry next cycle).
     """
     channel = bot.get_channel(int(channel_id))
     if not channel:
         print(f"Daily update: channel {channel_id} not found; will retry next cycle")
         return False
 
-    # Build the report first so a data/build error doesn't consume the day's claim.
-    stats = _fetch_daily_stats()
-    embeds = _build_update_embeds(stats)
+    # Build (or reuse) the report first so a data/build error doesn't consume the day's claim.
+    embeds = await get_embeds()
+
+    claimed = await asyncio.to_thread(claims.claim, channel_id, today)
 
-    # Claim the day and persist it before sending anything.
+    # Record the day locally either way, so this instance stops scheduling it.
     config["last_sent_date"] = today
     state["channels"][channel_id] = config
     _save_state(state)
 
+    if not claimed:
+        print(f"Daily update for channel {channel_id} on {today} already claimed by another instance")
+        return True
+
     try:
         for embed in embeds:
             await channel.send(embed=embed)
@@ -486,7 +297,181 @@ async def _claim_and_send(bot, state: dict, channel_id: str, config: dict, today
 
 
 # ---------------------------------------------------------------------------
-# Commands and background task
+# Scheduler
+# ---------------------------------------------------------------------------
+
+def _is_due(config: dict, at: datetime) -> bool:
+    """Whether a channel is due at UTC instant `at`: not yet sent for that CST day,
+    and at or past its send time (UTC)."""
+    if config.get("disabled"):
+        return False
+    if config.get("last_sent_date") == at.astimezone(CST).strftime("%Y-%m-%d"):
+        return False
+    send_time = time(hour=config.get("send_hour_utc", 18), minute=config.get("send_minute_utc", 0))
+    return at.time() >= send_time
+
+
+def _next_fire_time(config: dict, now: datetime) -> datetime | None:
+    """Earliest UTC instant >= now at which the channel is due (None if disabled).
+
+    Due-ness only changes at a send time (UTC) or at CST midnight, when
+    last_sent_date stops matching, so those are the only instants to check.
+    """
+    if config.get("disabled"):
+        return None
+    hour_utc = config.get("send_hour_utc", 18)
+    minute_utc = config.get("send_minute_utc", 0)
+
+    candidates = [now]
+    for days in range(3):
+        utc_day = (now + timedelta(days=days)).date()
+        candidates.append(datetime(utc_day.year, utc_day.month, utc_day.day, hour_utc, minute_utc, tzinfo=timezone.utc))
+        cst_day = now.astimezone(CST).date() + timedelta(days=days)
+        candidates.append(datetime(cst_day.year, cst_day.month, cst_day.day, tzinfo=CST).astimezone(timezone.utc))
+
+    for at in sorted(c for c in candidates if c >= now):
+        if _is_due(config, at):
+            return at
+    return None
+
+
+class DailyUpdateScheduler:
+    """Sends each channel's daily report at its next due time.
+
+    Channel config is loaded once and kept in memory; every change is written
+    through to STATE_FILE. A heap holds (fire_at, channel_id) deadlines and the
+    loop sleeps until the earliest one, or until a config change wakes it to
+    reschedule. Superseded heap entries are skipped when popped.
+
+    A day's report is built once and shared by every channel it goes to;
+    channels due together are sent concurrently, each failing on its own.
+    Sends are deduplicated across bot instances through `claims`; the state
+    file only drives this instance's schedule.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.state = _load_state()
+        self.claims = make_claim_store()
+        self._heap: list[tuple[datetime, str]] = []
+        self._deadlines: dict[str, datetime] = {}
+        self._sending: set[str] = set()
+        self._reports: dict[str, asyncio.Future] = {}
+        self._send_limit = asyncio.Semaphore(SEND_CONCURRENCY)
+        self._wake = asyncio.Event()
+        self._task = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = self.bot.loop.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def configure(self, channel_id: str, config: dict, reschedule: bool = True):
+        """Replace a channel's config (persisted immediately) and reschedule it."""
+        self.state["channels"][channel_id] = config
+        _save_state(self.state)
+        if reschedule:
+            self.reschedule(channel_id)
+
+    def reschedule(self, channel_id: str, not_before: datetime = None):
+        now = datetime.now(timezone.utc)
+        config = self.state["channels"].get(channel_id)
+        fire_at = _next_fire_time(config, max(now, not_before or now)) if config else None
+        if fire_at is None:
+            self._deadlines.pop(channel_id, None)
+        else:
+            self._deadlines[channel_id] = fire_at
+            heapq.heappush(self._heap, (fire_at, channel_id))
+        self._wake.set()
+
+    async def _build_report(self, day) -> list[nextcord.Embed]:
+        stats = await load_day_stats(day)
+        return _build_update_embeds(stats)
+
+    async def report_embeds(self, day) -> list[nextcord.Embed]:
+        """The report for `day`, built on first request and shared afterwards.
+
+        Concurrent callers await the same build; a failed build is dropped so
+        the next caller retries it.
+        """
+        key = day.isoformat()
+        future = self._reports.get(key)
+        if future is None or (future.done() and (future.cancelled() or future.exception())):
+            future = self._reports[key] = asyncio.ensure_future(self._build_report(day))
+            for old in sorted(self._reports)[:-REPORT_CACHE_DAYS]:
+                del self._reports[old]
+        # Shielded: one caller timing out must not cancel the build for the rest
+        return await asyncio.shield(future)
+
+    async def send_if_due(self, channel_id: str) -> bool:
+        """Claim and send the channel's report if it is due right now.
+
+        Returns True if a send was attempted. A channel already being sent is
+        skipped, so the scheduler and /daily_update can't both send it.
+        """
+        config = self.state["channels"].get(channel_id)
+        if not config or channel_id in self._sending or not _is_due(config, datetime.now(timezone.utc)):
+            return False
+        self._sending.add(channel_id)
+        try:
+            day = yesterday_cst()
+            return await _claim_and_send(
+                self.bot, self.state, channel_id, config, _today_cst_str(),
+                lambda: self.report_embeds(day), self.claims,
+            )
+        finally:
+            self._sending.discard(channel_id)
+
+    async def _fire(self, channel_id: str):
+        try:
+            async with self._send_limit:
+                attempted = await self.send_if_due(channel_id)
+        except Exception as e:
+            print(f"Daily update: failed to build report for channel {channel_id}: {e}")
+            attempted = False
+
+        config = self.state["channels"].get(channel_id)
+        if not attempted and config and _is_due(config, datetime.now(timezone.utc)):
+            retry_at = datetime.now(timezone.utc) + timedelta(seconds=CHANNEL_RETRY_SEC)
+            self.reschedule(channel_id, not_before=retry_at)
+        else:
+            self.reschedule(channel_id)
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        # Channels already past their send time fire straight away (startup catch-up)
+        for channel_id in list(self.state["channels"]):
+            self.reschedule(channel_id)
+
+        while True:
+            self._wake.clear()
+            now = datetime.now(timezone.utc)
+
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                fire_at, channel_id = heapq.heappop(self._heap)
+                if self._deadlines.get(channel_id) == fire_at:
+                    del self._deadlines[channel_id]
+                    due.append(channel_id)
+            if due:
+                # _fire handles its own errors, so one channel can't sink the rest
+                await asyncio.gather(*(self._fire(channel_id) for channel_id in due))
+                continue
+
+            delay = MAX_SCHEDULER_SLEEP_SEC
+            if self._heap:
+                delay = min(delay, max(0.0, (self._heap[0][0] - now).total_seconds()))
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Commands and scheduler startup
 # ---------------------------------------------------------------------------
 
 def add_daily_update_commands(cls):
@@ -511,7 +496,8 @@ def add_daily_update_commands(cls):
         ),
     ):
         channel_id = str(interaction.channel_id)
-        state = _load_state()
+        scheduler = self._daily_scheduler
+        state = scheduler.state
 
         if enabled:
             # Parse and validate time
@@ -525,17 +511,16 @@ def add_daily_update_commands(cls):
             channel_config["send_hour_utc"] = hour_utc
             channel_config["send_minute_utc"] = minute_utc
             channel_config.pop("disabled", None)
-            state["channels"][channel_id] = channel_config
-            _save_state(state)
+            scheduler.configure(channel_id, channel_config, reschedule=False)
 
-            # Check if we missed today's update for this channel
-            today = _today_cst_str()
-            already_sent = channel_config.get("last_sent_date") == today
-
-            if not already_sent and _is_past_send_time_utc(hour_utc, minute_utc):
-                attempted = await _claim_and_send(self.bot, state, channel_id, channel_config, today)
-                if attempted:
-                    return f"Daily updates **enabled** for this channel. Sent catch-up update for {_yesterday_cst_str()}."
+            # Send now if we missed today's update for this channel, then hand
+            # the channel to the scheduler for its next send
+            try:
+                attempted = await scheduler.send_if_due(channel_id)
+            finally:
+                scheduler.reschedule(channel_id)
+            if attempted:
+                return f"Daily updates **enabled** for this channel. Sent catch-up update for {_yesterday_cst_str()}."
 
             local_time = _format_utc_to_local(hour_utc, minute_utc, utc_offset)
             return f"Daily updates **enabled** for this channel. Reports will be sent daily at {local_time} (UTC{utc_offset:+d})."
@@ -543,76 +528,95 @@ def add_daily_update_commands(cls):
             # Mark channel as disabled but preserve last_sent_date to prevent
             # re-sending if toggled back on the same day
             config = state["channels"].get(channel_id, {})
-            state["channels"][channel_id] = {
+            scheduler.configure(channel_id, {
                 "disabled": True,
                 "last_sent_date": config.get("last_sent_date"),
-            }
-            _save_state(state)
+            })
             return "Daily updates **disabled** for this channel."
 
-    # Background task — runs every 10 minutes to check all registered channels
-    @tasks.loop(minutes=10)
-    async def daily_update_task(self):
-        state = _load_state()
-        if not state["channels"]:
-            return
-
-        today = _today_cst_str()
-
-        for channel_id, config in list(state["channels"].items()):
-            # Skip disabled channels
-            if config.get("disabled"):
-                continue
-
-            # Skip if already sent today
-            if config.get("last_sent_date") == today:
-                continue
-
-            # Skip if not past this channel's send time
-            hour_utc = config.get("send_hour_utc", 18)
-            minute_utc = config.get("send_minute_utc", 0)
-            if not _is_past_send_time_utc(hour_utc, minute_utc):
-                continue
-
-            # Claims today (persisted) before sending, so a failed/partial send
-            # can never re-fire on the next cycle.
-            await _claim_and_send(self.bot, state, channel_id, config, today)
-
-    # Startup check for missed updates across all channels
-    async def _check_missed_updates(self):
-        await self.bot.wait_until_ready()
-        state = _load_state()
-        if not state["channels"]:
-            return
-
-        today = _today_cst_str()
-
-        for channel_id, config in list(state["channels"].items()):
-            if config.get("disabled"):
-                continue
-
-            if config.get("last_sent_date") == today:
-                continue
-
-            hour_utc = config.get("send_hour_utc", 18)
-            minute_utc = config.get("send_minute_utc", 0)
-            if not _is_past_send_time_utc(hour_utc, minute_utc):
-                continue
+    @nextcord.slash_command(name="daily_rollup_backfill", description="Precompute daily activity rollups for past days", guild_ids=[DEV_GUILD_ID])
+    @safe_interaction(timeout=300, error_message="Failed to backfill daily rollups.", require_authorized=True)
+    async def daily_rollup_backfill_cmd(
+        self,
+        interaction: Interaction,
+        days: int = SlashOption(
+            description="How many days back from yesterday to roll up, default 30",
+            required=False,
+            default=30,
+            min_value=1,
+            max_value=MAX_BACKFILL_DAYS,
+        ),
+        recompute: bool = SlashOption(
+            description="Recompute days that are already rolled up",
+            required=False,
+            default=False,
+        ),
+    ):
+        end = yesterday_cst()
+        start = end - timedelta(days=days - 1)
+        computed = await backfill_rollups(start, end, recompute)
+        return f"Rolled up **{computed}** day(s) between {start} and {end}."
+
+    @nextcord.slash_command(name="report", description="Activity report for a date range or game version", guild_ids=[DEV_GUILD_ID])
+    @safe_interaction(timeout=120, error_message="Failed to build activity report.")
+    async def report_cmd(
+        self,
+        interaction: Interaction,
+        start: str = SlashOption(
+            description="First day (YYYY-MM-DD, CST), default yesterday",
+            required=False,
+            default=None,
+        ),
+        end: str = SlashOption(
+            description="Last day (YYYY-MM-DD, CST), default same as start",
+            required=False,
+            default=None,
+        ),
+        version: str = SlashOption(
+            description="Only count games of this version",
+            required=False,
+            default=None,
+            autocomplete=True,
+        ),
+    ):
+        try:
+            start_day = _parse_report_day(start) if start else yesterday_cst()
+            end_day = _parse_report_day(end) if end else start_day
+        except ValueError:
+            return "Invalid date. Use YYYY-MM-DD (e.g. 2026-03-19)."
+
+        if end_day < start_day:
+            return "End date must not be before start date."
+        if end_day > today_cst():
+            return "End date can't be in the future."
+        if (end_day - start_day).days + 1 > MAX_REPORT_DAYS:
+            return f"Reports can cover at most {MAX_REPORT_DAYS} days."
+
+        stats = await load_window_stats(start_day, end_day, version)
+
+        window = str(start_day) if start_day == end_day else f"{start_day} → {end_day}"
+        title = f"Activity Report — {window}" + (f" (v{version})" if version else "")
+        embeds = _build_update_embeds(stats, title=title, period="in this period")
+        # One message per embed: Discord's 6000-char cap covers a whole message
+        for embed in embeds:
+            await interaction.followup.send(embed=embed)
 
-            # Claims today (persisted) before sending; see _claim_and_send.
-            await _claim_and_send(self.bot, state, channel_id, config, today)
+    @report_cmd.on_autocomplete("version")
+    async def autocomplete_report_version(self, interaction: Interaction, input: str):
+        suggestions = autocomplete_from_table(table_name="game_stats", input=input, column="version")
+        await interaction.response.send_autocomplete(suggestions[:25])
 
-    # Override cog init to start the task
+    # Override cog init to start the scheduler
     original_init = cls.__init__
 
     def new_init(self, bot):
         original_init(self, bot)
-        self._daily_update_task = daily_update_task
-        self._daily_update_task.start(self)
-        bot.loop.create_task(_check_missed_updates(self))
+        self._daily_scheduler = DailyUpdateScheduler(bot)
+        self._daily_scheduler.start()
 
     cls.__init__ = new_init
 
     cls.daily_update_cmd = daily_update_cmd
-    cls._daily_update_task_func = daily_update_task
-    cls._check_missed_updates = _check_missed_updates
+    cls.daily_rollup_backfill_cmd = daily_rollup_backfill_cmd
+    cls.report_cmd = report_cmd
+    cls.autocomplete_report_version = autocomplete_report_version
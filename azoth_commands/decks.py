@@ -1,16 +1,19 @@
 import os
 import json
 import nextcord
+from datetime import datetime
 from nextcord.ext import commands
 from nextcord import SlashOption, Interaction
-from azoth_commands.helpers import safe_interaction, generate_and_upload_image
+from azoth_commands.helpers import safe_interaction, run_blocking, generate_and_upload_image
 from azoth_commands.autocomplete import autocomplete_from_table
+from azoth_commands.render_queue import render_queue, RenderQueueFull
 from constants import DEV_GUILD_ID, BOT_PLAYER_ID, ASSET_RENDER_PATHS, ASSET_BUCKET_NAMES, ASSET_DOWNLOAD_PATHS
 from supabase_helpers import fetch_all, update_record, get_deck_contents
-from supabase_storage import download_image
+from supabase_storage import download_images
 
 from azoth_logic.card_renderer import CardRenderer
 from azoth_logic.ritual_renderer import RitualRenderer
+from azoth_logic.print_sheet import PrintSheetWriter
 
 bucket = ASSET_BUCKET_NAMES["card"]
 render_dir = ASSET_RENDER_PATHS["card"]
@@ -18,6 +21,13 @@ render_dir = ASSET_RENDER_PATHS["card"]
 TABLE_NAME = "decks"
 MODEL_NAME = "deck"
 
+# Deck exports: content types with a renderer (aspects have none yet), items
+# handled per step (about one sheet, so only a page of art and renders is in
+# flight), and a longer queue timeout since a large deck may need many renders.
+PRINTABLE_TYPES = ("card", "ritual", "event", "consumable")
+PRINT_CHUNK = 9
+PRINT_EXPORT_TIMEOUT = 600
+
 def add_deck_commands(cls):
 
 	@nextcord.slash_command(name="create_deck", description="Create a new deck.", guild_ids=[DEV_GUILD_ID])
@@ -135,80 +145,166 @@ def add_deck_commands(cls):
 
 
 	@nextcord.slash_command(name="render_deck", description="Render the full contents of a deck.", guild_ids=[DEV_GUILD_ID])
-	@safe_interaction(timeout=60, error_message="❌ Failed to render deck.")
+	@safe_interaction(timeout=10, error_message="❌ Failed to render deck.")
 	async def render_deck_cmd(
 		self,
 		interaction: Interaction,
 		name: str = SlashOption(description="Deck to render", autocomplete=True),
 	):
-		import io, uuid
-
 		matches = fetch_all(TABLE_NAME, filters={"name": name})
 		if len(matches) == 0:
 			return f"❌ Could not find {MODEL_NAME} named `{name}`."
 
 		deck = matches[0]
 
-		success, content_result = download_content_images(deck)
-		if not success:
-			return content_result
-		if len(content_result) == 0:
-			return f"⚠️ Deck `{name}` is empty."
+		async def work():
+			import io, uuid
+
+			success, content_result = await run_blocking(download_content_images, deck)
+			if not success:
+				return content_result
+			if len(content_result) == 0:
+				return f"⚠️ Deck `{name}` is empty."
 
-		render_dir = ASSET_RENDER_PATHS["deck"]
-		filename = f"deck_render_{uuid.uuid4().hex}.png"
-		output_path = os.path.join(render_dir, filename)
+			render_dir = ASSET_RENDER_PATHS["deck"]
+			filename = f"deck_render_{uuid.uuid4().hex}.png"
+			output_path = os.path.join(render_dir, filename)
 
-		renderer = CardRenderer()
-		# TODO support for RitualRenderer
-		renderer.create_card_grid(content_result, output_path)
+			renderer = CardRenderer()
+			# TODO support for RitualRenderer
+			await run_blocking(renderer.create_card_grid, content_result, output_path)
 
-		with open(output_path, "rb") as f:
-			image_bytes = f.read()
+			with open(output_path, "rb") as f:
+				image_bytes = f.read()
 
-		os.remove(output_path)
+			os.remove(output_path)
 
-		file = nextcord.File(io.BytesIO(image_bytes), filename="deck.png")
-		await interaction.followup.send(f"🖼️ Full deck: `{name}`", file=file)
+			file = nextcord.File(io.BytesIO(image_bytes), filename="deck.png")
+			return f"🖼️ Full deck: `{name}`", file
+
+		return await queue_render(interaction, f"deck `{name}`", work)
 
 
 	@nextcord.slash_command(name="render_hand", description="Render a sample hand from a deck.", guild_ids=[DEV_GUILD_ID])
-	@safe_interaction(timeout=60, error_message="❌ Failed to render hand.")
+	@safe_interaction(timeout=10, error_message="❌ Failed to render hand.")
 	async def render_hand_cmd(
 		self,
 		interaction: Interaction,
 		name: str = SlashOption(description="Deck name", autocomplete=True),
 		hand_size: int = SlashOption(description="Number of cards to draw (default 6)", default=6)
 	):
-		import io, uuid
-
 		matches = fetch_all(TABLE_NAME, filters={"name": name})
 		if len(matches) == 0:
 			return f"❌ Could not find {MODEL_NAME} named `{name}`."
 
 		deck = matches[0]
 
-		success, content_result = download_content_images(deck)
-		if not success:
-			return content_result
-		if len(content_result) == 0:
-			return f"⚠️ Deck `{name}` is empty."
+		async def work():
+			import io, uuid
+
+			success, content_result = await run_blocking(download_content_images, deck)
+			if not success:
+				return content_result
+			if len(content_result) == 0:
+				return f"⚠️ Deck `{name}` is empty."
 
-		render_dir = ASSET_RENDER_PATHS["deck"]
-		filename = f"deck_render_{uuid.uuid4().hex}.png"
-		output_path = os.path.join(render_dir, filename)
+			render_dir = ASSET_RENDER_PATHS["deck"]
+			filename = f"deck_render_{uuid.uuid4().hex}.png"
+			output_path = os.path.join(render_dir, filename)
 
-		renderer = CardRenderer()
-		# TODO support for RitualRenderer
-		renderer.create_sample_hand(content_result, output_path, hand_size)
+			renderer = CardRenderer()
+			# TODO support for RitualRenderer
+			await run_blocking(renderer.create_sample_hand, content_result, output_path, hand_size)
 
-		with open(output_path, "rb") as f:
-			image_bytes = f.read()
+			with open(output_path, "rb") as f:
+				image_bytes = f.read()
 
-		os.remove(output_path)  # ✅ cleanup
+			os.remove(output_path)  # ✅ cleanup
 
-		file = nextcord.File(io.BytesIO(image_bytes), filename="hand.png")
-		await interaction.followup.send(f"✋ Hand from `{name}`", file=file)
+			file = nextcord.File(io.BytesIO(image_bytes), filename="hand.png")
+			return f"✋ Hand from `{name}`", file
+
+		return await queue_render(interaction, f"hand from `{name}`", work)
+
+
+	@nextcord.slash_command(name="export_deck", description="Export a deck as a printable PDF.", guild_ids=[DEV_GUILD_ID])
+	@safe_interaction(timeout=10, error_message="❌ Failed to export deck.")
+	async def export_deck_cmd(
+		self,
+		interaction: Interaction,
+		name: str = SlashOption(description="Deck to export", autocomplete=True),
+		layout: str = SlashOption(
+			description="Page layout (default: tiled sheets)",
+			choices={"Tiled sheets with crop marks": "sheets", "One card per page, full bleed": "cards"},
+			default="sheets",
+		),
+		paper: str = SlashOption(description="Paper size for sheets", choices={"Letter": "letter", "A4": "a4"}, default="letter"),
+		ppi: int = SlashOption(description="Print resolution (default 200)", min_value=100, max_value=600, default=200),
+		rerender: bool = SlashOption(description="Render every item fresh instead of using cached renders", default=False),
+	):
+		matches = fetch_all(TABLE_NAME, filters={"name": name})
+		if len(matches) == 0:
+			return f"❌ Could not find {MODEL_NAME} named `{name}`."
+
+		deck = matches[0]
+
+		async def work():
+			import io, uuid
+
+			success, contents = await run_blocking(get_deck_contents, deck, True)
+			if not success:
+				return contents
+			printable = [item for item in contents if item["item_type"] in PRINTABLE_TYPES]
+			if not printable:
+				return f"⚠️ Deck `{name}` has nothing printable."
+
+			output_path = os.path.join(ASSET_RENDER_PATHS["deck"], f"deck_print_{uuid.uuid4().hex}.pdf")
+			os.makedirs(ASSET_RENDER_PATHS["deck"], exist_ok=True)
+			writer = PrintSheetWriter(output_path, layout, paper, ppi)
+			state = {}  # renderers and rendered/failed paths, shared across chunks
+			problems = []
+			try:
+				for start in range(0, len(printable), PRINT_CHUNK):
+					chunk = printable[start:start + PRINT_CHUNK]
+					problems += await run_blocking(export_chunk, writer, chunk, state, rerender)
+				pages = await run_blocking(writer.close)
+				if not pages:
+					return f"❌ Nothing from `{name}` could be exported.\n" + format_problems(problems)
+
+				size = os.path.getsize(output_path)
+				limit = interaction.guild.filesize_limit if interaction.guild else 25 * 1024 * 1024
+				if size > limit:
+					return (
+						f"⚠️ The PDF for `{name}` is {size / (1024 * 1024):.1f} MB, over the "
+						f"{limit // (1024 * 1024)} MB upload limit. Try a lower `ppi`."
+					)
+				with open(output_path, "rb") as f:
+					pdf_bytes = f.read()
+			finally:
+				if os.path.exists(output_path):
+					os.remove(output_path)
+
+			skipped = len(contents) - len(printable)
+			message = f"🖨️ `{name}`: {writer.cards} item(s) on {pages} page(s) at {ppi} ppi."
+			if skipped:
+				message += f"\n⚠️ Skipped {skipped} item(s) with no print renderer (aspects)."
+			if problems:
+				message += "\n" + format_problems(problems)
+			file = nextcord.File(io.BytesIO(pdf_bytes), filename=f"{name.lower().replace(' ', '_')}_print.pdf")
+			return message, file
+
+		return await queue_render(interaction, f"print export of `{name}`", work, timeout=PRINT_EXPORT_TIMEOUT)
+
+
+	@nextcord.slash_command(name="render_queue", description="Show the render queue status.", guild_ids=[DEV_GUILD_ID])
+	@safe_interaction(timeout=5, error_message="❌ Failed to read render queue.")
+	async def render_queue_cmd(self, interaction: Interaction):
+		stats = render_queue.stats()
+		return (
+			f"🎨 Render queue: **{stats['queued']}** waiting, **{stats['running']}**/{stats['workers']} rendering "
+			f"({stats['users_waiting']} user(s) waiting)\n"
+			f"• Completed: {stats['completed']} • Failed: {stats['failed']}"
+		)
 
 
 	@nextcord.slash_command(name="add_to_deck", description="Add a card or fate to a deck.", guild_ids=[DEV_GUILD_ID])
@@ -258,6 +354,15 @@ def add_deck_commands(cls):
 
 	# Deck Helpers
 
+	async def queue_render(interaction: Interaction, label: str, work, **kwargs):
+		try:
+			position = await render_queue.submit(interaction, label, work, **kwargs)
+		except RenderQueueFull as e:
+			return f"🚦 {e}"
+		if position <= 1:
+			return f"🕒 Queued render of {label}."
+		return f"🕒 Queued render of {label} (position {position} in queue)."
+
 	def download_content_images(deck: dict):
 		success, contents = get_deck_contents(deck, full=True)
 		if not success:
@@ -265,22 +370,119 @@ def add_deck_commands(cls):
 		if not contents:
 			return True, []
 
+		# Collect every (bucket, image) the deck needs; duplicates are fetched once
+		objects = []
+		labels = {}
 		for item in contents:
-			item_type = item["item_type"]
-			download_dir = ASSET_DOWNLOAD_PATHS[item_type]
-			bucket = ASSET_BUCKET_NAMES[item_type]
+			for pair, label in content_images(item):
+				objects.append(pair)
+				labels.setdefault(pair, label)
+
+		results = download_images(objects, download_dirs())
+
+		failures = [
+			f"• `{labels.get(pair) or pair[1]}`: {result}"
+			for pair, (image_success, result) in results.items()
+			if not image_success
+		]
+		if failures:
+			return False, f"⚠️ Could not load {len(failures)} image(s):\n" + format_problems(failures)
+		return True, contents
+
+	def content_images(item: dict) -> list[tuple[tuple[str, str], str]]:
+		"""((bucket, image), label) for each piece of art a deck item is rendered from."""
+		bucket = ASSET_BUCKET_NAMES[item["item_type"]]
+		if item["item_type"] == "ritual":
+			sides = [(item.get("challenge_image"), item.get("challenge_name")), (item.get("reward_image"), item.get("reward_name"))]
+		else:
+			sides = [(item.get("image"), item.get("name"))]
+		return [((bucket, image_name), label) for image_name, label in sides]
+
+	def download_dirs() -> dict[str, str]:
+		return {ASSET_BUCKET_NAMES[t]: ASSET_DOWNLOAD_PATHS[t] for t in ASSET_DOWNLOAD_PATHS}
+
+	def format_problems(problems: list[str], limit: int = 10) -> str:
+		shown = problems[:limit]
+		if len(problems) > len(shown):
+			shown.append(f"... and {len(problems) - len(shown)} more.")
+		return "\n".join(shown)
+
+	def print_render(item: dict, renderers: dict):
+		"""(render path, render function, renderer) for a printable deck item."""
+		item_type = item["item_type"]
+		if item_type == "card":
+			if "card" not in renderers:
+				renderers["card"] = CardRenderer()
+			renderer = renderers["card"]
+			render, name = renderer.render_card, item["name"]
+		else:
+			if "fate" not in renderers:
+				renderers["fate"] = RitualRenderer()
+			renderer = renderers["fate"]
 			if item_type == "ritual":
-				image_success, image_result = download_image(item["challenge_image"], bucket, download_dir)
-				if not image_success:
-					return False, f"⚠️ Could not load image for `{item['challenge_name']}`:\n{image_result}"
-				image_success, image_result = download_image(item["reward_image"], bucket, download_dir)
-				if not image_success:
-					return False, f"⚠️ Could not load image for `{item['reward_name']}`:\n{image_result}"
+				render, name = renderer.render_ritual, item["challenge_name"]
 			else:
-				image_success, image_result = download_image(item["image"], bucket, download_dir)
-				if not image_success:
-					return False, f"⚠️ Could not load image for `{item['name']}`:\n{image_result}"
-		return True, contents
+				render, name = renderer.render_fate, item["name"]
+		render_dir = ASSET_RENDER_PATHS[item_type]
+		path = os.path.join(render_dir, f"{name.lower().replace(' ', '_')}.png")
+		return path, lambda: render(item, output_dir=render_dir), renderer
+
+	def render_is_current(path: str, item: dict) -> bool:
+		"""
+		Whether a cached render exists and was made after the record's last edit.
+		Edits made outside the bot (dashboard, /bulk_update) don't re-render, so an
+		older render may show stale text or art.
+		"""
+		if not os.path.exists(path):
+			return False
+		updated_at = item.get("updated_at")
+		if not updated_at:
+			return True
+		try:
+			edited = datetime.fromisoformat(updated_at.replace("Z", "+00:00")).timestamp()
+		except ValueError:
+			return False
+		return os.path.getmtime(path) >= edited
+
+	def export_chunk(writer: PrintSheetWriter, chunk: list[dict], state: dict, rerender: bool) -> list[str]:
+		"""
+		Add one chunk of deck items to a print export. Cached renders are reused when
+		newer than the record's updated_at; art is downloaded and renders are made only
+		for the other items (or all, with rerender; each item is still rendered once
+		per export). Blocking.
+		Returns a line per item that couldn't be added.
+		"""
+		renderers = state.setdefault("renderers", {})
+		rendered, failed = state.setdefault("rendered", set()), state.setdefault("failed", set())
+		plans = [(item, *print_render(item, renderers)) for item in chunk]
+
+		def needs_render(item: dict, path: str) -> bool:
+			return path not in rendered and (rerender or not render_is_current(path, item))
+
+		# One download for the chunk's missing art
+		objects = [
+			pair for item, path, _render, _renderer in plans if needs_render(item, path)
+			for pair, _label in content_images(item)
+		]
+		downloads = download_images(objects, download_dirs()) if objects else {}
+
+		problems = []
+		for item, path, render, renderer in plans:
+			if path in failed:
+				continue  # another copy of this item; already reported
+			label = item.get("name") or item.get("challenge_name")
+			try:
+				if needs_render(item, path):
+					missing = [pair for pair, _label in content_images(item) if not downloads.get(pair, (False,))[0]]
+					if missing:
+						raise ValueError("could not load its art.")
+					render()
+					rendered.add(path)
+				writer.add_card(path, renderer.ppi)
+			except Exception as e:
+				failed.add(path)
+				problems.append(f"• `{label}`: {e}")
+		return problems
 
 
 	@nextcord.slash_command(name="postpone", description="Move all of the copies of the item from live draft decks to Removed decks.", guild_ids=[DEV_GUILD_ID])
@@ -599,6 +801,7 @@ def add_deck_commands(cls):
 	@remove_from_deck_cmd.on_autocomplete("deck_name")
 	@render_deck_cmd.on_autocomplete("name")
 	@render_hand_cmd.on_autocomplete("name")
+	@export_deck_cmd.on_autocomplete("name")
 	async def autocomplete_deck_name(self, interaction: Interaction, input: str):
 		command = interaction.data.get("name")
 		if command == "render_hand" or command == "render_deck":
@@ -641,19 +844,12 @@ def add_deck_commands(cls):
 	@add_to_deck_cmd.on_autocomplete("item_name")
 	@stage_cmd.on_autocomplete("item_name")
 	async def autocomplete_item_name(self, interaction: Interaction, input: str):
-		from supabase_helpers import encode_item_ref, make_item_label
+		from supabase_helpers import encode_item_ref
+		from item_names import item_names
 
-		input_lower = input.lower()
 		choices = {}
-
-		tables = [("cards", "card"), ("aspects", "aspect"), ("events", "event")]
-		for table, content_type in tables:
-			records = fetch_all(table, columns=["id", "name"])
-			for r in records:
-				name = r.get("name")
-				if name and input_lower in name.lower():
-					label = make_item_label(name, content_type, r["id"])
-					choices[label] = encode_item_ref(content_type, r["id"])
+		for content_type, item_id, name in item_names.search(input, ["card", "aspect", "event"]):
+			choices[item_names.label(content_type, item_id)] = encode_item_ref(content_type, item_id)
 
 		# Sort by label (case-insensitive) and cap at Discord's 25-choice limit
 		sorted_items = sorted(choices.items(), key=lambda kv: kv[0].lower())[:25]
@@ -699,6 +895,7 @@ def add_deck_commands(cls):
 	cls.get_deck_cmd	= get_deck_cmd
 	cls.render_deck_cmd = render_deck_cmd
 	cls.render_hand_cmd = render_hand_cmd
+	cls.render_queue_cmd = render_queue_cmd
 	cls.add_to_deck_cmd = add_to_deck_cmd
 	cls.remove_from_deck_cmd = remove_from_deck_cmd
 	cls.postpone_cmd = postpone_cmd
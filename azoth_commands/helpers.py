@@ -4,10 +4,18 @@ import nextcord
 import os
 import re
 import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 load_dotenv()
 
+# Renderers and the eigenfunction generator are synchronous and CPU-heavy. They
+# run on this pool so the event loop (gateway heartbeat, other commands) keeps
+# going and safe_interaction's timeout can actually fire.
+RENDER_EXECUTOR_WORKERS = 2
+_render_executor = ThreadPoolExecutor(max_workers=RENDER_EXECUTOR_WORKERS, thread_name_prefix="azoth-render")
+
 AUTHORIZED_USER_IDS = set(
 	int(uid.strip())
 	for uid in os.getenv("AUTHORIZED_USER_IDS", "").split(",")
@@ -50,6 +58,17 @@ def safe_interaction(timeout=10, error_message="⚠️ Something went wrong.", r
 	return decorator
 
 
+async def run_blocking(func, *args, **kwargs):
+	"""
+	Runs a blocking render/generate/download call on the render executor.
+	If the awaiting command is cancelled or times out before the call starts, the
+	call is dropped. A call that already started can't be interrupted; it finishes
+	on its worker thread and the result is discarded.
+	"""
+	loop = asyncio.get_running_loop()
+	return await loop.run_in_executor(_render_executor, functools.partial(func, *args, **kwargs))
+
+
 def generate_image_filename(name: str, version: int) -> str:
 	safe_name = re.sub(r'\W+', '_', name.lower()).strip('_')
 	return f"{safe_name}_{version}.png"
@@ -77,22 +96,31 @@ def generate_and_upload_image(obj_data: dict, bucket: str, ritual_side: str = ""
 	Returns (success: bool, file_path or error string)
 	"""
 
-	# Generate image using shared function
-	success, image_path = generate_image(obj_data)
-	if not success:
-		return False, image_path  # this is the error string
+	# A unique path per call: this runs in parallel on the render executor, and the
+	# generator's default names only differ by the second
+	os.makedirs("combinations", exist_ok=True)
+	output_path = os.path.join("combinations", f"generated_{uuid.uuid4().hex}.png")
 
 	try:
-		with open(image_path, "rb") as f:
-			image_bytes = f.read()
-
-		if ritual_side != "":
-			return upload_image(obj_data[f"{ritual_side}_name"], image_bytes, bucket)
-		else:
-			return upload_image(obj_data["name"], image_bytes, bucket)
-
-	except Exception as e:
-		return False, f"❌ Failed to upload image: {e}"
+		# Generate image using shared function
+		success, image_path = generate_image(obj_data, output_path=output_path)
+		if not success:
+			return False, image_path  # this is the error string
+
+		try:
+			with open(image_path, "rb") as f:
+				image_bytes = f.read()
+
+			if ritual_side != "":
+				return upload_image(obj_data[f"{ritual_side}_name"], image_bytes, bucket)
+			else:
+				return upload_image(obj_data["name"], image_bytes, bucket)
+
+		except Exception as e:
+			return False, f"❌ Failed to upload image: {e}"
+	finally:
+		if os.path.exists(output_path):
+			os.remove(output_path)
 
 
 def record_to_json(record: dict):
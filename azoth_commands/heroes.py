@@ -3,7 +3,7 @@ import json
 import nextcord
 from nextcord.ext import commands
 from nextcord import SlashOption, Interaction
-from azoth_commands.helpers import safe_interaction, generate_and_upload_image, record_to_json
+from azoth_commands.helpers import safe_interaction, run_blocking, generate_and_upload_image, record_to_json
 from azoth_commands.autocomplete import autocomplete_from_table
 from constants import DEV_GUILD_ID, BOT_PLAYER_ID, ASSET_RENDER_PATHS, ASSET_BUCKET_NAMES, ASSET_DOWNLOAD_PATHS
 from supabase_helpers import fetch_all, update_record
@@ -178,11 +178,11 @@ def add_hero_commands(cls):
 		record = matches[0]
 
 		# Download the art from Supabase
-		image_success, image_result = download_image(record["image"], bucket, download_dir)
+		image_success, image_result = await run_blocking(download_image, record["image"], bucket, download_dir)
 		if not image_success:
 			return f"⚠️ Could not load image for `{name}`:\n{image_result}"
 
-		render_path = renderer.render_card(record)
+		render_path = await run_blocking(renderer.render_card, record)
 		await interaction.followup.send(file=nextcord.File(render_path))
 
 
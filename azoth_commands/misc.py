@@ -1,15 +1,17 @@
+import io
 import os
 import json
+import time
 import nextcord
-import aiohttp
-from datetime import datetime, timezone
 from nextcord.ext import commands
 from nextcord import SlashOption, Interaction
 from azoth_commands.helpers import safe_interaction, record_to_json, to_snake_case
 from azoth_commands.autocomplete import autocomplete_from_table
 from constants import DEV_GUILD_ID, BOT_PLAYER_ID
-from supabase_helpers import fetch_all, update_record, create_record
-from supabase_client import supabase
+from supabase_helpers import update_record, create_record
+from http_session import get_http_session
+from supabase_bulk import bulk_update_table, bulk_insert_table
+from bulk_ingest import ingest
 
 
 # Discord messages cap at 2000 chars; leave room for the success summary
@@ -33,74 +35,91 @@ def _format_bulk_summary(success_lines: list[str], error_lines: list[str]) -> st
 	return message
 
 
+# Attachments with these extensions are read as one row per line (see bulk_ingest.NdjsonParser)
+_NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+# Minimum gap between progress edits of the command's response
+_PROGRESS_EDIT_SEC = 2.0
+
+
+def _progress_reporter(interaction: Interaction, verb: str):
+	"""on_progress callback for bulk_ingest.ingest: edits the deferred response with per-table counts."""
+	last_edit = 0.0
+	latest: dict[str, tuple[int, int]] = {}
+
+	async def report(progress: dict[str, tuple[int, int]] = None, final: bool = False):
+		"""Show `progress` (table -> rows done, rows read); final=True shows the last one as finished."""
+		nonlocal last_edit
+		latest.update(progress or {})
+		now = time.monotonic()
+		if not final and now - last_edit < _PROGRESS_EDIT_SEC:
+			return
+		last_edit = now
+		header = f"✅ {verb} finished." if final else f"⏳ {verb}…"
+		lines = [f"`{table}`: {rows_done}/{rows_read} rows" for table, (rows_done, rows_read) in latest.items()]
+		try:
+			await interaction.edit_original_message(content="\n".join([header] + lines)[:_MAX_RESPONSE_CHARS])
+		except nextcord.HTTPException:
+			pass
+
+	return report
+
+
+async def _ingest_attachment(interaction: Interaction, attachment: nextcord.Attachment, write, mode: str, verb: str):
+	"""
+	Stream an uploaded bulk file into `write` (see bulk_ingest.ingest), showing
+	progress in the command's response. Returns (results, file errors).
+	"""
+	report = _progress_reporter(interaction, verb)
+	session = await get_http_session()
+	async with session.get(attachment.url) as resp:
+		resp.raise_for_status()
+		ndjson = attachment.filename.lower().endswith(_NDJSON_EXTENSIONS)
+		results, errors = await ingest(
+			resp.content.iter_chunked(_DOWNLOAD_CHUNK_BYTES), write, mode, ndjson=ndjson, on_progress=report,
+		)
+	await report(final=True)
+	return results, errors
+
+
 def add_misc_commands(cls):
 
 	@nextcord.slash_command(name="bulk_update", description="Bulk update fields on existing records using a JSON file.", guild_ids=[DEV_GUILD_ID])
-	@safe_interaction(timeout=60, error_message="❌ Failed to bulk update.", require_authorized=True)
+	@safe_interaction(timeout=300, error_message="❌ Failed to bulk update.", require_authorized=True)
 	async def bulk_update_cmd(
 	    self,
 	    interaction: Interaction,
-	    json_file: nextcord.Attachment = SlashOption(description="Upload a JSON file", required=True)
+	    json_file: nextcord.Attachment = SlashOption(description="Upload a JSON or NDJSON file", required=True),
+	    dry_run: bool = SlashOption(description="Only show which fields would change", required=False, default=False)
 	):
-	    # Download the uploaded JSON file
-	    async with aiohttp.ClientSession() as session:
-	        async with session.get(json_file.url) as resp:
-	            try:
-	                payload = await resp.json()
-	            except Exception as e:
-	                return f"❌ Uploaded file is not valid JSON: {e}"
+	    def write(table, rows, labels):
+	        return bulk_update_table(table, rows, labels, dry_run)
 
-	    if not isinstance(payload, dict):
-	        return "❌ JSON must be an object with table names as keys."
+	    # Rows are applied batch by batch as the file downloads
+	    results, error_lines = await _ingest_attachment(interaction, json_file, write, "update", "Dry run" if dry_run else "Bulk update")
 
 	    success_lines: list[str] = []
-	    error_lines: list[str] = []
+	    diff_lines: list[str] = []
 	    total_updates = 0
-
-	    # Iterate over each table in the JSON
-	    for table, updates in payload.items():
-	        if not isinstance(updates, list):
-	            error_lines.append(f"⚠️ Skipped `{table}` (value is not a list).")
-	            continue
-
-	        table_updates = 0
-	        for entry in updates:
-	            original_name = entry.get("name")
-	            if not original_name:
-	                error_lines.append(f"⚠️ `{table}`: entry missing `name` field; skipped.")
-	                continue
-
-	            update_data = entry.copy()
-	            update_data.pop("name", None)
-
-	            if "new_name" in update_data:
-	                update_data["name"] = update_data.pop("new_name")
-
-	            # Lookup record by original name
-	            try:
-	                matches = fetch_all(table, filters={"name": original_name})
-	            except Exception as e:
-	                error_lines.append(f"❌ `{table}` / `{original_name}`: lookup failed — `{e}`")
-	                continue
-
-	            if not matches:
-	                error_lines.append(f"⚠️ `{table}` / `{original_name}`: no record with that name.")
-	                continue
-
-	            record = matches[0]
-	            try:
-	                update_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-	                response = supabase.table(table).update(update_data).eq("id", record["id"]).execute()
-	                if response.data:
-	                    table_updates += 1
-	                else:
-	                    error_lines.append(f"⚠️ `{table}` / `{original_name}`: update returned no rows.")
-	            except Exception as e:
-	                error_lines.append(f"❌ `{table}` / `{original_name}`: {e}")
-
-	        if table_updates > 0:
-	            success_lines.append(f"✅ Updated {table_updates} record(s) in `{table}`.")
-	            total_updates += table_updates
+	    for table, result in results.items():
+	        error_lines.extend(result.errors)
+	        if result.diffs:
+	            diff_lines.append(f"# {table}")
+	            diff_lines.extend(result.diffs)
+	        summary = result.summary_line()
+	        if summary:
+	            success_lines.append(summary)
+	        total_updates += result.applied
+
+	    if dry_run:
+	        message = "🔍 **Dry run** — nothing was written.\n" + _format_bulk_summary(success_lines, error_lines)
+	        if not diff_lines:
+	            return message
+	        diff = io.BytesIO("\n".join(diff_lines).encode("utf-8"))
+	        await interaction.followup.send(message, file=nextcord.File(diff, filename="bulk_update_diff.txt"))
+	        return None
 
 	    if total_updates == 0 and not error_lines:
 	        return "❌ No records were updated (input contained no actionable rows)."
@@ -115,51 +134,23 @@ def add_misc_commands(cls):
 
 
 	@nextcord.slash_command(name="bulk_insert", description="Bulk insert new records using a JSON file.", guild_ids=[DEV_GUILD_ID])
-	@safe_interaction(timeout=60, error_message="❌ Failed to bulk insert.", require_authorized=True)
+	@safe_interaction(timeout=300, error_message="❌ Failed to bulk insert.", require_authorized=True)
 	async def bulk_insert_cmd(
 	    self,
 	    interaction: Interaction,
-	    json_file: nextcord.Attachment = SlashOption(description="Upload a JSON file", required=True)
+	    json_file: nextcord.Attachment = SlashOption(description="Upload a JSON or NDJSON file", required=True)
 	):
-	    # Download the uploaded JSON file
-	    async with aiohttp.ClientSession() as session:
-	        async with session.get(json_file.url) as resp:
-	            try:
-	                payload = await resp.json()
-	            except Exception as e:
-	                return f"❌ Uploaded file is not valid JSON: {e}"
-
-	    if not isinstance(payload, dict):
-	        return "❌ JSON must be an object with table names as keys."
+	    # Rows are applied batch by batch as the file downloads
+	    results, error_lines = await _ingest_attachment(interaction, json_file, bulk_insert_table, "insert", "Bulk insert")
 
 	    success_lines: list[str] = []
-	    error_lines: list[str] = []
 	    total_inserts = 0
-
-	    for table, records in payload.items():
-	        if not isinstance(records, list):
-	            error_lines.append(f"⚠️ Skipped `{table}` (value is not a list).")
-	            continue
-
-	        table_inserts = 0
-	        for index, entry in enumerate(records):
-	            if not isinstance(entry, dict) or not entry:
-	                error_lines.append(f"⚠️ `{table}[{index}]`: entry is empty or not an object; skipped.")
-	                continue
-
-	            label = entry.get("name") or f"index {index}"
-	            try:
-	                response = supabase.table(table).insert(entry).execute()
-	                if response.data:
-	                    table_inserts += 1
-	                else:
-	                    error_lines.append(f"⚠️ `{table}` / `{label}`: insert returned no data.")
-	            except Exception as e:
-	                error_lines.append(f"❌ `{table}` / `{label}`: {e}")
-
-	        if table_inserts > 0:
-	            success_lines.append(f"✅ Inserted {table_inserts} record(s) into `{table}`.")
-	            total_inserts += table_inserts
+	    for result in results.values():
+	        error_lines.extend(result.errors)
+	        summary = result.summary_line("Inserted")
+	        if summary:
+	            success_lines.append(summary)
+	        total_inserts += result.applied
 
 	    if total_inserts == 0 and not error_lines:
 	        return "❌ No records were inserted (input contained no actionable rows)."
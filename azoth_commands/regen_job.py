@@ -0,0 +1,406 @@
+import asyncio
+import json
+import os
+import time
+import nextcord
+from datetime import datetime, timezone
+from nextcord import SlashOption, Interaction
+from azoth_commands.helpers import safe_interaction, run_blocking
+from azoth_commands.autocomplete import autocomplete_from_table
+from constants import DEV_GUILD_ID, ASSET_RENDER_PATHS, ASSET_BUCKET_NAMES, ASSET_DOWNLOAD_PATHS
+from supabase_client import supabase
+from supabase_helpers import build_select, iter_all, iter_query, update_record
+from supabase_storage import download_image, upload_image
+from azoth_logic.image_generator import generate_image
+
+# Content types a job can cover. Rituals have two art sides and are left out.
+REGEN_TYPES = ["card", "event", "consumable"]
+# Checkpoints live here, one JSON file per job
+REGEN_JOBS_DIR = os.path.join("assets", "regen_jobs")
+# Items in flight at once. Generation and rendering share the render executor
+# (see helpers.run_blocking), so this mostly overlaps their CPU work with uploads,
+# downloads and record updates.
+REGEN_ITEM_CONCURRENCY = 4
+# Storage transfers in flight at once, per job
+REGEN_TRANSFER_CONCURRENCY = 4
+# Records fetched per `in_` lookup while working through a job
+REGEN_FETCH_CHUNK = 100
+# Minimum gap between edits of the progress message
+PROGRESS_EDIT_SEC = 5
+# Failures listed in the final summary
+MAX_FAILURE_LINES = 10
+
+
+def _renderer_for(content_type: str):
+	"""Render function for a content type (the command modules' shared renderers)."""
+	if content_type == "card":
+		from azoth_commands.cards import renderer
+		return renderer.render_card
+	if content_type == "event":
+		from azoth_commands.events import renderer
+	else:
+		from azoth_commands.consumables import renderer
+	return renderer.render_fate
+
+
+def _checkpoint_path(job_id: str) -> str:
+	return os.path.join(REGEN_JOBS_DIR, f"{job_id}.json")
+
+
+def _select_ids(content_type: str, element: str = None, type_text: str = None, deck: str = None) -> list[int]:
+	"""
+	Ids of the records a job covers, in id order. Blocking.
+	Reads raise on error, so a failed lookup can't pass for an empty deck.
+	"""
+	deck_ids = None
+	if deck:
+		matches = build_select("decks", ["id"], {"name": deck}, limit=1).execute().data
+		if not matches:
+			raise ValueError(f"Could not find deck named `{deck}`.")
+		rows = iter_all("deck_contents", columns=["id", "content_id"],
+						filters={"deck_id": matches[0]["id"], "content_type": content_type}, key="id")
+		deck_ids = sorted({row["content_id"] for row in rows})
+		if not deck_ids:
+			return []
+
+	def make_query():
+		query = supabase.table(f"{content_type}s").select("id")
+		if element:
+			query = query.eq("element", element)
+		if type_text:
+			query = query.ilike("type", f"%{type_text}%")
+		if deck_ids is not None:
+			query = query.in_("id", deck_ids)
+		return query
+
+	return [row["id"] for row in iter_query(make_query, key="id")]
+
+
+class RegenJob:
+	"""
+	Bulk "regenerate and rerender" over a filtered set of records.
+
+	Each item goes through generate -> upload -> record update -> download -> render
+	(or just download -> render in "rerender" mode). Up to REGEN_ITEM_CONCURRENCY
+	items are in the pipeline at once, so one item uploads while another generates.
+	Progress is checkpointed to REGEN_JOBS_DIR after every item. A cancelled or
+	crashed job resumes with the items that aren't done yet, failed ones included.
+	"""
+
+	def __init__(self, state: dict):
+		self.state = state
+		self.cancelled = False
+		self.task: asyncio.Task | None = None
+		self._message = None
+		self._last_edit = 0.0
+		self._transfers = asyncio.Semaphore(REGEN_TRANSFER_CONCURRENCY)
+
+	@classmethod
+	def create(cls, content_type: str, ids: list[int], filters: dict, mode: str, channel_id: int, user_id: int):
+		stamp = datetime.now(timezone.utc)
+		return cls({
+			"id": f"{content_type}-{stamp:%Y%m%d-%H%M%S}",
+			"content_type": content_type,
+			"filters": filters,
+			"mode": mode,
+			"channel_id": channel_id,
+			"user_id": user_id,
+			"created_at": stamp.isoformat(),
+			"finished_at": None,
+			"ids": ids,
+			"done": [],
+			"failed": {},
+		})
+
+	@classmethod
+	def load(cls, job_id: str):
+		with open(_checkpoint_path(job_id), encoding="utf-8") as f:
+			return cls(json.load(f))
+
+	@property
+	def id(self) -> str:
+		return self.state["id"]
+
+	@property
+	def content_type(self) -> str:
+		return self.state["content_type"]
+
+	@property
+	def remaining(self) -> list[int]:
+		done = set(self.state["done"])
+		return [item_id for item_id in self.state["ids"] if item_id not in done]
+
+	def describe(self) -> str:
+		filters = ", ".join(f"{k}={v}" for k, v in self.state["filters"].items() if v) or "all"
+		return f"`{self.id}` ({self.state['mode']} {self.content_type}s: {filters})"
+
+	def progress_line(self) -> str:
+		total = len(self.state["ids"])
+		done = len(self.state["done"])
+		failed = len(self.state["failed"])
+		return f"{done}/{total} done" + (f", {failed} failed" if failed else "")
+
+	def save(self):
+		"""Write the checkpoint (atomically, so a crash mid-write keeps the previous one)."""
+		os.makedirs(REGEN_JOBS_DIR, exist_ok=True)
+		path = _checkpoint_path(self.id)
+		with open(path + ".tmp", "w", encoding="utf-8") as f:
+			json.dump(self.state, f)
+		os.replace(path + ".tmp", path)
+
+	# --- Pipeline ---
+
+	async def _regenerate(self, record: dict):
+		content_type = self.content_type
+		bucket = ASSET_BUCKET_NAMES[content_type]
+		os.makedirs("combinations", exist_ok=True)
+		output_path = os.path.join("combinations", f"regen_{self.id}_{record['id']}.png")
+		try:
+			success, image_path = await run_blocking(generate_image, record, output_path=output_path)
+			if not success:
+				raise RuntimeError(image_path)
+			with open(image_path, "rb") as f:
+				image_bytes = f.read()
+		finally:
+			if os.path.exists(output_path):
+				os.remove(output_path)
+
+		async with self._transfers:
+			success, file_name = await asyncio.to_thread(upload_image, record["name"], image_bytes, bucket)
+		if not success:
+			raise RuntimeError(file_name)
+		if not await asyncio.to_thread(update_record, f"{content_type}s", record["id"], {"image": file_name}):
+			raise RuntimeError("could not save the new image on the record")
+		record["image"] = file_name
+
+	async def _process(self, record: dict):
+		content_type = self.content_type
+		if self.state["mode"] == "regenerate":
+			await self._regenerate(record)
+		if not record.get("image"):
+			raise RuntimeError("record has no art to render")
+
+		async with self._transfers:
+			success, local_path = await asyncio.to_thread(
+				download_image, record["image"], ASSET_BUCKET_NAMES[content_type], ASSET_DOWNLOAD_PATHS[content_type],
+			)
+		if not success:
+			raise RuntimeError(local_path)
+		await run_blocking(_renderer_for(content_type), record, output_dir=ASSET_RENDER_PATHS[content_type])
+
+	async def _run_item(self, record: dict, slots: asyncio.Semaphore):
+		try:
+			if self.cancelled:
+				return
+			await self._process(record)
+			self.state["done"].append(record["id"])
+			self.state["failed"].pop(str(record["id"]), None)
+		except Exception as e:
+			self.state["failed"][str(record["id"])] = f"{record.get('name', record['id'])}: {e}"
+		finally:
+			slots.release()
+		self.save()
+		await self._report()
+
+	async def _report(self, final: bool = False):
+		now = time.monotonic()
+		if self._message is None or (not final and now - self._last_edit < PROGRESS_EDIT_SEC):
+			return
+		self._last_edit = now
+		status = "✅ Finished" if final and not self.cancelled else "🛑 Cancelled" if final else "🎨 Running"
+		try:
+			await self._message.edit(content=f"{status} {self.describe()}: {self.progress_line()}")
+		except nextcord.HTTPException:
+			pass
+
+	async def run(self, channel):
+		"""Work through the remaining items, posting progress to `channel`."""
+		remaining = self.remaining
+		self._message = await channel.send(f"🎨 Starting {self.describe()}: {len(remaining)} item(s) to go.")
+		self.save()
+
+		slots = asyncio.Semaphore(REGEN_ITEM_CONCURRENCY)
+		tasks = set()
+		table = f"{self.content_type}s"
+		try:
+			for start in range(0, len(remaining), REGEN_FETCH_CHUNK):
+				if self.cancelled:
+					break
+				chunk = remaining[start:start + REGEN_FETCH_CHUNK]
+				# A chunk fits in one page; a failed read raises and stops the job
+				# (resumable) rather than marking the whole chunk as missing
+				query = build_select(table, filters={"id": chunk})
+				records = {r["id"]: r for r in (await asyncio.to_thread(query.execute)).data or []}
+				for item_id in chunk:
+					record = records.get(item_id)
+					if record is None:
+						self.state["failed"][str(item_id)] = f"#{item_id}: record no longer exists"
+						continue
+					# Only a page of records is held: wait for a free slot before starting the next
+					await slots.acquire()
+					if self.cancelled:
+						slots.release()
+						break
+					tasks.add(asyncio.create_task(self._run_item(record, slots)))
+					tasks = {t for t in tasks if not t.done()}
+		finally:
+			# Let items in flight finish and checkpoint, even when a read failed
+			if tasks:
+				await asyncio.gather(*tasks)
+
+		if not self.cancelled:
+			self.state["finished_at"] = datetime.now(timezone.utc).isoformat()
+		self.save()
+		await self._report(final=True)
+
+		failures = list(self.state["failed"].values())
+		lines = [f"{'🛑 Cancelled' if self.cancelled else '✅ Finished'} {self.describe()}: {self.progress_line()}."]
+		if failures:
+			lines.append("**Failures:**")
+			lines.extend(f"• {failure}" for failure in failures[:MAX_FAILURE_LINES])
+			if len(failures) > MAX_FAILURE_LINES:
+				lines.append(f"... and {len(failures) - MAX_FAILURE_LINES} more.")
+		if self.cancelled or failures:
+			lines.append(f"Resume with `/regen resume job_id:{self.id}`.")
+		await channel.send("\n".join(lines)[:1900])
+
+
+# job id -> running job
+running_jobs: dict[str, RegenJob] = {}
+
+
+def _resumable_jobs() -> list[RegenJob]:
+	"""Checkpointed jobs that haven't finished cleanly (newest first). Blocking."""
+	if not os.path.isdir(REGEN_JOBS_DIR):
+		return []
+	jobs = []
+	for file_name in os.listdir(REGEN_JOBS_DIR):
+		if not file_name.endswith(".json"):
+			continue
+		try:
+			job = RegenJob.load(file_name[:-5])
+		except (OSError, ValueError):
+			continue
+		if job.remaining or job.state["failed"]:
+			jobs.append(job)
+	return sorted(jobs, key=lambda job: job.id, reverse=True)
+
+
+def _start(job: RegenJob, channel):
+	running_jobs[job.id] = job
+
+	async def run():
+		try:
+			await job.run(channel)
+		except Exception as e:
+			job.save()
+			print(f"Regen job {job.id} stopped: {e}")
+			try:
+				await channel.send(f"❌ {job.describe()} stopped: `{e}`. Resume with `/regen resume job_id:{job.id}`.")
+			except nextcord.HTTPException:
+				pass
+		finally:
+			running_jobs.pop(job.id, None)
+
+	job.task = asyncio.create_task(run())
+
+
+def add_regen_commands(cls):
+
+	@nextcord.slash_command(name="regen", description="Bulk art regeneration and rerendering", guild_ids=[DEV_GUILD_ID])
+	async def regen_cmd(self, interaction: Interaction):
+		pass
+
+	@regen_cmd.subcommand(name="start", description="Regenerate art and rerender every matching record in the background")
+	@safe_interaction(timeout=30, error_message="❌ Failed to start the job.", require_authorized=True)
+	async def regen_start(
+		self,
+		interaction: Interaction,
+		content_type: str = SlashOption(description="What to regenerate", choices=REGEN_TYPES),
+		mode: str = SlashOption(
+			description="New art and render, or render existing art only",
+			choices={"Regenerate art and rerender": "regenerate", "Rerender only": "rerender"},
+			default="regenerate", required=False,
+		),
+		element: str = SlashOption(description="Only this element", required=False, autocomplete=True),
+		type: str = SlashOption(description="Only types containing this text (e.g. Arcana)", required=False),
+		deck: str = SlashOption(description="Only items in this deck", required=False, autocomplete=True),
+	):
+		if running_jobs:
+			job = next(iter(running_jobs.values()))
+			return f"🚦 {job.describe()} is still running ({job.progress_line()}). Wait for it or cancel it first."
+
+		try:
+			ids = await asyncio.to_thread(_select_ids, content_type, element, type, deck)
+		except ValueError as e:
+			return f"❌ {e}"
+		if not ids:
+			return f"❌ No {content_type}s match those filters."
+
+		job = RegenJob.create(
+			content_type, ids, {"element": element, "type": type, "deck": deck}, mode,
+			interaction.channel_id, interaction.user.id,
+		)
+		_start(job, interaction.channel)
+		return f"🕒 Started {job.describe()} for {len(ids)} item(s). Progress will be posted here."
+
+	@regen_cmd.subcommand(name="resume", description="Resume a cancelled or failed job from its checkpoint")
+	@safe_interaction(timeout=30, error_message="❌ Failed to resume the job.", require_authorized=True)
+	async def regen_resume(
+		self,
+		interaction: Interaction,
+		job_id: str = SlashOption(description="Job to resume", autocomplete=True),
+	):
+		if job_id in running_jobs:
+			return f"🚦 `{job_id}` is already running."
+		if running_jobs:
+			return "🚦 Another job is running. Wait for it or cancel it first."
+		try:
+			job = RegenJob.load(job_id)
+		except (OSError, ValueError):
+			return f"❌ No checkpoint for job `{job_id}`."
+		if not job.remaining:
+			return f"✅ {job.describe()} has nothing left to do."
+
+		job.state["finished_at"] = None
+		_start(job, interaction.channel)
+		return f"🕒 Resuming {job.describe()}: {len(job.remaining)} item(s) left."
+
+	@regen_cmd.subcommand(name="status", description="Show running and resumable jobs")
+	@safe_interaction(timeout=10, error_message="❌ Failed to read job status.")
+	async def regen_status(self, interaction: Interaction):
+		lines = [f"🎨 {job.describe()}: {job.progress_line()}" for job in running_jobs.values()]
+		for job in await asyncio.to_thread(_resumable_jobs):
+			if job.id not in running_jobs:
+				lines.append(f"⏸️ {job.describe()}: {job.progress_line()}")
+		return "\n".join(lines[:20]) if lines else "No regeneration jobs running or waiting to resume."
+
+	@regen_cmd.subcommand(name="cancel", description="Stop the running job after the items in progress")
+	@safe_interaction(timeout=10, error_message="❌ Failed to cancel the job.", require_authorized=True)
+	async def regen_cancel(self, interaction: Interaction):
+		if not running_jobs:
+			return "No regeneration job is running."
+		for job in running_jobs.values():
+			job.cancelled = True
+		return "🛑 Cancelling; items already in progress will finish and the checkpoint will be kept."
+
+	@regen_start.on_autocomplete("element")
+	async def autocomplete_regen_element(self, interaction: Interaction, input: str):
+		suggestions = autocomplete_from_table("card_elements", input)
+		await interaction.response.send_autocomplete(suggestions[:25])
+
+	@regen_start.on_autocomplete("deck")
+	async def autocomplete_regen_deck(self, interaction: Interaction, input: str):
+		suggestions = autocomplete_from_table(table_name="decks", input=input)
+		await interaction.response.send_autocomplete(suggestions[:25])
+
+	@regen_resume.on_autocomplete("job_id")
+	async def autocomplete_regen_job(self, interaction: Interaction, input: str):
+		job_ids = [job.id for job in await asyncio.to_thread(_resumable_jobs)]
+		await interaction.response.send_autocomplete([j for j in job_ids if input.lower() in j.lower()][:25])
+
+	cls.regen_cmd = regen_cmd
+	cls.regen_start = regen_start
+	cls.regen_resume = regen_resume
+	cls.regen_status = regen_status
+	cls.regen_cancel = regen_cancel
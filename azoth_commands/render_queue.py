@@ -0,0 +1,178 @@
+import asyncio
+import collections
+import time
+from datetime import datetime, timezone
+import nextcord
+
+# Render jobs run on a small pool of workers. Pending jobs are kept per user and
+# served round-robin, so one designer queuing several decks can't starve others.
+RENDER_WORKERS = 2
+MAX_RUNNING_PER_USER = 1
+MAX_PENDING_PER_USER = 3
+MAX_QUEUE_DEPTH = 20
+
+# Upper bound on a single job; interaction followups stay valid for 15 minutes.
+RENDER_JOB_TIMEOUT = 300
+FOLLOWUP_WINDOW_SEC = 15 * 60
+# Time kept back at the end of the window for uploading the result
+DELIVERY_MARGIN_SEC = 30
+# A job that can't get at least this long before its followup expires is skipped
+MIN_JOB_WINDOW_SEC = 60
+
+
+class RenderQueueFull(Exception):
+	"""Raised when a job is rejected for backpressure (queue or per-user limit)."""
+
+
+class RenderJob:
+	def __init__(self, user_id: int, label: str, interaction: nextcord.Interaction, work, timeout: float = RENDER_JOB_TIMEOUT):
+		self.user_id = user_id
+		self.label = label
+		self.interaction = interaction
+		# Coroutine function returning either an error string or (content, nextcord.File)
+		self.work = work
+		# The followup token's lifetime runs from the interaction, not from when a worker starts the job
+		age = max(0.0, (datetime.now(timezone.utc) - interaction.created_at).total_seconds())
+		self.expires_at = time.monotonic() + FOLLOWUP_WINDOW_SEC - DELIVERY_MARGIN_SEC - age
+		self.timeout = min(timeout, self.remaining())
+
+	def remaining(self) -> float:
+		"""Seconds left to finish the job and still deliver its result."""
+		return self.expires_at - time.monotonic()
+
+
+class RenderQueue:
+	def __init__(self, workers: int = RENDER_WORKERS, max_running_per_user: int = MAX_RUNNING_PER_USER,
+				 max_pending_per_user: int = MAX_PENDING_PER_USER, max_depth: int = MAX_QUEUE_DEPTH):
+		self.workers = workers
+		self.max_running_per_user = max_running_per_user
+		self.max_pending_per_user = max_pending_per_user
+		self.max_depth = max_depth
+
+		self._pending: dict[int, collections.deque] = {}   # user_id -> queued jobs
+		self._users = collections.deque()                  # round-robin order of users with queued jobs
+		self._running: dict[int, int] = {}                 # user_id -> jobs currently rendering
+		self._cond = None
+		self._worker_tasks = []
+
+		self.completed = 0
+		self.failed = 0
+
+	@property
+	def depth(self) -> int:
+		"""Number of jobs waiting for a worker."""
+		return sum(len(q) for q in self._pending.values())
+
+	@property
+	def running(self) -> int:
+		return sum(self._running.values())
+
+	def stats(self) -> dict:
+		return {
+			"queued": self.depth,
+			"running": self.running,
+			"workers": self.workers,
+			"users_waiting": len(self._pending),
+			"completed": self.completed,
+			"failed": self.failed,
+		}
+
+	async def submit(self, interaction: nextcord.Interaction, label: str, work, timeout: float = RENDER_JOB_TIMEOUT) -> int:
+		"""Queue a render job for the interaction's user.
+
+		`timeout` bounds the job once it starts (default RENDER_JOB_TIMEOUT), and is
+		capped so the result can still be delivered within the followup window.
+		Returns the job's position (1 = next to start). Raises RenderQueueFull when
+		the queue is at capacity or the user already has too many jobs waiting.
+		"""
+		self._ensure_workers()
+		user_id = interaction.user.id
+
+		async with self._cond:
+			if self.depth >= self.max_depth:
+				raise RenderQueueFull(f"The render queue is full ({self.max_depth} jobs waiting). Try again shortly.")
+			user_queue = self._pending.get(user_id)
+			if user_queue and len(user_queue) >= self.max_pending_per_user:
+				raise RenderQueueFull(f"You already have {len(user_queue)} renders waiting. Wait for one to finish.")
+
+			if user_queue is None:
+				user_queue = self._pending[user_id] = collections.deque()
+				self._users.append(user_id)
+			user_queue.append(RenderJob(user_id, label, interaction, work, timeout))
+			position = self.depth
+			self._cond.notify()
+
+		return position
+
+	def _ensure_workers(self):
+		if self._cond is None:
+			self._cond = asyncio.Condition()
+		self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+		while len(self._worker_tasks) < self.workers:
+			self._worker_tasks.append(asyncio.create_task(self._worker()))
+
+	def _next_job(self):
+		"""Pop the next job, round-robin over users under their running limit."""
+		for _ in range(len(self._users)):
+			user_id = self._users[0]
+			self._users.rotate(-1)
+			if self._running.get(user_id, 0) >= self.max_running_per_user:
+				continue
+			user_queue = self._pending[user_id]
+			job = user_queue.popleft()
+			if not user_queue:
+				del self._pending[user_id]
+				self._users.remove(user_id)
+			return job
+		return None
+
+	async def _worker(self):
+		while True:
+			async with self._cond:
+				job = self._next_job()
+				while job is None:
+					await self._cond.wait()
+					job = self._next_job()
+				self._running[job.user_id] = self._running.get(job.user_id, 0) + 1
+
+			try:
+				await self._run(job)
+			finally:
+				async with self._cond:
+					self._running[job.user_id] -= 1
+					if not self._running[job.user_id]:
+						del self._running[job.user_id]
+					self._cond.notify_all()
+
+	async def _run(self, job: RenderJob):
+		followup = job.interaction.followup
+		timeout = min(job.timeout, job.remaining())
+		if timeout < min(job.timeout, MIN_JOB_WINDOW_SEC):
+			self.failed += 1
+			await self._safe_send(followup, f"⏰ Render of {job.label} waited too long in the queue. Please run it again.")
+			return
+		try:
+			await followup.send(f"🎨 Rendering {job.label}...")
+			result = await asyncio.wait_for(job.work(), timeout=timeout)
+			if isinstance(result, str):
+				await followup.send(result)
+			else:
+				content, file = result
+				await followup.send(content, file=file)
+			self.completed += 1
+		except asyncio.TimeoutError:
+			self.failed += 1
+			await self._safe_send(followup, f"⏰ Render of {job.label} timed out.")
+		except Exception as e:
+			self.failed += 1
+			await self._safe_send(followup, f"❌ Render of {job.label} failed.\n```{e}```")
+
+	@staticmethod
+	async def _safe_send(followup, message: str):
+		try:
+			await followup.send(message)
+		except Exception as e:
+			print(f"Render queue: could not deliver result: {e}")
+
+
+render_queue = RenderQueue()
@@ -0,0 +1,78 @@
+import os
+import socket
+from abc import ABC, abstractmethod
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from supabase_client import supabase
+
+# Which claim store daily reports use: "supabase" (shared across instances,
+# sql/daily_update_claims.sql) or "sqlite" (a local file, for tests and
+# single-machine setups).
+CLAIM_STORE = os.getenv("DAILY_UPDATE_CLAIM_STORE", "supabase")
+CLAIMS_TABLE = "daily_update_claims"
+SQLITE_CLAIMS_PATH = os.path.join(os.path.dirname(__file__), "..", "daily_update_claims.sqlite3")
+
+# Recorded with each claim, to tell which instance sent a report
+INSTANCE_ID = os.getenv("BOT_INSTANCE_ID") or f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ClaimStore(ABC):
+    """Atomic (channel, day) claims: claim() returns True for exactly one caller."""
+
+    @abstractmethod
+    def claim(self, channel_id: str, report_date: str) -> bool:
+        ...
+
+
+class SupabaseClaimStore(ClaimStore):
+    """Claims as rows in a table keyed by (channel_id, report_date).
+
+    The insert ignores duplicates and returns only the rows it wrote, so an
+    empty result means another instance already holds the claim.
+    """
+
+    def __init__(self, table: str = CLAIMS_TABLE):
+        self.table = table
+
+    def claim(self, channel_id: str, report_date: str) -> bool:
+        response = (
+            supabase.table(self.table)
+            .upsert(
+                {"channel_id": channel_id, "report_date": report_date, "claimed_by": INSTANCE_ID},
+                ignore_duplicates=True,
+            )
+            .execute()
+        )
+        return bool(response.data)
+
+
+class SqliteClaimStore(ClaimStore):
+    """Local stand-in with the same semantics: INSERT OR IGNORE on a primary key."""
+
+    def __init__(self, path: str = SQLITE_CLAIMS_PATH):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {CLAIMS_TABLE} ("
+                " channel_id TEXT NOT NULL, report_date TEXT NOT NULL,"
+                " claimed_by TEXT NOT NULL, claimed_at TEXT NOT NULL,"
+                " PRIMARY KEY (channel_id, report_date))"
+            )
+
+    def claim(self, channel_id: str, report_date: str) -> bool:
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT OR IGNORE INTO {CLAIMS_TABLE} VALUES (?, ?, ?, ?)",
+                (channel_id, report_date, INSTANCE_ID, datetime.now(timezone.utc).isoformat()),
+            )
+        return cursor.rowcount == 1
+
+
+def make_claim_store(kind: str = CLAIM_STORE) -> ClaimStore:
+    if kind == "sqlite":
+        return SqliteClaimStore()
+    if kind == "supabase":
+        return SupabaseClaimStore()
+    raise ValueError(f"Unknown daily update claim store: {kind!r}")
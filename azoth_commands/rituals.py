@@ -3,7 +3,7 @@ import json
 import nextcord
 from nextcord.ext import commands
 from nextcord import SlashOption, Interaction
-from azoth_commands.helpers import safe_interaction, generate_and_upload_image, ritual_to_json, to_snake_case
+from azoth_commands.helpers import safe_interaction, run_blocking, generate_and_upload_image, ritual_to_json, to_snake_case
 from azoth_commands.autocomplete import autocomplete_from_table
 from constants import DEV_GUILD_ID, BOT_PLAYER_ID, ASSET_RENDER_PATHS, ASSET_BUCKET_NAMES, ASSET_DOWNLOAD_PATHS
 from supabase_helpers import fetch_all, update_record
@@ -72,7 +72,7 @@ def add_ritual_commands(cls):
 				return f"✅ Created `{challenge_name}`, but could not add to deck named `{deck}`:\n{result}."
 
 		for side_key in ["challenge", "reward"]:
-			upload_success, file_path = generate_and_upload_image(created_record, bucket, side_key)
+			upload_success, file_path = await run_blocking(generate_and_upload_image, created_record, bucket, side_key)
 			if not upload_success:
 				return f"✅ Created `{challenge_name}`, but failed to upload image:\n{file_path}"
 
@@ -82,13 +82,13 @@ def add_ritual_commands(cls):
 				created_record[f"{side_key}_image"] = file_path
 
 			# Download image for local rendering
-			download_success, image_local_path = download_image(file_path, bucket, download_dir)
+			download_success, image_local_path = await run_blocking(download_image, file_path, bucket, download_dir)
 			if not download_success:
 				return f"✅ Created `{challenge_name}`, but failed to retrieve image:\n{image_local_path}"
 
 		# Render and send
 		created_record["fate_type"] = MODEL_NAME
-		render_path = renderer.render_ritual(created_record, output_dir=render_dir)
+		render_path = await run_blocking(renderer.render_ritual, created_record, output_dir=render_dir)
 		await interaction.followup.send(
 			content=f"✅ Created `{challenge_name}` successfully!",
 			file=nextcord.File(render_path)
@@ -133,7 +133,7 @@ def add_ritual_commands(cls):
 		# Optional image regeneration
 		if regenerate_image:
 			for side_key in ["challenge", "reward"]:
-				upload_success, file_path = generate_and_upload_image(record, bucket, side_key)
+				upload_success, file_path = await run_blocking(generate_and_upload_image, record, bucket, side_key)
 				if not upload_success:
 					return f"✅ Updated `{name}`, but failed to upload image: `{file_path}`"
 				update_data[f"{side_key}_image"] = file_path
@@ -157,10 +157,10 @@ def add_ritual_commands(cls):
 
 		# Optional re-download + render
 		if regenerate_image:
-			download_success, local_path = download_image(file_path, bucket, download_dir)
+			download_success, local_path = await run_blocking(download_image, file_path, bucket, download_dir)
 			if download_success:
 				record["fate_type"] = MODEL_NAME
-				render_path = renderer.render_ritual(record, output_dir=render_dir)
+				render_path = await run_blocking(renderer.render_ritual, record, output_dir=render_dir)
 				await interaction.followup.send(
 					content=f"✅ Updated `{name}` and regenerated image!",
 					file=nextcord.File(render_path)
@@ -211,12 +211,12 @@ def add_ritual_commands(cls):
 
 		# Download the art from Supabase
 		for side_key in ["challenge", "reward"]:
-			image_success, image_result = download_image(record[f"{side_key}_image"], bucket, download_dir)
+			image_success, image_result = await run_blocking(download_image, record[f"{side_key}_image"], bucket, download_dir)
 			if not image_success:
 				return f"⚠️ Could not load image for `{name}`:\n{image_result}"
 
 		record["fate_type"] = MODEL_NAME
-		render_path = renderer.render_ritual(record)
+		render_path = await run_blocking(renderer.render_ritual, record)
 		await interaction.followup.send(file=nextcord.File(render_path))
 
 
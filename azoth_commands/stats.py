@@ -1,5 +1,5 @@
 import os
-import json
+import asyncio
 import nextcord
 import aiohttp
 import nextcord
@@ -8,7 +8,64 @@ from nextcord import SlashOption, Interaction
 from azoth_commands.helpers import safe_interaction, record_to_json
 from azoth_commands.autocomplete import autocomplete_from_table
 from constants import DEV_GUILD_ID
-from supabase_helpers import fetch_all
+from supabase_cache import stats_cache
+from azoth_commands.stats_pager import StatsPager
+from analytics_snapshot import LOCAL_QUERIES, get_snapshot
+from supabase_helpers import get_table_schemas
+
+# Leaderboard ranking: best combo first, then deepest run (ties broken by _stable_sort)
+LEADERBOARD_SORT = ["-highest_combo", "-level_reached"]
+
+
+async def _stable_sort(view: str, sort: list[str] = None) -> list[str] | None:
+    """
+    `sort` followed by every other orderable column of the view, so offset pages
+    are deterministic: without a full ORDER BY Postgres may return rows in any
+    order, and the views have no single unique key to break ties on. The views
+    are small aggregates, so the extra sort keys are cheap. Falls back to `sort`
+    if the view's columns can't be read.
+    """
+    schema = (await asyncio.to_thread(get_table_schemas)).get(view)
+    if schema is None:
+        return sort
+    named = {key.lstrip("-") for key in sort or ()}
+    return list(sort or ()) + [column for column in schema.orderable_columns() if column not in named]
+
+
+def _view_pages(view: str, filters: dict = None, sort: list[str] = None, max_rows: int = None):
+    """
+    fetch_page(offset, limit) for StatsPager over a (cached) view, optionally capped at max_rows.
+    Pages are kept for the pager's lifetime, so going back shows the same rows
+    even after the shared cache entry has expired.
+    """
+    pages: dict[tuple[int, int], list[dict]] = {}
+    full_sort, sort_resolved = sort, False
+
+    async def fetch_page(offset: int, limit: int) -> list[dict]:
+        nonlocal full_sort, sort_resolved
+        if max_rows is not None:
+            limit = min(limit, max_rows - offset)
+            if limit <= 0:
+                return []
+        if (offset, limit) not in pages:
+            if not sort_resolved:
+                full_sort, sort_resolved = await _stable_sort(view, sort), True
+            pages[(offset, limit)] = await stats_cache.fetch(
+                view, filters=filters, sort=full_sort, limit=limit, offset=offset,
+            )
+        return pages[(offset, limit)]
+    return fetch_page
+
+
+async def _send_view_pages(interaction: Interaction, title: str, empty_message: str, view: str, **kwargs):
+    """Render a view as paged PNGs with button navigation (see StatsPager)."""
+    preferred = kwargs.pop("preferred_columns", None)
+    chart_column = kwargs.pop("chart_column", None)
+    pager = StatsPager(
+        interaction.user.id, title, _view_pages(view, **kwargs),
+        preferred_columns=preferred, chart_column=chart_column,
+    )
+    return await pager.send(interaction, empty_message)
 
 
 def add_stats_commands(cls):
@@ -24,14 +81,12 @@ def add_stats_commands(cls):
     async def stats_active_players(
         self,
         interaction: Interaction,
-        limit: int = SlashOption(description="How many players to return", default=25)
+        limit: int = SlashOption(description="How many players to return", default=25, min_value=1, max_value=100)
     ):
-        records = fetch_all("player_activity_view", sort=["-game_count"])[:limit]
-
-        if not records:
-            return "❌ No active players found."
-
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+        return await _send_view_pages(
+            interaction, "Active Players", "❌ No active players found.",
+            "player_activity_view", sort=["-game_count"], max_rows=limit, chart_column="game_count",
+        )
 
     # --- Leaderboard ---
     @stats_cmd.subcommand(name="leaderboard", description="Show top combos")
@@ -39,7 +94,7 @@ def add_stats_commands(cls):
     async def stats_leaderboard(
         self,
         interaction: Interaction,
-        limit: int = SlashOption(description="How many results to return", default=10),
+        limit: int = SlashOption(description="How many results to return", default=10, min_value=1, max_value=100),
         player: str = SlashOption(description="Filter by player name", required=False, autocomplete=True),
         hero: str = SlashOption(description="Filter by starting hero", required=False, autocomplete=True),
         version: str = SlashOption(description="Filter by game version", required=False, autocomplete=True)
@@ -52,12 +107,11 @@ def add_stats_commands(cls):
         if hero:
             filters["hero"] = hero
 
-        records = fetch_all("leaderboard_view", filters=filters)[:limit]
-
-        if not records:
-            return "❌ No leaderboard data available."
-
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+        return await _send_view_pages(
+            interaction, "Leaderboard", "❌ No leaderboard data available.",
+            "leaderboard_view", filters=filters, sort=LEADERBOARD_SORT, max_rows=limit,
+            chart_column="highest_combo",
+        )
 
     # --- Player Info ---
     @stats_cmd.subcommand(name="player", description="Player statistics")
@@ -67,10 +121,18 @@ def add_stats_commands(cls):
         interaction: Interaction,
         player: str = SlashOption(description="Player name", required=True, autocomplete=True)
     ):
-        records = fetch_all("player_info_view", filters={"player": player})
+        records = await stats_cache.fetch("player_info_view", filters={"player": player})
         if not records:
             return f"❌ No stats found for `{player}`."
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+
+        # One player: show each stat as its own row
+        rows = [{"stat": k, "value": v} for record in records for k, v in record.items() if k not in ("id", "uuid")]
+
+        async def fetch_page(offset: int, limit: int) -> list[dict]:
+            return rows[offset:offset + limit]
+
+        pager = StatsPager(interaction.user.id, f"Player — {player}", fetch_page, preferred_columns=["stat", "value"])
+        return await pager.send(interaction, f"❌ No stats found for `{player}`.")
 
     # --- Hero Info ---
     @stats_cmd.subcommand(name="hero", description="Hero statistics")
@@ -79,10 +141,7 @@ def add_stats_commands(cls):
         self,
         interaction: Interaction,
     ):
-        records = fetch_all("hero_info_view")
-        if not records:
-            return "❌ No hero stats available."
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+        return await _send_view_pages(interaction, "Heroes", "❌ No hero stats available.", "hero_info_view")
 
     # --- Version Info ---
     @stats_cmd.subcommand(name="version", description="Version statistics")
@@ -91,19 +150,13 @@ def add_stats_commands(cls):
         self,
         interaction: Interaction
     ):
-        records = fetch_all("version_info_view")
-        if not records:
-            return "❌ No version stats available."
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+        return await _send_view_pages(interaction, "Versions", "❌ No version stats available.", "version_info_view")
 
     # --- Draft Deck Data ---
     @stats_cmd.subcommand(name="draft_deck", description="Draft deck composition data")
     @safe_interaction(timeout=10, error_message="❌ Failed to fetch draft deck data.")
     async def stats_draft_deck(self, interaction: Interaction):
-        records = fetch_all("draft_deck_view")
-        if not records:
-            return "❌ No draft deck data available."
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+        return await _send_view_pages(interaction, "Draft Decks", "❌ No draft deck data available.", "draft_deck_view")
 
     # --- Draft Rate Data ---
     @stats_cmd.subcommand(name="draft_rates", description="Global draft pick rates")
@@ -112,10 +165,46 @@ def add_stats_commands(cls):
         self,
         interaction: Interaction
     ):
-        records = fetch_all("draft_rates_view")
-        if not records:
-            return "❌ No draft rate data available."
-        return f"```json\n{json.dumps(records, indent=2)}\n```"
+        return await _send_view_pages(interaction, "Draft Pick Rates", "❌ No draft rate data available.", "draft_rates_view")
+
+    # --- Cache Info ---
+    @stats_cmd.subcommand(name="cache", description="Stats query cache counters")
+    @safe_interaction(timeout=10, error_message="❌ Failed to read cache stats.")
+    async def stats_cache_info(self, interaction: Interaction):
+        info = stats_cache.stats()
+        return (
+            f"🗃️ **Stats cache** — {info['entries']} cached results\n"
+            f"Hits: **{info['hits']}** · Coalesced: **{info['coalesced']}** · Misses: **{info['misses']}** "
+            f"({info['hit_rate']:.0%} served without a new query)"
+        )
+
+    # --- Local Snapshot ---
+    @stats_cmd.subcommand(name="snapshot_sync", description="Pull new analytics rows into the local snapshot")
+    @safe_interaction(timeout=600, error_message="❌ Snapshot sync failed.", require_authorized=True)
+    async def stats_snapshot_sync(self, interaction: Interaction):
+        written = await asyncio.to_thread(get_snapshot().sync_all)
+        status = {row["table_name"]: row for row in await asyncio.to_thread(get_snapshot().status)}
+        lines = [
+            f"`{table}`: +{count} rows ({status.get(table, {}).get('row_count', 0)} total)"
+            for table, count in written.items()
+        ]
+        return "🗄️ **Snapshot synced**\n" + "\n".join(lines)
+
+    @stats_cmd.subcommand(name="local", description="Run a canned query against the local analytics snapshot")
+    @safe_interaction(timeout=30, error_message="❌ Failed to query the local snapshot.")
+    async def stats_local(
+        self,
+        interaction: Interaction,
+        query: str = SlashOption(description="Query to run", choices={title: name for name, (title, _sql) in LOCAL_QUERIES.items()}),
+        version: str = SlashOption(description="Filter by game version", required=False, autocomplete=True)
+    ):
+        title = LOCAL_QUERIES[query][0] + (f" — v{version}" if version else "")
+
+        async def fetch_page(offset: int, limit: int) -> list[dict]:
+            return await asyncio.to_thread(get_snapshot().run_local_query, query, version, limit, offset)
+
+        pager = StatsPager(interaction.user.id, f"{title} (local)", fetch_page)
+        return await pager.send(interaction, "❌ No snapshot data. Run `/stats snapshot_sync` first.")
 
 
     @stats_leaderboard.on_autocomplete("player")
@@ -132,6 +221,7 @@ def add_stats_commands(cls):
 
 
     @stats_leaderboard.on_autocomplete("version")
+    @stats_local.on_autocomplete("version")
     async def autocomplete_version(self, interaction: Interaction, input: str):
         suggestions = autocomplete_from_table(table_name="game_stats", input=input, column="version")
         await interaction.response.send_autocomplete(suggestions[:25])
@@ -146,3 +236,6 @@ def add_stats_commands(cls):
     cls.stats_version = stats_version
     cls.stats_draft_deck = stats_draft_deck
     cls.stats_draft_rates = stats_draft_rates
+    cls.stats_cache_info = stats_cache_info
+    cls.stats_snapshot_sync = stats_snapshot_sync
+    cls.stats_local = stats_local
@@ -0,0 +1,102 @@
+import nextcord
+from nextcord import Interaction
+from azoth_commands.helpers import run_blocking
+from azoth_logic.stats_renderer import render_stats_page, pick_columns, pick_chart_columns
+
+# Rows per rendered page
+STATS_PAGE_SIZE = 10
+# Buttons stop responding after this long without a press
+PAGER_TIMEOUT_SEC = 300
+EMBED_COLOR = 0x7B2D8E
+
+
+class StatsPager(nextcord.ui.View):
+    """
+    Prev / next navigation over a stats query, one rendered PNG per page.
+
+    Pages are fetched only when shown: `fetch_page(offset, limit)` is asked for
+    one row more than a page, and that extra row tells whether a next page exists.
+    Only the user who ran the command can turn pages.
+    """
+
+    def __init__(self, author_id: int, title: str, fetch_page, preferred_columns: list[str] = None,
+                 chart_column: str = None, page_size: int = STATS_PAGE_SIZE):
+        super().__init__(timeout=PAGER_TIMEOUT_SEC)
+        self.author_id = author_id
+        self.title = title
+        self.fetch_page = fetch_page
+        self.preferred_columns = preferred_columns
+        self.chart_column = chart_column
+        self.page_size = page_size
+        self.page = 0
+        self.has_next = False
+        self.message = None
+
+    async def render(self) -> tuple[nextcord.Embed, nextcord.File | None]:
+        """Fetch and render the current page."""
+        offset = self.page * self.page_size
+        rows = await self.fetch_page(offset, self.page_size + 1)
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = not self.has_next
+
+        embed = nextcord.Embed(title=self.title, color=EMBED_COLOR)
+        if not rows:
+            embed.description = "No data on this page."
+            return embed, None
+
+        columns = pick_columns(rows, self.preferred_columns)
+        chart = pick_chart_columns(rows, columns, self.chart_column)
+        image = await run_blocking(
+            render_stats_page, self.title, rows, columns, chart, offset,
+        )
+        embed.set_image(url="attachment://stats.png")
+        embed.set_footer(text=f"Page {self.page + 1} · rows {offset + 1}–{offset + len(rows)}")
+        return embed, nextcord.File(image, filename="stats.png")
+
+    async def send(self, interaction: Interaction, empty_message: str = "❌ No data available.") -> str | None:
+        """Send the first page as a followup. Returns `empty_message` instead if there is nothing to show."""
+        embed, file = await self.render()
+        if file is None:
+            return empty_message
+        if not self.has_next:
+            self.stop()
+            self.message = await interaction.followup.send(embed=embed, file=file)
+        else:
+            self.message = await interaction.followup.send(embed=embed, file=file, view=self)
+        return None
+
+    async def interaction_check(self, interaction: Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("Only the person who ran this command can turn pages.", ephemeral=True)
+            return False
+        return True
+
+    async def _turn(self, interaction: Interaction, step: int):
+        await interaction.response.defer()
+        self.page = max(0, self.page + step)
+        embed, file = await self.render()
+        if file is None:
+            await interaction.message.edit(embed=embed, attachments=[], view=self)
+        else:
+            await interaction.message.edit(embed=embed, file=file, attachments=[], view=self)
+
+    @nextcord.ui.button(label="◀ Prev", style=nextcord.ButtonStyle.secondary, disabled=True)
+    async def prev_button(self, button: nextcord.ui.Button, interaction: Interaction):
+        await self._turn(interaction, -1)
+
+    @nextcord.ui.button(label="Next ▶", style=nextcord.ButtonStyle.secondary)
+    async def next_button(self, button: nextcord.ui.Button, interaction: Interaction):
+        await self._turn(interaction, 1)
+
+    async def on_timeout(self):
+        if self.message is None:
+            return
+        for child in self.children:
+            child.disabled = True
+        try:
+            await self.message.edit(view=self)
+        except nextcord.HTTPException:
+            pass
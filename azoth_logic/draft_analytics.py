@@ -0,0 +1,180 @@
+from array import array
+import numpy as np
+
+
+# Minimum offers before an item gets a pick rate, and before it can rank as least picked
+MIN_OFFERS_FOR_RATE = 2
+MIN_OFFERS_FOR_LEAST = 3
+# Minimum scored picks before an item gets a performance average
+MIN_GAMES_FOR_PERFORMANCE = 2
+
+
+class DraftItemColumns:
+    """
+    Columnar buffer of draft item partials: one entry per (item, offer count,
+    pick count, score sum, scored picks). A raw draft_items row is a partial
+    with offered=1; stored daily rollup rows are partials too, so raw scans and
+    multi-day windows go through the same group-by.
+
+    Columns are compact typed arrays (~40 bytes per entry), so millions of rows
+    fit in memory without keeping the row dicts around.
+    """
+
+    def __init__(self):
+        self.item_types = []          # type code -> item_type string
+        self._type_codes = {}         # item_type string -> type code
+        self._codes = array("b")
+        self._ids = array("q")
+        self._offered = array("q")
+        self._picked = array("q")
+        self._score_sum = array("d")
+        self._score_count = array("q")
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _code(self, item_type: str) -> int:
+        code = self._type_codes.get(item_type)
+        if code is None:
+            code = self._type_codes[item_type] = len(self.item_types)
+            self.item_types.append(item_type)
+        return code
+
+    def add(self, item_type: str, item_id: int, offered: int = 1, picked: int = 0,
+            score_sum: float = 0.0, score_count: int = 0):
+        self._codes.append(self._code(item_type))
+        self._ids.append(int(item_id))
+        self._offered.append(offered)
+        self._picked.append(picked)
+        self._score_sum.append(score_sum)
+        self._score_count.append(score_count)
+
+    def add_offer(self, item_type: str, item_id: int, picked: bool, score: float = None):
+        """One raw draft_items row; `score` is the pick's game score (None if unknown)."""
+        scored = bool(picked) and score is not None
+        self.add(item_type, item_id, 1, 1 if picked else 0, score if scored else 0.0, 1 if scored else 0)
+
+    def add_partials(self, rows):
+        """Rollup-shaped rows: item_type, item_id, offered, picked, score_sum, score_count."""
+        for row in rows:
+            self.add(
+                row["item_type"], row["item_id"], row["offered"], row["picked"],
+                row.get("score_sum") or 0.0, row.get("score_count") or 0,
+            )
+
+    def group(self) -> "ItemTotals":
+        """Sum every column per (item_type, item_id) with np.unique + np.bincount."""
+        ids = np.frombuffer(self._ids, dtype=np.int64)
+        if not len(ids):
+            empty = np.empty(0)
+            return ItemTotals([], np.empty(0, np.int8), np.empty(0, np.int64), empty, empty, empty, empty)
+
+        # Pack (type code, id) into one int64 so np.unique groups on a flat key
+        codes = np.frombuffer(self._codes, dtype=np.int8).astype(np.int64)
+        keys = (codes << 48) | ids
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        n = len(unique_keys)
+
+        def total(column, dtype):
+            return np.bincount(inverse, weights=np.frombuffer(column, dtype=dtype), minlength=n)
+
+        return ItemTotals(
+            list(self.item_types),
+            (unique_keys >> 48).astype(np.int8),
+            unique_keys & ((1 << 48) - 1),
+            total(self._offered, np.int64),
+            total(self._picked, np.int64),
+            total(self._score_sum, np.float64),
+            total(self._score_count, np.int64),
+        )
+
+
+class ItemTotals:
+    """Per-item totals (parallel arrays, one entry per distinct (item_type, item_id))."""
+
+    def __init__(self, item_types, codes, ids, offered, picked, score_sum, score_count):
+        self.item_types = item_types
+        self.codes = codes
+        self.ids = ids
+        self.offered = offered.astype(np.int64)
+        self.picked = picked.astype(np.int64)
+        self.score_sum = score_sum
+        self.score_count = score_count.astype(np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def key(self, i: int) -> tuple[str, int]:
+        return self.item_types[self.codes[i]], int(self.ids[i])
+
+    def keys(self) -> list[tuple[str, int]]:
+        return [self.key(i) for i in range(len(self))]
+
+    def to_partials(self) -> list[dict]:
+        """Rollup rows for these totals (see daily_item_rollups)."""
+        return [
+            {
+                "item_type": item_type, "item_id": item_id,
+                "offered": int(self.offered[i]), "picked": int(self.picked[i]),
+                "score_sum": float(self.score_sum[i]), "score_count": int(self.score_count[i]),
+            }
+            for i, (item_type, item_id) in enumerate(self.keys())
+        ]
+
+
+def _top_k(order_keys: tuple, mask: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the first k masked entries under np.lexsort(order_keys) (last key is primary)."""
+    candidates = np.flatnonzero(mask)
+    if not len(candidates):
+        return candidates
+    order = np.lexsort(tuple(key[candidates] for key in order_keys))
+    return candidates[order[:k]]
+
+
+def draft_report(totals: ItemTotals, total_drafts: int, labels: dict, known: set = None, top_k: int = 5) -> dict:
+    """
+    Draft section of an activity report from per-item totals.
+
+    Args:
+        totals: grouped item totals
+        total_drafts: drafts in the window
+        labels: (item_type, item_id) -> display label
+        known: keys that still resolve to an item; performance only ranks these
+               (defaults to every key in `labels`)
+        top_k: entries per ranking
+
+    Rankings are lists of (label, stats) pairs, as the report embeds expect.
+    """
+    if not total_drafts or not len(totals):
+        return {}
+
+    known = set(labels) if known is None else known
+    offered = totals.offered
+    picked = totals.picked
+    rate = np.divide(picked, offered, out=np.zeros(len(totals)), where=offered > 0)
+
+    def label(i):
+        key = totals.key(i)
+        return labels.get(key, f"{key[0]}#{key[1]}")
+
+    def rate_entry(i):
+        return label(i), {"picked": int(picked[i]), "offered": int(offered[i]), "rate": float(rate[i])}
+
+    # lexsort: last key is primary
+    most = _top_k((-offered, -rate), offered >= MIN_OFFERS_FOR_RATE, top_k)
+    least = _top_k((-offered, rate), offered >= MIN_OFFERS_FOR_LEAST, top_k)
+
+    games = totals.score_count
+    avg_score = np.divide(totals.score_sum, games, out=np.zeros(len(totals)), where=games > 0)
+    resolved = np.fromiter((key in known for key in totals.keys()), dtype=bool, count=len(totals))
+    top = _top_k((-avg_score,), (games >= MIN_GAMES_FOR_PERFORMANCE) & resolved, top_k)
+
+    return {
+        "total_drafts": total_drafts,
+        "total_picks": int(picked.sum()),
+        "most_picked": [rate_entry(i) for i in most],
+        "least_picked": [rate_entry(i) for i in least],
+        "top_performers": [
+            (label(i), {"avg_score": float(avg_score[i]), "games": int(games[i])}) for i in top
+        ],
+    }
@@ -4,9 +4,10 @@ from azoth_logic.eigenfunction_generator import RandomEigenfunctionGenerator
 # Cache the generator (don't reinitialize every time)
 generator = RandomEigenfunctionGenerator(eigenfunctions_dir="eigenfunctions")
 
-def generate_image(card_data: dict, is_dark: bool = False) -> tuple[bool, str | bytes]:
+def generate_image(card_data: dict, is_dark: bool = False, output_path: str = None) -> tuple[bool, str | bytes]:
 	"""
 	Generates a PNG image for the card's element.
+	Pass output_path when generating in parallel: default names only differ by the second.
 	Returns (success, image_path or error message).
 	"""
 	element = card_data.get("element")
@@ -17,7 +18,7 @@ def generate_image(card_data: dict, is_dark: bool = False) -> tuple[bool, str |
 	# if element == "all":
 	# 	element = "dark"
 	try:
-		params, image_path = generator.generate_random_image(element)
+		params, image_path = generator.generate_random_image(element, output_path)
 		return True, image_path
 	except Exception as e:
 		return False, f"❌ Failed to generate image: {e}"
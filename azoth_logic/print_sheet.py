@@ -0,0 +1,150 @@
+import math
+from PIL import Image, ImageDraw
+
+
+MM_PER_INCH = 25.4
+PAGE_SIZES_MM = {
+    "letter": (215.9, 279.4),
+    "a4": (210.0, 297.0),
+}
+# Smallest margin left around the grid; crop marks are drawn in the margins
+PAGE_MARGIN_MM = 5
+# Bleed kept around each card on sheets. At 0 cards butt together and share cut
+# lines, so a 3 x 3 grid of poker cards fits on both Letter and A4.
+SHEET_BLEED_MM = 0
+CROP_MARK_MM = 4
+CROP_MARK_GAP_MM = 1
+CROP_MARK_WIDTH_PX = 2
+JPEG_QUALITY = 90
+# Finished size of a card (standard poker size); the rest of a render's canvas is bleed
+CARD_TRIM_MM = (63.5, 88.9)
+
+
+class PrintSheetWriter:
+    """
+    Writes card renders into a multi-page PDF, one page at a time.
+
+    Layouts:
+        "cards": one card per page at its physical size, full bleed included (for print services)
+        "sheets": cards tiled at trim size on `page_size` paper, with crop marks in the margins.
+                  Landscape cards are turned to portrait so every card shares one grid cell.
+
+    Only the images on the current page are held in memory; each finished page is
+    appended to the PDF on disk. Call close() to write the last page.
+    """
+
+    def __init__(self, output_path: str, layout: str = "sheets", page_size: str = "letter", ppi: int = 300):
+        if layout not in ("cards", "sheets"):
+            raise ValueError(f"Unknown layout: {layout}")
+        self.output_path = output_path
+        self.layout = layout
+        self.page_mm = PAGE_SIZES_MM[page_size]
+        self.ppi = ppi
+        self.pages = 0
+        self.cards = 0
+        self._page_cards: list[Image.Image] = []
+        self._grid = None  # sheets: (cell_w_mm, cell_h_mm, trim_w_mm, trim_h_mm, cols, rows), set by the first card
+
+    def _px(self, mm: float) -> int:
+        return round(mm / MM_PER_INCH * self.ppi)
+
+    @property
+    def cards_per_page(self) -> int:
+        if self.layout == "cards":
+            return 1
+        if self._grid is None:
+            return 0
+        return self._grid[4] * self._grid[5]
+
+    def _save_page(self, page: Image.Image):
+        page.save(self.output_path, "PDF", resolution=self.ppi, append=self.pages > 0, quality=JPEG_QUALITY)
+        self.pages += 1
+
+    def _plan_grid(self, trim_w_mm: float, trim_h_mm: float):
+        cell_w, cell_h = trim_w_mm + 2 * SHEET_BLEED_MM, trim_h_mm + 2 * SHEET_BLEED_MM
+        usable_w = self.page_mm[0] - 2 * PAGE_MARGIN_MM
+        usable_h = self.page_mm[1] - 2 * PAGE_MARGIN_MM
+        cols, rows = math.floor(usable_w / cell_w), math.floor(usable_h / cell_h)
+        if not cols or not rows:
+            raise ValueError("Cards are too large for this page size.")
+        self._grid = (cell_w, cell_h, trim_w_mm, trim_h_mm, cols, rows)
+
+    def add_card(self, image_path: str, source_ppi: float, bleed_px: int = None):
+        """
+        Add one rendered card.
+
+        Args:
+            image_path: render on disk (animated renders use their first frame)
+            source_ppi: resolution the render was made at
+            bleed_px: bleed on each side of the render, in its own pixels
+                      (default: whatever surrounds a CARD_TRIM_MM card)
+        """
+        with Image.open(image_path) as source:
+            image = source.convert("RGB")
+        if bleed_px is None:
+            bleed_px = max(0, round((min(image.size) - CARD_TRIM_MM[0] / MM_PER_INCH * source_ppi) / 2))
+
+        if self.layout == "cards":
+            scale = self.ppi / source_ppi
+            page = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+            image.close()
+            self._save_page(page)
+            page.close()
+            self.cards += 1
+            return
+
+        if image.width > image.height:
+            image = image.transpose(Image.ROTATE_90)
+        # Trim the render's bleed down to the bleed kept on sheets
+        keep = max(0, bleed_px - round(SHEET_BLEED_MM / MM_PER_INCH * source_ppi))
+        image = image.crop((keep, keep, image.width - keep, image.height - keep))
+        if self._grid is None:
+            trim_px = (image.width - 2 * (bleed_px - keep), image.height - 2 * (bleed_px - keep))
+            self._plan_grid(*(px / source_ppi * MM_PER_INCH for px in trim_px))
+
+        cell_w, cell_h = self._grid[:2]
+        self._page_cards.append(image.resize((self._px(cell_w), self._px(cell_h)), Image.LANCZOS))
+        image.close()
+        self.cards += 1
+        if len(self._page_cards) >= self.cards_per_page:
+            self._flush_sheet()
+
+    def _flush_sheet(self):
+        if not self._page_cards:
+            return
+        cell_w, cell_h, trim_w, trim_h, cols, rows = self._grid
+        page = Image.new("RGB", (self._px(self.page_mm[0]), self._px(self.page_mm[1])), "white")
+
+        # Centre the grid on the page
+        origin_x = (self.page_mm[0] - cols * cell_w) / 2
+        origin_y = (self.page_mm[1] - rows * cell_h) / 2
+        for i, card in enumerate(self._page_cards):
+            row, col = divmod(i, cols)
+            page.paste(card, (self._px(origin_x + col * cell_w), self._px(origin_y + row * cell_h)))
+            card.close()
+        self._page_cards = []
+
+        # Crop marks: a short line in the margin in line with every trim edge
+        draw = ImageDraw.Draw(page)
+        top, bottom = origin_y, origin_y + rows * cell_h
+        left, right = origin_x, origin_x + cols * cell_w
+        near = CROP_MARK_GAP_MM
+        far_x = near + min(CROP_MARK_MM, origin_x - near)
+        far_y = near + min(CROP_MARK_MM, origin_y - near)
+        xs = {round(left + col * cell_w + SHEET_BLEED_MM + offset, 3) for col in range(cols) for offset in (0, trim_w)}
+        ys = {round(top + row * cell_h + SHEET_BLEED_MM + offset, 3) for row in range(rows) for offset in (0, trim_h)}
+        for x in map(self._px, xs):
+            draw.line([(x, self._px(top - far_y)), (x, self._px(top - near))], fill="black", width=CROP_MARK_WIDTH_PX)
+            draw.line([(x, self._px(bottom + near)), (x, self._px(bottom + far_y))], fill="black", width=CROP_MARK_WIDTH_PX)
+        for y in map(self._px, ys):
+            draw.line([(self._px(left - far_x), y), (self._px(left - near), y)], fill="black", width=CROP_MARK_WIDTH_PX)
+            draw.line([(self._px(right + near), y), (self._px(right + far_x), y)], fill="black", width=CROP_MARK_WIDTH_PX)
+
+        self._save_page(page)
+        page.close()
+
+    def close(self) -> int:
+        """Write the last (partial) sheet. Returns the number of pages written."""
+        if self.layout == "sheets":
+            self._flush_sheet()
+        return self.pages
@@ -0,0 +1,120 @@
+import io
+from numbers import Number
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+# Palette shared with the report embeds (0x7B2D8E)
+ACCENT = "#7B2D8E"
+BACKGROUND = "#1E1F22"
+HEADER_BG = "#2B2D31"
+ROW_BG = ("#313338", "#2B2D31")
+TEXT = "#DBDEE1"
+
+DPI = 110
+FIG_WIDTH_IN = 8.5
+ROW_HEIGHT_IN = 0.32
+CHART_HEIGHT_IN = 2.6
+MAX_COLUMNS = 6
+MAX_CELL_CHARS = 24
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+def _format_cell(value) -> str:
+    if value is None:
+        return "—"
+    if isinstance(value, float):
+        text = f"{value:,.2f}".rstrip("0").rstrip(".")
+    elif _is_number(value):
+        text = f"{value:,}"
+    else:
+        text = str(value)
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+
+def pick_columns(records: list[dict], preferred: list[str] = None) -> list[str]:
+    """Columns to show: `preferred` ones that exist, then the rest in record order, up to MAX_COLUMNS."""
+    available = list(records[0].keys()) if records else []
+    ordered = [c for c in (preferred or []) if c in available]
+    ordered += [c for c in available if c not in ordered and c not in ("id", "uuid")]
+    return ordered[:MAX_COLUMNS]
+
+
+def pick_chart_columns(records: list[dict], columns: list[str], value_column: str = None) -> tuple[str, str] | None:
+    """(label column, numeric value column) for the bar chart, or None if the page has no numbers."""
+    if not records:
+        return None
+    numeric = [c for c in columns if all(_is_number(r.get(c)) or r.get(c) is None for r in records)
+               and any(_is_number(r.get(c)) for r in records)]
+    if value_column not in numeric:
+        value_column = numeric[0] if numeric else None
+    labels = [c for c in columns if c not in numeric]
+    if not value_column or not labels:
+        return None
+    return labels[0], value_column
+
+
+def render_stats_page(title: str, records: list[dict], columns: list[str],
+                      chart: tuple[str, str] = None, row_offset: int = 0) -> io.BytesIO:
+    """
+    Render one page of stats as a PNG: an optional horizontal bar chart over a table.
+
+    Args:
+        title: heading drawn above the page
+        records: rows on this page
+        columns: columns to tabulate (see pick_columns)
+        chart: (label column, value column) to chart, or None for table only
+        row_offset: rank of the first row, for the "#" column
+
+    Returns:
+        BytesIO with PNG data, positioned at 0
+    """
+    has_chart = bool(chart and records)
+    table_height = ROW_HEIGHT_IN * (len(records) + 1) + 0.2
+    height = 0.5 + table_height + (CHART_HEIGHT_IN if has_chart else 0)
+
+    fig = Figure(figsize=(FIG_WIDTH_IN, height), dpi=DPI, facecolor=BACKGROUND)
+    FigureCanvasAgg(fig)
+    fig.suptitle(title, color=TEXT, fontsize=13, fontweight="bold", x=0.02, ha="left", y=1 - 0.18 / height)
+
+    top = 1 - 0.5 / height
+    if has_chart:
+        label_column, value_column = chart
+        chart_bottom = top - CHART_HEIGHT_IN / height
+        ax = fig.add_axes([0.28, chart_bottom + 0.25 / height, 0.68, (CHART_HEIGHT_IN - 0.35) / height])
+        labels = [_format_cell(r.get(label_column)) for r in records][::-1]
+        values = [r.get(value_column) or 0 for r in records][::-1]
+        ax.barh(range(len(values)), values, color=ACCENT)
+        ax.set_yticks(range(len(values)))
+        ax.set_yticklabels(labels, fontsize=8, color=TEXT)
+        ax.tick_params(axis="x", colors=TEXT, labelsize=8)
+        ax.set_facecolor(BACKGROUND)
+        ax.set_title(value_column.replace("_", " "), color=TEXT, fontsize=9, loc="left")
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        top = chart_bottom
+
+    ax = fig.add_axes([0.02, 0.1 / height, 0.96, top - 0.1 / height])
+    ax.axis("off")
+    if records:
+        header = ["#"] + [c.replace("_", " ") for c in columns]
+        cells = [[str(row_offset + i + 1)] + [_format_cell(r.get(c)) for c in columns] for i, r in enumerate(records)]
+        table = ax.table(cellText=cells, colLabels=header, loc="upper center", cellLoc="left")
+        table.auto_set_font_size(False)
+        table.set_fontsize(8.5)
+        table.scale(1, 1.25)
+        for (row, _col), cell in table.get_celld().items():
+            cell.set_edgecolor(BACKGROUND)
+            cell.set_text_props(color=TEXT, fontweight="bold" if row == 0 else "normal")
+            cell.set_facecolor(HEADER_BG if row == 0 else ROW_BG[row % 2])
+        table.auto_set_column_width(list(range(len(header))))
+    else:
+        ax.text(0.5, 0.5, "No data", color=TEXT, ha="center", va="center", fontsize=11)
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", facecolor=BACKGROUND)
+    buffer.seek(0)
+    return buffer
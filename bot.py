@@ -4,12 +4,22 @@ from dotenv import load_dotenv
 import os
 
 from azoth_commands import *
+from http_session import close_http_session
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 
+
+class AzothBot(commands.Bot):
+	async def close(self):
+		# Awaited on shutdown (unlike cog_unload), so the shared aiohttp session
+		# and Supabase pools are closed before the loop stops
+		await close_http_session()
+		await super().close()
+
+
 intents = nextcord.Intents.default()
-bot = commands.Bot(intents=intents)
+bot = AzothBot(intents=intents)
 # bot = commands.Bot(command_prefix="!", intents=intents)
 
 @bot.event
@@ -0,0 +1,294 @@
+# azothbot/bulk_ingest.py
+import asyncio
+import codecs
+import json
+from supabase_bulk import BulkResult
+from supabase_helpers import get_table_schemas
+
+# Rows handed to the database writer at a time (one bulk_insert / bulk_update call)
+INGEST_BATCH_ROWS = 500
+# Parsed batches allowed to wait per table; bounds memory when the database is slower than the download
+WRITE_QUEUE_BATCHES = 4
+# Batches written at once across all tables (each is one or a few PostgREST requests)
+BULK_WRITE_CONCURRENCY = 4
+
+# Largest single value (row) held while waiting for the rest of it to arrive
+MAX_PENDING_VALUE_CHARS = 4 * 1024 * 1024
+
+_WS = " \t\r\n"
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789.eE+-"
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+
+def _may_be_truncated(error: json.JSONDecodeError, text: str) -> bool:
+	"""Whether a decode error could just be the value running past the end of `text`."""
+	tail = text[error.pos:]
+	if not tail.strip(_WS) or error.msg.startswith("Unterminated string"):
+		return True
+	if error.msg.startswith("Invalid \\uXXXX escape"):
+		return len(tail) < 6
+	# A literal or number cut short ("tr", "-", "1e")
+	return any(literal.startswith(tail) for literal in _LITERALS) or not tail.strip(_NUMBER_CHARS)
+
+
+class PayloadParser:
+	"""
+	Incremental parser for bulk payloads of the form {"table": [row, ...], ...}.
+
+	Text is fed in arbitrary pieces; each complete row is returned as soon as its
+	closing brace arrives, so only the current row (plus unread input) is held.
+	Events are ("row", table, value) for each array element and
+	("skip", table, message) for a table whose value is not a list.
+	Syntax errors raise json.JSONDecodeError as soon as the text read so far
+	can't be the start of a valid value, not only at the end of the input.
+	"""
+
+	def __init__(self):
+		self._decoder = json.JSONDecoder()
+		self._buf = ""
+		self._pos = 0
+		self._state = "start"
+		self._table = None
+
+	def _skip_ws(self) -> bool:
+		"""Advance past whitespace; False if the buffer ran out."""
+		while self._pos < len(self._buf) and self._buf[self._pos] in _WS:
+			self._pos += 1
+		return self._pos < len(self._buf)
+
+	def _expect(self, chars: str) -> str:
+		char = self._buf[self._pos]
+		if char not in chars:
+			expected = " or ".join(repr(c) for c in chars)
+			raise json.JSONDecodeError(f"Expected {expected}", self._buf, self._pos)
+		self._pos += 1
+		return char
+
+	def _decode(self, final: bool):
+		"""Decode one JSON value at the cursor, or return (False, None) if it may still be incomplete."""
+		try:
+			value, end = self._decoder.raw_decode(self._buf, self._pos)
+		except json.JSONDecodeError as e:
+			if final or not _may_be_truncated(e, self._buf):
+				raise
+			if len(self._buf) - self._pos > MAX_PENDING_VALUE_CHARS:
+				raise json.JSONDecodeError(
+					f"Value longer than {MAX_PENDING_VALUE_CHARS} characters", self._buf, self._pos,
+				) from e
+			return False, None
+		# A number is only complete once something that can't continue it follows ("2." may be "2.5")
+		if not final and self._buf[self._pos] in _NUMBER_START and not self._buf[end:].strip(_NUMBER_CHARS):
+			return False, None
+		self._pos = end
+		return True, value
+
+	def feed(self, text: str, final: bool = False) -> list[tuple]:
+		"""Parse as much of the input as possible. Pass final=True with the last piece."""
+		self._buf = self._buf[self._pos:] + text
+		self._pos = 0
+		events = []
+		while self._skip_ws():
+			state = self._state
+			if state == "start":
+				self._expect("{")
+				self._state = "key_or_end"
+			elif state in ("key_or_end", "key"):
+				if state == "key_or_end" and self._buf[self._pos] == "}":
+					self._pos += 1
+					self._state = "done"
+					continue
+				if self._buf[self._pos] != '"':
+					raise json.JSONDecodeError("Expected table name", self._buf, self._pos)
+				ok, self._table = self._decode(final)
+				if not ok:
+					break
+				self._state = "colon"
+			elif state == "colon":
+				self._expect(":")
+				self._state = "value"
+			elif state == "value":
+				if self._buf[self._pos] == "[":
+					self._pos += 1
+					self._state = "element_or_end"
+					continue
+				ok, _value = self._decode(final)
+				if not ok:
+					break
+				events.append(("skip", self._table, "value is not a list"))
+				self._state = "after_value"
+			elif state in ("element_or_end", "element"):
+				if state == "element_or_end" and self._buf[self._pos] == "]":
+					self._pos += 1
+					self._state = "after_value"
+					continue
+				ok, value = self._decode(final)
+				if not ok:
+					break
+				events.append(("row", self._table, value))
+				self._state = "after_element"
+			elif state == "after_element":
+				self._state = "element" if self._expect(",]") == "," else "after_value"
+			elif state == "after_value":
+				self._state = "key" if self._expect(",}") == "," else "done"
+			else:
+				raise json.JSONDecodeError("Extra data", self._buf, self._pos)
+
+		if final and self._state != "done":
+			raise json.JSONDecodeError("Unexpected end of file", self._buf, len(self._buf))
+		return events
+
+
+class NdjsonParser:
+	"""
+	Incremental parser for newline-delimited payloads: one row object per line,
+	naming its table in a `_table` key. A malformed line only loses that line.
+	"""
+
+	def __init__(self):
+		self._buf = ""
+		self._line = 0
+
+	def _parse_line(self, line: str) -> tuple | None:
+		self._line += 1
+		if not line.strip():
+			return None
+		try:
+			row = json.loads(line)
+		except json.JSONDecodeError as e:
+			return ("error", None, f"line {self._line}: invalid JSON ({e.msg})")
+		if not isinstance(row, dict) or not isinstance(row.get("_table"), str):
+			return ("error", None, f"line {self._line}: expected an object with a `_table` name")
+		return ("row", row.pop("_table"), row)
+
+	def feed(self, text: str, final: bool = False) -> list[tuple]:
+		self._buf += text
+		*lines, self._buf = self._buf.split("\n")
+		if final:
+			lines.append(self._buf)
+			self._buf = ""
+		return [event for event in map(self._parse_line, lines) if event]
+
+
+async def iter_payload_events(chunks, ndjson: bool = False):
+	"""Parse an async iterator of bytes (e.g. an HTTP body) into payload events as it arrives."""
+	parser = NdjsonParser() if ndjson else PayloadParser()
+	decoder = codecs.getincrementaldecoder("utf-8-sig")()
+	async for chunk in chunks:
+		for event in parser.feed(decoder.decode(chunk)):
+			yield event
+	for event in parser.feed(decoder.decode(b"", final=True), final=True):
+		yield event
+
+
+# ---------------------------------------------------------------------------
+# Ingestion
+# ---------------------------------------------------------------------------
+
+async def ingest(chunks, write, mode: str, ndjson: bool = False, batch_rows: int = INGEST_BATCH_ROWS,
+		write_concurrency: int = BULK_WRITE_CONCURRENCY, on_progress=None) -> tuple[dict[str, BulkResult], list[str]]:
+	"""
+	Stream a bulk payload into the database.
+	- chunks: async iterator of raw bytes
+	- write: blocking write(table, rows, labels) -> BulkResult (bulk_insert_table or bulk_update_table)
+	- mode: "insert" or "update", for validation
+	- write_concurrency: batches being written at once, across all tables
+	- on_progress: optional async callback(progress) after each batch, where progress
+	  maps table -> (rows done, rows read so far)
+	Rows are validated as they are parsed and sent in batches of batch_rows to a
+	writer task per table, so independent tables are written concurrently while
+	parsing continues. Within a table, batches are written one at a time in file
+	order (later rows may depend on earlier ones, e.g. a rename). Returns per-table
+	results and file-level errors. If the file turns out to be malformed, rows
+	parsed before the error are still written.
+	"""
+	schemas = await asyncio.to_thread(get_table_schemas)
+	results: dict[str, BulkResult] = {}
+	errors: list[str] = []
+	pending: dict[str, tuple[list, list]] = {}  # table -> (rows, labels) not yet sent
+	counts: dict[str, int] = {}                 # table -> rows read, for index labels
+	done: dict[str, int] = {}                   # table -> rows written or rejected
+	writers: dict[str, tuple[asyncio.Queue, asyncio.Task]] = {}
+	semaphore = asyncio.Semaphore(write_concurrency)
+
+	def progress() -> dict[str, tuple[int, int]]:
+		return {table: (done[table], counts[table]) for table in counts}
+
+	async def writer(table: str, queue: asyncio.Queue):
+		while True:
+			item = await queue.get()
+			if item is None:
+				return
+			rows, labels = item
+			async with semaphore:
+				result = await asyncio.to_thread(write, table, rows, labels)
+			results[table].merge(result)
+			done[table] += len(rows)
+			if on_progress:
+				await on_progress(progress())
+
+	async def submit(table: str, item):
+		if table not in writers:
+			queue = asyncio.Queue(maxsize=WRITE_QUEUE_BATCHES)
+			writers[table] = queue, asyncio.create_task(writer(table, queue))
+		queue, task = writers[table]
+		put = asyncio.ensure_future(queue.put(item))
+		await asyncio.wait({put, task}, return_when=asyncio.FIRST_COMPLETED)
+		if not put.done():
+			put.cancel()
+			task.result()  # the writer failed: raise its error
+
+	async def flush(table: str):
+		rows, labels = pending[table]
+		if rows:
+			pending[table] = ([], [])
+			await submit(table, (rows, labels))
+
+	try:
+		try:
+			async for kind, table, value in iter_payload_events(chunks, ndjson):
+				if kind == "error":
+					errors.append(f"⚠️ {value}; skipped.")
+					continue
+				if kind == "skip":
+					errors.append(f"⚠️ Skipped `{table}` ({value}).")
+					continue
+
+				result = results.get(table)
+				if result is None:
+					result = results[table] = BulkResult(table)
+					pending[table], counts[table], done[table] = ([], []), 0, 0
+					if schemas and table not in schemas:
+						result.error("*", "no such table; its rows are skipped.")
+				index = counts[table]
+				counts[table] += 1
+				if schemas and table not in schemas:
+					done[table] += 1
+					continue
+
+				label = (value.get("name") if isinstance(value, dict) else None) or f"index {index}"
+				problems = schemas[table].problems(value, mode) if schemas and isinstance(value, dict) else []
+				if problems:
+					result.error(label, "; ".join(problems))
+					done[table] += 1
+					continue
+
+				rows, labels = pending[table]
+				rows.append(value)
+				labels.append(label)
+				if len(rows) >= batch_rows:
+					await flush(table)
+		except json.JSONDecodeError as e:
+			errors.append(f"❌ Stopped reading the file: {e.msg} (rows before this point were still applied).")
+
+		for table in list(pending):
+			await flush(table)
+		for table in list(writers):
+			await submit(table, None)
+		await asyncio.gather(*(task for _queue, task in writers.values()))
+	finally:
+		for _queue, task in writers.values():
+			if not task.done():
+				task.cancel()
+
+	return results, errors
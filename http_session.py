@@ -0,0 +1,34 @@
+import aiohttp
+from supabase_client import close_supabase_sessions
+
+# Shared keep-alive pool for outbound HTTP (attachment downloads, Supabase REST
+# and storage calls made with aiohttp). Sized for our burstiest commands: bulk
+# imports and deck renders keep at most ~16 requests in flight per host.
+HTTP_POOL_SIZE = 32
+HTTP_POOL_PER_HOST = 16
+HTTP_KEEPALIVE_SEC = 60
+
+_session: aiohttp.ClientSession | None = None
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+	"""Return the bot-wide aiohttp session, opening it on first use."""
+	global _session
+	if _session is None or _session.closed:
+		connector = aiohttp.TCPConnector(
+			limit=HTTP_POOL_SIZE,
+			limit_per_host=HTTP_POOL_PER_HOST,
+			keepalive_timeout=HTTP_KEEPALIVE_SEC,
+			ttl_dns_cache=300,
+		)
+		_session = aiohttp.ClientSession(connector=connector)
+	return _session
+
+
+async def close_http_session():
+	"""Close the shared aiohttp session and the Supabase connection pools."""
+	global _session
+	if _session is not None and not _session.closed:
+		await _session.close()
+	_session = None
+	close_supabase_sessions()
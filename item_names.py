@@ -0,0 +1,157 @@
+# azothbot/item_names.py
+import asyncio
+import threading
+import time
+from supabase_client import supabase
+from supabase_helpers import DECK_CONTENT_TYPES, iter_all, name_column_for, make_item_label
+
+# Content names rarely change, and every write made through supabase_helpers
+# updates the cache directly; the periodic reload only picks up edits made
+# outside the bot (dashboard, game client).
+NAME_REFRESH_SEC = 30 * 60
+# After a failed load, wait this long before trying another full scan
+WARM_RETRY_SEC = 60
+# Ids per `in_` lookup for names not in the cache; keeps the URL and the
+# response under PostgREST's limits even when nothing was warmed
+RESOLVE_CHUNK_SIZE = 200
+
+
+class ItemNameCache:
+	"""
+	Shared (content_type, id) -> display name map for deck content tables.
+	Warmed with one paged scan per table, kept current by record writes, and
+	topped up with one batched `in_` lookup per table for ids it hasn't seen.
+	"""
+
+	def __init__(self, content_types: list[str] = None):
+		self.content_types = list(content_types or DECK_CONTENT_TYPES)
+		self._names: dict[tuple[str, int], str] = {}
+		self._lock = threading.Lock()
+		self._warmed_at = 0.0
+		self._warm_started_at = None
+		self._warm_task: asyncio.Task | None = None
+
+	def __len__(self):
+		return len(self._names)
+
+	@property
+	def stale(self) -> bool:
+		return time.monotonic() - self._warmed_at > NAME_REFRESH_SEC
+
+	def warm(self):
+		"""(Re)load every name from the content tables. Blocking; see warm_async."""
+		names = {}
+		for content_type in self.content_types:
+			name_column = name_column_for(content_type)
+			for row in iter_all(f"{content_type}s", columns=["id", name_column], key="id"):
+				if row.get(name_column):
+					names[(content_type, row["id"])] = row[name_column]
+		with self._lock:
+			self._names = names
+			self._warmed_at = time.monotonic()
+
+	async def warm_async(self):
+		"""Reload in the background. Single-flight: joins a load already running."""
+		if self._warm_task is None or self._warm_task.done():
+			self._warm_started_at = time.monotonic()
+			self._warm_task = asyncio.create_task(self._warm_in_thread())
+		await asyncio.shield(self._warm_task)
+
+	async def _warm_in_thread(self):
+		try:
+			await asyncio.to_thread(self.warm)
+			print(f"Item names: cached {len(self)} names")
+		except Exception as e:
+			print(f"Item names: warm failed, names will load on demand: {e}")
+
+	def refresh_in_background(self):
+		"""
+		Start a reload if the names are stale, without waiting for it. A no-op while
+		one is running, shortly after a failed one, or off the event loop.
+		"""
+		if not self.stale or (self._warm_task and not self._warm_task.done()):
+			return
+		if self._warm_started_at is not None and time.monotonic() - self._warm_started_at < WARM_RETRY_SEC:
+			return
+		try:
+			asyncio.get_running_loop()
+		except RuntimeError:
+			return
+		self._warm_started_at = time.monotonic()
+		self._warm_task = asyncio.create_task(self._warm_in_thread())
+
+	def set(self, content_type: str, item_id, name: str):
+		if content_type in self.content_types and name:
+			with self._lock:
+				self._names[(content_type, int(item_id))] = name
+
+	def forget(self, content_type: str, item_id):
+		with self._lock:
+			self._names.pop((content_type, int(item_id)), None)
+
+	def get(self, content_type: str, item_id) -> str | None:
+		return self._names.get((content_type, int(item_id)))
+
+	def label(self, content_type: str, item_id) -> str:
+		"""Autocomplete-style label, e.g. 'Diversity (Card #447)'."""
+		name = self.get(content_type, item_id) or f"Unknown {content_type}"
+		return make_item_label(name, content_type, item_id)
+
+	def resolve(self, keys) -> dict[tuple[str, int], str]:
+		"""
+		Names for (content_type, id) keys. Missing ids are fetched with `in_` queries
+		of RESOLVE_CHUNK_SIZE ids per content type and cached; ids that no longer
+		exist are left out.
+		"""
+		keys = {(content_type, int(item_id)) for content_type, item_id in keys}
+		missing = {}
+		for key in keys:
+			if key not in self._names:
+				missing.setdefault(key[0], []).append(key[1])
+
+		for content_type, ids in missing.items():
+			name_column = name_column_for(content_type)
+			for start in range(0, len(ids), RESOLVE_CHUNK_SIZE):
+				chunk = ids[start:start + RESOLVE_CHUNK_SIZE]
+				response = supabase.table(f"{content_type}s").select(f"id, {name_column}").in_("id", chunk).execute()
+				for row in response.data or []:
+					self.set(content_type, row["id"], row.get(name_column))
+
+		return {key: self._names[key] for key in keys if key in self._names}
+
+	async def resolve_async(self, keys) -> dict[tuple[str, int], str]:
+		keys = list(keys)
+		# Fully cached lookups never leave the event loop
+		if all((t, int(i)) in self._names for t, i in keys):
+			return self.resolve(keys)
+		return await asyncio.to_thread(self.resolve, keys)
+
+	def search(self, text: str, content_types: list[str] = None) -> list[tuple[str, int, str]]:
+		"""
+		(content_type, id, name) entries whose name contains `text` (case-insensitive).
+		Answers from the current map (autocomplete has ~3s to respond); a stale map
+		is reloaded in the background for later calls.
+		"""
+		self.refresh_in_background()
+		text = text.lower()
+		content_types = set(content_types or self.content_types)
+		return [
+			(content_type, item_id, name)
+			for (content_type, item_id), name in list(self._names.items())
+			if content_type in content_types and text in name.lower()
+		]
+
+	def note_write(self, table_name: str, item_id, data: dict = None, deleted: bool = False):
+		"""Keep the cache in step with a create / update / delete on a content table."""
+		content_type = table_name[:-1] if table_name.endswith("s") else table_name
+		if content_type not in self.content_types or item_id is None:
+			return
+		if deleted:
+			self.forget(content_type, item_id)
+			return
+		name = (data or {}).get(name_column_for(content_type))
+		if name:
+			self.set(content_type, item_id, name)
+
+
+item_names = ItemNameCache()
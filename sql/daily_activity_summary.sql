@@ -0,0 +1,87 @@
+-- Server-side aggregation for the daily activity report.
+--
+-- Used by azoth_commands/daily_update.py (_fetch_summary_rpc). Returns the same
+-- fields as the Python fallback _summarize_activity(), so the bot receives a
+-- handful of numbers instead of every game and boss-fight row of the day.
+-- Durations and turns are returned as sum + count so summaries can be combined.
+--
+-- Semantics match the Python fallback exactly:
+--   * a NULL player_uuid counts as one distinct player
+--   * zero / NULL elapsed_sec and turns_played are excluded from sums and counts
+--   * a NULL or empty result is bucketed as 'unknown'
+
+create or replace function public.daily_activity_summary(start_ts timestamptz, end_ts timestamptz)
+returns jsonb
+language sql
+stable
+as $$
+    with day_games as (
+        select
+            player_uuid,
+            level_reached,
+            highest_combo,
+            act_reached,
+            turns_played,
+            elapsed_sec,
+            coalesce(nullif(result, ''), 'unknown') as result
+        from public.games
+        where finished_at >= start_ts
+          and finished_at < end_ts
+    ),
+    game_summary as (
+        select
+            count(*) as total_games,
+            count(distinct player_uuid)
+                + case when bool_or(player_uuid is null) then 1 else 0 end as unique_players,
+            coalesce(max(coalesce(level_reached, 0)), 0) as max_level,
+            coalesce(max(coalesce(highest_combo, 0)), 0) as max_combo,
+            coalesce(max(coalesce(act_reached, 0)), 0) as max_act,
+            coalesce(sum(elapsed_sec) filter (where elapsed_sec <> 0), 0) as duration_sum,
+            count(*) filter (where elapsed_sec <> 0) as duration_count,
+            coalesce(sum(turns_played) filter (where turns_played <> 0), 0) as turns_sum,
+            count(*) filter (where turns_played <> 0) as turns_count
+        from day_games
+    ),
+    result_counts as (
+        select coalesce(jsonb_object_agg(result, n), '{}'::jsonb) as game_results
+        from (
+            select result, count(*) as n
+            from day_games
+            group by result
+        ) r
+    ),
+    boss_summary as (
+        select
+            count(*) as total_boss_fights,
+            count(*) filter (where result = 'win') as boss_wins,
+            count(*) filter (where result = 'loss') as boss_losses
+        from public.boss_fights
+        where created_at >= start_ts
+          and created_at < end_ts
+    ),
+    player_summary as (
+        select count(*) as new_players
+        from public.players
+        where created_at >= start_ts
+          and created_at < end_ts
+    )
+    select jsonb_build_object(
+        'total_games', g.total_games,
+        'unique_players', g.unique_players,
+        'new_players', p.new_players,
+        'max_level', g.max_level,
+        'max_combo', g.max_combo,
+        'max_act', g.max_act,
+        'duration_sum', g.duration_sum,
+        'duration_count', g.duration_count,
+        'turns_sum', g.turns_sum,
+        'turns_count', g.turns_count,
+        'game_results', r.game_results,
+        'total_boss_fights', b.total_boss_fights,
+        'boss_wins', b.boss_wins,
+        'boss_losses', b.boss_losses
+    )
+    from game_summary g, result_counts r, boss_summary b, player_summary p;
+$$;
+
+grant execute on function public.daily_activity_summary(timestamptz, timestamptz) to anon, authenticated, service_role;
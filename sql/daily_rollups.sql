@@ -0,0 +1,34 @@
+-- Incremental per-day rollups for the activity report.
+--
+-- Written by azoth_commands/activity_rollup.py: each finished CST day is scanned
+-- once from games / drafts / draft_items / boss_fights and stored here, so
+-- reports (and catch-up sends) read a summary row plus the day's item rows
+-- instead of rescanning raw tables. Recomputing a day (backfill with recompute)
+-- deletes its rows and writes them again, so it is idempotent.
+
+create table if not exists public.daily_activity_rollups (
+    day date primary key,
+    -- daily_activity_summary() fields: counts, maxima, duration/turn sums + counts
+    summary jsonb not null,
+    -- distinct players that day, so multi-day windows can count unique players
+    player_uuids text[] not null default '{}',
+    -- any game that day had no player_uuid (counts as one more distinct player)
+    has_null_player boolean not null default false,
+    total_drafts integer not null default 0,
+    computed_at timestamptz not null default now()
+);
+
+create table if not exists public.daily_item_rollups (
+    day date not null,
+    item_type text not null,
+    item_id bigint not null,
+    offered integer not null default 0,
+    picked integer not null default 0,
+    -- sum / count of (level_reached + highest_combo) over scored picks
+    score_sum double precision not null default 0,
+    score_count integer not null default 0,
+    primary key (day, item_type, item_id)
+);
+
+create index if not exists daily_item_rollups_item_idx
+    on public.daily_item_rollups (item_type, item_id);
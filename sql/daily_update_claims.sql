@@ -0,0 +1,15 @@
+-- Shared claims for daily report sends (azoth_commands/report_claims.py).
+--
+-- Every bot instance claims (channel, day) here before sending a channel's daily
+-- report. The primary key makes the claim an atomic compare-and-set: the insert
+-- succeeds for exactly one instance, and the others see a conflict and skip,
+-- so several instances (blue/green deploys, shards) never double-send.
+
+create table if not exists public.daily_update_claims (
+    channel_id text not null,
+    -- CST day the report was sent on (the scheduler's last_sent_date)
+    report_date date not null,
+    claimed_by text not null,
+    claimed_at timestamptz not null default now(),
+    primary key (channel_id, report_date)
+);
@@ -0,0 +1,274 @@
+# azothbot/supabase_bulk.py
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from supabase_client import supabase
+from supabase_helpers import _note_content_write
+
+# Names per `in_` lookup; keeps the request URL well under PostgREST's limits
+NAME_LOOKUP_CHUNK = 200
+# Records per grouped update request (ids in one `in_` filter)
+UPDATE_BATCH_SIZE = 100
+# Update requests in flight at once; most entries change different values and
+# so cost a request each
+UPDATE_WORKERS = 8
+# Multi-row inserts are cut at whichever limit is hit first. PostgREST accepts
+# far larger bodies, but smaller requests keep a failed chunk's per-row retry cheap.
+MAX_INSERT_ROWS = 500
+MAX_INSERT_BYTES = 256 * 1024
+# Longest value shown in a dry-run diff line
+MAX_DIFF_VALUE_CHARS = 60
+
+
+def _chunks(items: list, size: int):
+	for start in range(0, len(items), size):
+		yield items[start:start + size]
+
+
+def _short(value) -> str:
+	text = repr(value)
+	return text if len(text) <= MAX_DIFF_VALUE_CHARS else text[:MAX_DIFF_VALUE_CHARS - 1] + "…"
+
+
+class BulkResult:
+	"""Outcome of a bulk operation on one table: counts, per-row errors and (dry run) diffs."""
+
+	def __init__(self, table: str, dry_run: bool = False):
+		self.table = table
+		self.dry_run = dry_run
+		self.applied = 0
+		self.unchanged = 0
+		self.errors: list[str] = []
+		self.diffs: list[str] = []
+
+	def merge(self, other: "BulkResult"):
+		"""Fold in the result of another batch for the same table."""
+		self.dry_run = self.dry_run or other.dry_run
+		self.applied += other.applied
+		self.unchanged += other.unchanged
+		self.errors.extend(other.errors)
+		self.diffs.extend(other.diffs)
+
+	def warn(self, label, message: str):
+		self.errors.append(f"⚠️ `{self.table}` / `{label}`: {message}")
+
+	def error(self, label, message):
+		self.errors.append(f"❌ `{self.table}` / `{label}`: {message}")
+
+	def summary_line(self, verb: str = "Updated") -> str | None:
+		"""One success line for the command response, or None if nothing happened."""
+		unchanged = f" ({self.unchanged} already up to date)" if self.unchanged else ""
+		if self.dry_run:
+			return f"📝 `{self.table}`: {self.applied} record(s) would change{unchanged}."
+		if not self.applied:
+			return None
+		return f"✅ {verb} {self.applied} record(s) in `{self.table}`{unchanged}."
+
+
+class UpdatePlan:
+	"""A matched record and the fields an update would actually change on it."""
+
+	def __init__(self, label: str, record: dict, changes: dict):
+		self.label = label
+		self.record = record
+		self.changes = changes
+
+	def diff_lines(self) -> list[str]:
+		return [
+			f"{self.label}: {field}: {_short(self.record.get(field))} → {_short(value)}"
+			for field, value in self.changes.items()
+		]
+
+
+def _lookup_by_name(table: str, names: list[str]) -> dict[str, list[dict]]:
+	"""name -> matching rows (lowest id first), one `in_` query per NAME_LOOKUP_CHUNK names."""
+	matches: dict[str, list[dict]] = {}
+	for chunk in _chunks(names, NAME_LOOKUP_CHUNK):
+		response = supabase.table(table).select("*").in_("name", chunk).order("id").execute()
+		for row in response.data or []:
+			matches.setdefault(row["name"], []).append(row)
+	return matches
+
+
+def plan_updates(table: str, entries: list, result: BulkResult, labels: list = None) -> list[UpdatePlan]:
+	"""
+	Match bulk_update entries to records by `name` and work out what would change.
+	- entries: objects with `name` (the current name), fields to set, and optionally
+	  `new_name` to rename the record
+	- labels: how to refer to each entry in errors when it has no name (default: its index)
+	Entries naming the same record are merged in order. Fields that already hold the
+	requested value are dropped, and records left with no changes count as unchanged.
+	Problems are recorded on `result` per entry; the rest still go through.
+	"""
+	parsed = []
+	for index, entry in enumerate(entries):
+		if not isinstance(entry, dict) or not entry.get("name"):
+			result.warn(labels[index] if labels else f"index {index}", "entry missing `name` field; skipped.")
+			continue
+		data = dict(entry)
+		name = data.pop("name")
+		if "new_name" in data:
+			data["name"] = data.pop("new_name")
+		parsed.append((name, data))
+
+	if not parsed:
+		return []
+
+	try:
+		matches = _lookup_by_name(table, sorted({name for name, _ in parsed}))
+	except Exception as e:
+		result.error("*", f"lookup failed — `{e}`")
+		return []
+
+	merged: dict = {}  # record id -> (label, record, fields to set)
+	for name, data in parsed:
+		rows = matches.get(name)
+		if not rows:
+			result.warn(name, "no record with that name.")
+			continue
+		record = rows[0]
+		unknown = sorted(field for field in data if field not in record)
+		if unknown:
+			result.error(name, f"unknown column(s) {', '.join(f'`{f}`' for f in unknown)}")
+			continue
+		merged.setdefault(record["id"], (name, record, {}))[2].update(data)
+
+	plans = []
+	for name, record, data in merged.values():
+		changes = {field: value for field, value in data.items() if record.get(field) != value}
+		if changes:
+			plans.append(UpdatePlan(name, record, changes))
+		else:
+			result.unchanged += 1
+	return plans
+
+
+def _update_batch(table: str, changes: dict, plans: list[UpdatePlan]) -> list[dict]:
+	"""Set `changes` on every plan's record with one UPDATE ... WHERE id IN (...). Returns the updated rows."""
+	ids = [plan.record["id"] for plan in plans]
+	response = supabase.table(table).update(changes).in_("id", ids).execute()
+	return response.data or []
+
+
+def apply_updates(table: str, plans: list[UpdatePlan], result: BulkResult):
+	"""
+	Write planned updates, sending only the changed columns. Plans that set the
+	same values are grouped into one `update` filtered by id (UPDATE_BATCH_SIZE ids
+	per request); the rest cost one request each, run on UPDATE_WORKERS threads.
+	Columns an entry didn't mention are never written, and a record deleted since
+	the lookup is reported rather than re-created.
+	"""
+	now = datetime.now(timezone.utc).isoformat()
+	groups: dict[str, tuple[dict, list[UpdatePlan]]] = {}
+	for plan in plans:
+		changes = dict(plan.changes, **({"updated_at": now} if "updated_at" in plan.record else {}))
+		key = json.dumps(changes, sort_keys=True, default=str)
+		groups.setdefault(key, (changes, []))[1].append(plan)
+	batches = [(changes, batch) for changes, group in groups.values() for batch in _chunks(group, UPDATE_BATCH_SIZE)]
+
+	def run(batch: tuple[dict, list[UpdatePlan]]):
+		try:
+			return _update_batch(table, *batch), None
+		except Exception as e:
+			return None, e
+
+	with ThreadPoolExecutor(max_workers=max(1, min(UPDATE_WORKERS, len(batches)))) as pool:
+		outcomes = list(pool.map(run, batches))
+
+	# Results are recorded here, on the calling thread
+	for (changes, batch), (rows, error) in zip(batches, outcomes):
+		if error is not None:
+			for plan in batch:
+				result.error(plan.label, error)
+			continue
+		updated = {row.get("id") for row in rows}
+		for plan in batch:
+			if plan.record["id"] in updated:
+				result.applied += 1
+				_note_content_write(table, plan.record["id"], changes)
+			else:
+				result.warn(plan.label, "update matched no record (deleted since the lookup?).")
+
+
+def bulk_update_table(table: str, entries: list, labels: list = None, dry_run: bool = False) -> BulkResult:
+	"""
+	Update records in `table` by name (see plan_updates). With dry_run, nothing is
+	written and `result.diffs` lists every field that would change. Blocking.
+	"""
+	result = BulkResult(table, dry_run)
+	plans = plan_updates(table, entries, result, labels)
+	if dry_run:
+		result.applied = len(plans)
+		for plan in plans:
+			result.diffs.extend(plan.diff_lines())
+	elif plans:
+		apply_updates(table, plans, result)
+	return result
+
+
+def _insert_chunks(rows: list[tuple[str, dict]]):
+	"""
+	Group (label, row) pairs into consecutive insert chunks of at most MAX_INSERT_ROWS
+	rows / MAX_INSERT_BYTES of JSON. A chunk also ends where the set of keys changes:
+	a multi-row insert sends the union of its rows' columns, which would write NULL
+	over column defaults for rows that leave one out.
+	"""
+	chunk, size, keys = [], 0, None
+	for label, row in rows:
+		row_size = len(json.dumps(row, default=str))
+		row_keys = frozenset(row)
+		if chunk and (len(chunk) >= MAX_INSERT_ROWS or size + row_size > MAX_INSERT_BYTES or row_keys != keys):
+			yield chunk
+			chunk, size = [], 0
+		chunk.append((label, row))
+		size += row_size
+		keys = row_keys
+	if chunk:
+		yield chunk
+
+
+def _insert_one(table: str, label, row: dict, result: BulkResult):
+	try:
+		response = supabase.table(table).insert(row).execute()
+	except Exception as e:
+		result.error(label, e)
+		return
+	if not response.data:
+		result.warn(label, "insert returned no data.")
+		return
+	result.applied += 1
+	for inserted in response.data:
+		_note_content_write(table, inserted.get("id"), inserted)
+
+
+def bulk_insert_table(table: str, entries: list, labels: list = None) -> BulkResult:
+	"""
+	Insert `entries` into `table` with one multi-row insert per chunk (see _insert_chunks).
+	Only a chunk that fails is retried row by row, so errors still name the entry
+	while a clean import costs one request per chunk. `labels` name entries in
+	errors (default: `name`, else the entry's index). Blocking.
+	"""
+	result = BulkResult(table)
+	rows = []
+	for index, entry in enumerate(entries):
+		label = labels[index] if labels else None
+		if not isinstance(entry, dict) or not entry:
+			result.warn(label or f"index {index}", "entry is empty or not an object; skipped.")
+			continue
+		rows.append((label or entry.get("name") or f"index {index}", entry))
+
+	for chunk in _insert_chunks(rows):
+		try:
+			response = supabase.table(table).insert([row for _, row in chunk]).execute()
+		except Exception as e:
+			print(f"bulk insert: {table} chunk of {len(chunk)} failed, retrying per row: {e}")
+			for label, row in chunk:
+				_insert_one(table, label, row, result)
+			continue
+		inserted = response.data or []
+		result.applied += len(inserted)
+		if len(inserted) < len(chunk):
+			result.warn(chunk[0][0], f"chunk of {len(chunk)} returned {len(inserted)} row(s).")
+		for row in inserted:
+			_note_content_write(table, row.get("id"), row)
+	return result
@@ -0,0 +1,117 @@
+# azothbot/supabase_cache.py
+import asyncio
+import time
+from supabase_helpers import build_select, execute_async
+
+# Seconds a view's results stay fresh. The aggregate views change slowly and
+# are expensive to compute; per-player views are cheap but users expect them
+# to reflect a game they just finished.
+VIEW_TTLS = {
+	"hero_info_view": 300,
+	"version_info_view": 300,
+	"draft_deck_view": 300,
+	"draft_rates_view": 300,
+	"leaderboard_view": 60,
+	"player_activity_view": 60,
+	"player_info_view": 30,
+}
+DEFAULT_TTL = 60
+# Cached results kept at most (oldest evicted first)
+MAX_ENTRIES = 256
+
+
+def _freeze(value):
+	"""Hashable form of filter values (lists become tuples)."""
+	if isinstance(value, (list, tuple)):
+		return tuple(_freeze(v) for v in value)
+	return value
+
+
+class QueryCache:
+	"""
+	TTL cache for fetch_all-style reads, keyed by (table, columns, filters, sort, limit, offset).
+	Concurrent identical requests share one in-flight query (single-flight), and
+	failed queries are never cached.
+	"""
+
+	def __init__(self, ttls: dict = None, default_ttl: float = DEFAULT_TTL, max_entries: int = MAX_ENTRIES):
+		self.ttls = dict(VIEW_TTLS if ttls is None else ttls)
+		self.default_ttl = default_ttl
+		self.max_entries = max_entries
+		self._entries: dict[tuple, tuple[float, list[dict]]] = {}  # key -> (expires_at, rows)
+		self._inflight: dict[tuple, asyncio.Future] = {}
+		self.hits = 0
+		self.misses = 0
+		self.coalesced = 0
+
+	@staticmethod
+	def _key(table_name, columns, filters, sort, limit, offset) -> tuple:
+		return (
+			table_name,
+			tuple(columns or ()),
+			tuple(sorted((k, _freeze(v)) for k, v in (filters or {}).items())),
+			tuple(sort or ()),
+			limit,
+			offset,
+		)
+
+	async def fetch(self, table_name: str, columns: list[str] = None, filters: dict = None,
+			sort: list[str] = None, limit: int = None, offset: int = 0) -> list[dict]:
+		"""Rows for the query, from cache while fresh. Query errors propagate."""
+		key = self._key(table_name, columns, filters, sort, limit, offset)
+		now = time.monotonic()
+
+		entry = self._entries.get(key)
+		if entry and entry[0] > now:
+			self.hits += 1
+			return entry[1]
+
+		future = self._inflight.get(key)
+		if future is not None:
+			self.coalesced += 1
+			return await asyncio.shield(future)
+
+		self.misses += 1
+		ttl = self.ttls.get(table_name, self.default_ttl)
+		future = asyncio.ensure_future(execute_async(build_select(table_name, columns, filters, sort, limit, offset)))
+		self._inflight[key] = future
+
+		def settle(done: asyncio.Future):
+			# Runs even if every waiter gave up, so the result still lands in the cache
+			self._inflight.pop(key, None)
+			if not done.cancelled() and done.exception() is None:
+				self._store(key, done.result(), ttl)
+
+		future.add_done_callback(settle)
+		# Shielded: a caller timing out must not cancel the query for the others
+		return await asyncio.shield(future)
+
+	def _store(self, key: tuple, rows: list[dict], ttl: float):
+		now = time.monotonic()
+		self._entries[key] = (now + ttl, rows)
+		if len(self._entries) > self.max_entries:
+			for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+				del self._entries[stale]
+			while len(self._entries) > self.max_entries:
+				del self._entries[next(iter(self._entries))]
+
+	def invalidate(self, table_name: str = None):
+		"""Drop cached results for one table, or everything."""
+		if table_name is None:
+			self._entries.clear()
+		else:
+			for key in [k for k in self._entries if k[0] == table_name]:
+				del self._entries[key]
+
+	def stats(self) -> dict:
+		lookups = self.hits + self.misses + self.coalesced
+		return {
+			"entries": len(self._entries),
+			"hits": self.hits,
+			"misses": self.misses,
+			"coalesced": self.coalesced,
+			"hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+		}
+
+
+stats_cache = QueryCache()
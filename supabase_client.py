@@ -1,4 +1,5 @@
 import os
+import httpx
 from supabase import create_client, Client
 from dotenv import load_dotenv
 load_dotenv()
@@ -9,4 +10,69 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 if not SUPABASE_URL or not SUPABASE_KEY:
     raise Exception("Missing Supabase credentials! Make sure SUPABASE_URL and SUPABASE_KEY are set.")
 
+# Keep-alive pool shared by every PostgREST / storage call. Commands fan out to
+# worker threads (bulk downloads, report queries), so allow that many warm
+# connections instead of reconnecting (and re-handshaking TLS) per burst.
+SUPABASE_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16, keepalive_expiry=60)
+
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def _transport_settings(session: httpx.Client) -> dict:
+    """verify / http2 the session's transport was built with. httpx keeps them on
+    the connection pool only, so they are read back from there.
+
+    Reads private attributes (`Client._transport`, httpcore's `ConnectionPool._ssl_context`
+    / `._http2`), checked against httpx 0.23 / httpcore 0.16, the versions supabase
+    1.0.3 resolves to. If they move, nothing breaks: the settings are left to httpx's
+    defaults (verify on, HTTP/1.1), which is also what the sub-clients use.
+    """
+    pool = getattr(getattr(session, "_transport", None), "_pool", None)
+    settings = {}
+    ssl_context = getattr(pool, "_ssl_context", None)
+    if ssl_context is not None:
+        settings["verify"] = ssl_context
+    if getattr(pool, "_http2", False):
+        settings["http2"] = True
+    return settings
+
+
+def _use_pooled_session(client):
+    """Swap a sub-client's httpx session for one with SUPABASE_POOL_LIMITS,
+    keeping every other setting the sub-client built it with."""
+    session = getattr(client, "session", None)
+    if not isinstance(session, httpx.Client):
+        return
+    pooled = type(session)(
+        base_url=session.base_url,
+        headers=session.headers,
+        cookies=session.cookies,
+        auth=session.auth,
+        params=session.params,
+        timeout=session.timeout,
+        follow_redirects=session.follow_redirects,
+        max_redirects=session.max_redirects,
+        event_hooks=session.event_hooks,
+        trust_env=session.trust_env,
+        limits=SUPABASE_POOL_LIMITS,
+        **_transport_settings(session),
+    )
+    for attr in ("session", "_client"):
+        if getattr(client, attr, None) is session:
+            setattr(client, attr, pooled)
+    session.close()
+
+
+# Shorthand for the storage client (created once by create_client)
+storage = supabase.storage
+
+_use_pooled_session(supabase.postgrest)
+_use_pooled_session(storage)
+
+
+def close_supabase_sessions():
+    """Close the pooled PostgREST and storage connections (bot shutdown)."""
+    for client in (supabase.postgrest, storage):
+        session = getattr(client, "session", None)
+        if isinstance(session, httpx.Client):
+            session.close()
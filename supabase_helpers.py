@@ -1,16 +1,12 @@
 # azothbot/supabase_helpers.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from supabase_client import supabase
 
 
-"""
-	Fetch records from a Supabase table.
-	- columns: list of column names to select (defaults to '*')
-	- filters: dict of field → value pairs to filter by
-"""
-def fetch_all(table_name: str, columns: list[str] = None, filters: dict = None, sort: list[str] = None) -> list[dict]:
-	selector = ",".join(columns) if columns else "*"
-	query = supabase.table(table_name).select(selector)
-
+def _apply_filters(query, filters: dict = None, sort: list[str] = None):
+	"""Apply fetch_all-style filters (eq / in / is null) and sort keys to a query."""
 	if filters:
 		for key, value in filters.items():
 			if value is None:
@@ -26,6 +22,33 @@ def fetch_all(table_name: str, columns: list[str] = None, filters: dict = None,
 				query = query.order(s[1:], desc=True)
 			else:
 				query = query.order(s)
+	return query
+
+
+def build_select(table_name: str, columns: list[str] = None, filters: dict = None, sort: list[str] = None,
+		limit: int = None, offset: int = 0):
+	"""The query fetch_all runs, unexecuted (for callers that execute it themselves)."""
+	selector = ",".join(columns) if columns else "*"
+	query = _apply_filters(supabase.table(table_name).select(selector), filters, sort)
+
+	if limit is not None:
+		query = query.range(offset, offset + max(limit, 1) - 1)
+	elif offset:
+		query = query.range(offset, offset + MAX_PAGE_SIZE - 1)
+	return query
+
+
+"""
+	Fetch records from a Supabase table.
+	- columns: list of column names to select (defaults to '*')
+	- filters: dict of field → value pairs to filter by
+	- sort: column names, '-' prefix for descending
+	- limit / offset: applied by PostgREST, so only the requested rows are sent
+	Single request: PostgREST caps it at MAX_PAGE_SIZE rows. Use iter_all for large tables.
+"""
+def fetch_all(table_name: str, columns: list[str] = None, filters: dict = None, sort: list[str] = None,
+		limit: int = None, offset: int = 0) -> list[dict]:
+	query = build_select(table_name, columns, filters, sort, limit, offset)
 
 	try:
 		response = query.execute()
@@ -34,10 +57,220 @@ def fetch_all(table_name: str, columns: list[str] = None, filters: dict = None,
 		print(f"Supabase fetch_all error: {e}")
 		return []
 
+async def execute_async(query, semaphore: asyncio.Semaphore = None) -> list[dict]:
+	"""
+	Run a built PostgREST query on a worker thread and return its rows.
+	- semaphore: optional shared cap on how many queries are in flight at once
+	Lets independent queries overlap without blocking the event loop.
+	"""
+	if semaphore is None:
+		response = await asyncio.to_thread(query.execute)
+	else:
+		async with semaphore:
+			response = await asyncio.to_thread(query.execute)
+	return response.data or []
+
+# ---------------------------------------------------------------------------
+# Paginated reads
+# ---------------------------------------------------------------------------
+
+# PostgREST truncates every response to the project's max-rows (1000 on Supabase
+# by default), so pages are capped here; a larger page would come back short and
+# look like the last one.
+MAX_PAGE_SIZE = 1000
+
+
+def _page_query(make_query, page_size: int, key: str, offset: int, last_key):
+	"""Build one page: keyset (`key` > last seen, ordered by key) or range (offset)."""
+	query = make_query()
+	if key:
+		query = query.order(key)
+		if last_key is not None:
+			query = query.gt(key, last_key)
+		return query.limit(page_size)
+	return query.range(offset, offset + page_size - 1)
+
+
+def _next_cursor(rows: list[dict], key: str, offset: int):
+	return offset + len(rows), (rows[-1][key] if key else None)
+
+
+def _has_more(rows: list[dict], page_size: int, key: str) -> bool:
+	"""Whether another page may follow. A keyset scan reads until a page comes back
+	empty: if the server's max-rows is below page_size every page is short, and
+	stopping at the first short one would silently drop the rest."""
+	return bool(key) or len(rows) == page_size
+
+
+def iter_query(make_query, page_size: int = MAX_PAGE_SIZE, key: str = None, prefetch: bool = False):
+	"""
+	Yield every row of a query, one page at a time.
+	- make_query: zero-arg callable returning a fresh filtered select (builders are single-use)
+	- key: unique column for keyset paging (must be selected); range paging when omitted,
+	  in which case the query should carry its own stable order
+	- prefetch: fetch the next page on a worker thread while the current one is consumed
+	Unlike fetch_all, errors are raised rather than returning a partial result.
+	"""
+	page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+	executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+	def fetch(offset, last_key):
+		return _page_query(make_query, page_size, key, offset, last_key).execute().data or []
+
+	try:
+		offset, last_key = 0, None
+		rows = fetch(offset, last_key)
+		while rows:
+			offset, last_key = _next_cursor(rows, key, offset)
+			has_more = _has_more(rows, page_size, key)
+			pending = executor.submit(fetch, offset, last_key) if has_more and executor else None
+			yield from rows
+			if not has_more:
+				break
+			rows = pending.result() if pending else fetch(offset, last_key)
+	finally:
+		if executor:
+			executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_all(table_name: str, columns: list[str] = None, filters: dict = None, sort: list[str] = None,
+		page_size: int = MAX_PAGE_SIZE, key: str = None, prefetch: bool = False):
+	"""
+	Paginated fetch_all: yields every matching row instead of the first page.
+	- key: unique column for keyset paging (replaces `sort`); otherwise range paging
+	  over `sort`, which should be unique for pages to be stable
+	See iter_query for page_size / prefetch.
+	"""
+	selector = ",".join(columns) if columns else "*"
+
+	def make_query():
+		return _apply_filters(supabase.table(table_name).select(selector), filters, None if key else sort)
+
+	return iter_query(make_query, page_size=page_size, key=key, prefetch=prefetch)
+
+
+async def aiter_query(make_query, page_size: int = MAX_PAGE_SIZE, key: str = None, prefetch: bool = False,
+		semaphore: asyncio.Semaphore = None):
+	"""
+	Async iter_query: pages run via execute_async (optionally under a shared semaphore),
+	so rows can be streamed through an aggregation without blocking the event loop.
+	"""
+	page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+	def fetch(offset, last_key):
+		return execute_async(_page_query(make_query, page_size, key, offset, last_key), semaphore)
+
+	pending = None
+	try:
+		offset, last_key = 0, None
+		rows = await fetch(offset, last_key)
+		while rows:
+			offset, last_key = _next_cursor(rows, key, offset)
+			has_more = _has_more(rows, page_size, key)
+			if has_more and prefetch:
+				pending = asyncio.ensure_future(fetch(offset, last_key))
+			for row in rows:
+				yield row
+			if not has_more:
+				break
+			if pending:
+				rows, pending = await pending, None
+			else:
+				rows = await fetch(offset, last_key)
+	finally:
+		if pending:
+			pending.cancel()
+
+
+# ---------------------------------------------------------------------------
+# Table schemas
+# ---------------------------------------------------------------------------
+
+# Table schemas come from PostgREST's OpenAPI description and are refetched after this long
+SCHEMA_REFRESH_SEC = 10 * 60
+
+_TYPE_CHECKS = {
+	"integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+	"number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+	"boolean": lambda v: isinstance(v, bool),
+	"string": lambda v: isinstance(v, str),
+	"array": lambda v: isinstance(v, list),
+}
+
+
+class TableSchema:
+	"""Columns of one table or view as described by PostgREST: OpenAPI type and format per column, plus required ones."""
+
+	def __init__(self, table: str, properties: dict, required: list[str]):
+		self.table = table
+		self.types = {column: spec.get("type") for column, spec in properties.items()}
+		# Postgres type name, e.g. "bigint", "text", "jsonb"
+		self.formats = {column: spec.get("format") for column, spec in properties.items()}
+		self.required = set(required)
+
+	def orderable_columns(self) -> list[str]:
+		"""Columns in table order that Postgres can ORDER BY (plain json has no ordering)."""
+		return [column for column, fmt in self.formats.items() if fmt != "json"]
+
+	def problems(self, row: dict, mode: str) -> list[str]:
+		"""What's wrong with a bulk row: unknown columns, mistyped values, and (insert) missing required columns."""
+		columns = dict(row)
+		if mode == "update" and "new_name" in columns:
+			columns["name"] = columns.pop("new_name")
+		problems = []
+		unknown = sorted(column for column in columns if column not in self.types)
+		if unknown:
+			problems.append(f"unknown column(s) {', '.join(f'`{c}`' for c in unknown)}")
+		for column, value in columns.items():
+			check = _TYPE_CHECKS.get(self.types.get(column))
+			if value is not None and check and not check(value):
+				problems.append(f"`{column}` should be {self.types[column]}, got {type(value).__name__}")
+		if mode == "insert":
+			missing = sorted(self.required - {c for c, v in columns.items() if v is not None})
+			if missing:
+				problems.append(f"missing required column(s) {', '.join(f'`{c}`' for c in missing)}")
+		return problems
+
+
+_schemas: dict[str, TableSchema] = {}
+_schemas_loaded_at = 0.0
+
+
+def get_table_schemas() -> dict[str, TableSchema]:
+	"""
+	Table schemas from PostgREST's OpenAPI root, cached for SCHEMA_REFRESH_SEC.
+	If the description can't be read, the last schemas loaded are returned ({} if
+	none), so callers skip validation and the database has the final say. Blocking.
+	"""
+	global _schemas, _schemas_loaded_at
+	if _schemas and time.monotonic() - _schemas_loaded_at < SCHEMA_REFRESH_SEC:
+		return _schemas
+	try:
+		response = supabase.postgrest.session.get("/")
+		response.raise_for_status()
+		definitions = response.json().get("definitions", {})
+	except Exception as e:
+		print(f"Supabase get_table_schemas error: {e}")
+		return _schemas
+	_schemas = {
+		table: TableSchema(table, spec.get("properties", {}), spec.get("required", []))
+		for table, spec in definitions.items()
+	}
+	_schemas_loaded_at = time.monotonic()
+	return _schemas
+
+
+def _note_content_write(table_name, item_id, data=None, deleted=False):
+	"""Mirror a write into the shared item name cache (deck content tables only)."""
+	from item_names import item_names
+	item_names.note_write(table_name, item_id, data, deleted)
+
 """Create a new record."""
 def create_record(table_name, data):
 	try:
 		response = supabase.table(table_name).insert(data).execute()
+		for row in response.data or []:
+			_note_content_write(table_name, row.get("id"), row)
 		return response.data
 	except Exception as e:
 		print(f"Supabase create_record error: {e}")
@@ -50,6 +283,7 @@ def update_record(table_name, record_id, data):
 	try:
 		data["updated_at"] = datetime.now(timezone.utc).isoformat()
 		response = supabase.table(table_name).update(data).eq("id", record_id).execute()
+		_note_content_write(table_name, record_id, data)
 		return response.data
 	except Exception as e:
 		print(f"Supabase update_record error: {e}")
@@ -59,6 +293,7 @@ def update_record(table_name, record_id, data):
 def delete_record(table_name, record_id):
 	try:
 		response = supabase.table(table_name).delete().eq("id", record_id).execute()
+		_note_content_write(table_name, record_id, deleted=True)
 		return response.data
 	except Exception as e:
 		print(f"Supabase delete_record error: {e}")
@@ -135,6 +370,22 @@ def get_deck_contents(deck: dict, full: bool = False) -> tuple[bool, list[dict |
 
 	results = []
 
+	from item_names import item_names
+
+	if not full:
+		# Names only: served from the shared name cache (one batched lookup per type for misses)
+		names = item_names.resolve((r["content_type"], r["content_id"]) for r in join_rows)
+		for content_type in grouped:
+			rows = [
+				r for r in join_rows
+				if r["content_type"] == content_type and (content_type, r["content_id"]) in names
+			]
+			if not rows:
+				return False, f"Failed to fetch {content_type} data."
+			rows.sort(key=lambda r: names[(content_type, r["content_id"])].lower())
+			results.extend(names[(content_type, r["content_id"])] for r in rows)
+		return True, results
+
 	for content_type, ids in grouped.items():
 		table_name = f"{content_type}s"  # e.g. 'cards', 'aspects', 'events'
 		sort_key = "challenge_name" if content_type == "ritual" else "name"
@@ -145,22 +396,18 @@ def get_deck_contents(deck: dict, full: bool = False) -> tuple[bool, list[dict |
 
 		id_to_obj = {r["id"]: r for r in records}
 		sort_order = {r["id"]: i for i, r in enumerate(records)}
+		for r in records:
+			item_names.set(content_type, r["id"], get_display_name(r, content_type))
 
 		matching_rows = [r for r in join_rows if r["content_type"] == content_type]
 		sorted_rows = sorted(matching_rows, key=lambda r: sort_order.get(r["content_id"], float("inf")))
 
-		if full:
-			for row in sorted_rows:
-				obj = id_to_obj.get(row["content_id"])
-				if obj:
-					obj_copy = obj.copy()
-					obj_copy["item_type"] = content_type
-					results.append(obj_copy)
-		else:
-			for row in sorted_rows:
-				obj = id_to_obj.get(row["content_id"])
-				if obj:
-					results.append(get_display_name(obj, content_type))
+		for row in sorted_rows:
+			obj = id_to_obj.get(row["content_id"])
+			if obj:
+				obj_copy = obj.copy()
+				obj_copy["item_type"] = content_type
+				results.append(obj_copy)
 
 	return True, results
 
@@ -1,13 +1,37 @@
+import hashlib
 import os
 import re
-from supabase_client import supabase
+import time
+from concurrent.futures import ThreadPoolExecutor
+from supabase_client import storage
 
+# Bulk downloads share one bounded worker pool so a large deck overlaps its
+# storage round trips without opening an unbounded number of connections.
+BULK_DOWNLOAD_WORKERS = 8
+BULK_DOWNLOAD_RETRIES = 3
+BULK_DOWNLOAD_BACKOFF_SEC = 0.5
 
-def generate_image_filename(name: str, version: int) -> str:
+# Art objects are content-addressed and never overwritten, so any cache in front
+# of storage can keep them for a year without revalidating.
+IMMUTABLE_CACHE_CONTROL = "31536000"
+
+_CONTENT_NAME_RE = re.compile(r"_[0-9a-f]{16}\.png$")
+
+# (bucket, object name) pairs already confirmed to exist in storage
+_known_objects: set[tuple[str, str]] = set()
+
+
+def generate_image_filename(name: str, version: int | str) -> str:
 	safe_name = re.sub(r'\W+', '_', name.lower()).strip('_')
 	return f"{safe_name}_{version}.png"
 
 
+def generate_content_filename(name: str, image_bytes: bytes) -> str:
+	"""Immutable object name derived from the image bytes, e.g. 'new_card_3f2a9c1d0b7e4a55.png'."""
+	digest = hashlib.sha256(image_bytes).hexdigest()[:16]
+	return generate_image_filename(name, digest)
+
+
 def generate_local_filename(name: str) -> str:
 	safe_name = re.sub(r'\W+', '_', name.lower()).strip('_')
 	return f"{safe_name}.png"
@@ -23,10 +47,14 @@ def download_image(image_name: str, bucket: str, download_dir: str = "assets/dow
 	local_name = generate_local_filename(base_name)
 	local_path = os.path.join(download_dir, local_name)
 
+	# Content-addressed art never changes, so a local copy is always current
+	if _CONTENT_NAME_RE.search(image_name) and os.path.exists(local_path):
+		return True, local_path
+
 	try:
 		if os.path.exists(local_path):
 			os.remove(local_path)
-		data = supabase.storage.from_(bucket).download(image_name)
+		data = storage.from_(bucket).download(image_name)
 		with open(local_path, "wb") as f:
 			f.write(data)
 		return True, local_path
@@ -35,24 +63,129 @@ def download_image(image_name: str, bucket: str, download_dir: str = "assets/dow
 		return False, f"Failed to download image: {e}"
 
 
+def _download_with_retry(image_name: str, bucket: str, download_dir: str, retries: int) -> tuple[bool, str]:
+	success, result = False, "No download attempted."
+	for attempt in range(max(1, retries)):
+		success, result = download_image(image_name, bucket, download_dir)
+		if success:
+			break
+		if attempt < retries - 1:
+			time.sleep(BULK_DOWNLOAD_BACKOFF_SEC * (2 ** attempt))
+	return success, result
+
+
+def download_images(
+	objects: list[tuple[str, str]],
+	download_dirs: dict[str, str] = None,
+	max_workers: int = BULK_DOWNLOAD_WORKERS,
+	retries: int = BULK_DOWNLOAD_RETRIES,
+) -> dict[tuple[str, str], tuple[bool, str]]:
+	"""
+	Downloads many (bucket, image_name) pairs concurrently.
+	- download_dirs: bucket → local directory (defaults to 'assets/downloaded_images')
+	Duplicate pairs are fetched once. Every pair gets its own (success, path or error)
+	result, so one missing image never hides the others.
+	"""
+	download_dirs = download_dirs or {}
+	unique = list(dict.fromkeys(objects))
+	results = {}
+
+	missing = [pair for pair in unique if not pair[1]]
+	for pair in missing:
+		results[pair] = (False, "No image set.")
+
+	pending = [pair for pair in unique if pair[1]]
+	if not pending:
+		return results
+
+	with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as pool:
+		futures = {
+			pair: pool.submit(
+				_download_with_retry,
+				pair[1],
+				pair[0],
+				download_dirs.get(pair[0], "assets/downloaded_images"),
+				retries,
+			)
+			for pair in pending
+		}
+		for pair, future in futures.items():
+			try:
+				results[pair] = future.result()
+			except Exception as e:
+				results[pair] = (False, f"Failed to download image: {e}")
+
+	return results
+
+
+def object_exists(file_name: str, bucket: str) -> bool:
+	"""Checks whether an object with exactly this name is already in the bucket."""
+	if (bucket, file_name) in _known_objects:
+		return True
+	try:
+		entries = storage.from_(bucket).list(None, {"limit": 10, "offset": 0, "search": file_name})
+	except Exception as e:
+		print(f"Storage list error for {bucket}/{file_name}: {e}")
+		return False
+	if any(entry.get("name") == file_name for entry in entries or []):
+		_known_objects.add((bucket, file_name))
+		return True
+	return False
+
+
+def _storage_error_body(error) -> dict:
+	"""
+	The storage API's error body ({"statusCode", "error", "message"}) from a failed
+	upload response, or from the StorageException storage3 raises (its first arg).
+	"""
+	if isinstance(error, Exception):
+		body = error.args[0] if error.args else None
+		return body if isinstance(body, dict) else {}
+	try:
+		body = error.json()
+	except Exception:
+		return {}
+	return body if isinstance(body, dict) else {}
+
+
+def _is_duplicate_error(error) -> bool:
+	"""Whether an upload failed because the object already exists (HTTP 409 / "Duplicate")."""
+	if getattr(error, "status_code", None) == 409:
+		return True
+	body = _storage_error_body(error)
+	return str(body.get("statusCode")) == "409" or body.get("error") == "Duplicate"
+
+
 def upload_image(name: str, image_bytes: bytes, bucket: str) -> tuple[bool, str]:
 	"""
-	Uploads an image using a flat name like 'new_card.png', overwriting any existing file.
+	Uploads an image under an immutable, content-addressed name (see generate_content_filename).
+	Identical bytes map to the same object, so an unchanged image is never re-uploaded.
+	Returns (success, object name or error string); callers store the name on the record.
 	"""
-	safe_name = re.sub(r"\W+", "_", name.lower()).strip("_")
-	file_name = f"{safe_name}.png"
+	file_name = generate_content_filename(name, image_bytes)
+
+	if object_exists(file_name, bucket):
+		return True, file_name
 
 	try:
-		upload_response = supabase.storage.from_(bucket).upload(
+		upload_response = storage.from_(bucket).upload(
 			file_name,
 			image_bytes,
-			{"content-type": "image/png", "x-upsert": "true"}
+			{"content-type": "image/png", "cache-control": IMMUTABLE_CACHE_CONTROL, "x-upsert": "false"}
 		)
 
 		if hasattr(upload_response, "status_code") and upload_response.status_code >= 400:
+			# Lost a race with another upload of the same bytes: the object is already there
+			if _is_duplicate_error(upload_response):
+				_known_objects.add((bucket, file_name))
+				return True, file_name
 			return False, f"Upload failed: {upload_response.text}"
 
+		_known_objects.add((bucket, file_name))
 		return True, file_name
 
 	except Exception as e:
+		if _is_duplicate_error(e):
+			_known_objects.add((bucket, file_name))
+			return True, file_name
 		return False, f"Exception during upload: {e}"
@@ -0,0 +1,13 @@
+import os
+import sys
+
+# Run from the repo root so top-level modules (supabase_client, ...) import as the bot does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# supabase_client builds its client and constants parses its ids at import time;
+# placeholders let pure helpers be imported without a .env. Nothing in the tests
+# touches the network or Discord.
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test.test.test")
+os.environ.setdefault("DEV_GUILD_ID", "0")
+os.environ.setdefault("BOT_PLAYER_ID", "0")
@@ -0,0 +1,101 @@
+"""
+summarize_activity is the Python fallback for the daily_activity_summary RPC
+(sql/daily_activity_summary.sql). These tests pin the fallback to the semantics
+documented in the SQL file's header, and its fields to the keys the function
+builds. The SQL itself is not executed here; expected values are worked out by
+hand from those documented semantics.
+"""
+import os
+import re
+
+from azoth_commands.activity_stats import summarize_activity, finalize_summary
+
+SQL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql", "daily_activity_summary.sql")
+
+
+def game(player_uuid="p1", level=1, combo=0, act=1, turns=10, elapsed=100, result="loss"):
+    return {
+        "uuid": None, "player_uuid": player_uuid, "level_reached": level, "highest_combo": combo,
+        "act_reached": act, "turns_played": turns, "elapsed_sec": elapsed, "result": result,
+    }
+
+
+def sql_fields() -> list[str]:
+    """Keys of the jsonb object the SQL function returns, in order."""
+    with open(SQL_PATH) as f:
+        sql = f.read()
+    body = sql[sql.index("jsonb_build_object("):]
+    return re.findall(r"'(\w+)',\s*\w+\.\w+", body[:body.index(")\n")])
+
+
+def test_summary_fields_match_sql_keys():
+    assert list(summarize_activity([], 0, [])) == sql_fields()
+
+
+def test_empty_range():
+    # Every count and maximum is zero, and there are no result buckets
+    expected = {
+        "total_games": 0, "unique_players": 0, "new_players": 0, "max_level": 0, "max_combo": 0, "max_act": 0,
+        "duration_sum": 0, "duration_count": 0, "turns_sum": 0, "turns_count": 0, "game_results": {},
+        "total_boss_fights": 0, "boss_wins": 0, "boss_losses": 0,
+    }
+    summary = summarize_activity([], 0, [])
+    assert summary == expected
+    stats = finalize_summary(summary)
+    assert stats["avg_duration_sec"] == 0 and stats["avg_turns"] == 0
+
+
+def test_null_player_counts_as_one_player():
+    games = [game("p1"), game("p1"), game("p2"), game(None), game(None)]
+    assert summarize_activity(games, 0, [])["unique_players"] == 3
+
+
+def test_zero_and_null_durations_and_turns_are_excluded():
+    games = [
+        game(elapsed=100, turns=10),
+        game(elapsed=0, turns=0),
+        game(elapsed=None, turns=None),
+        game(elapsed=300, turns=30),
+    ]
+    summary = summarize_activity(games, 0, [])
+    assert (summary["duration_sum"], summary["duration_count"]) == (400, 2)
+    assert (summary["turns_sum"], summary["turns_count"]) == (40, 2)
+    stats = finalize_summary(summary)
+    assert stats["avg_duration_sec"] == 200
+    assert stats["avg_turns"] == 20
+    assert stats["total_playtime_sec"] == 400
+
+
+def test_boss_fights():
+    fights = [{"result": "win"}, {"result": "win"}, {"result": "loss"}, {"result": None}]
+    summary = summarize_activity([], 0, fights)
+    assert (summary["total_boss_fights"], summary["boss_wins"], summary["boss_losses"]) == (4, 2, 1)
+
+
+def test_documented_semantics():
+    games = [
+        game("p1", level=3, combo=5, act=2, turns=12, elapsed=600, result="win"),
+        game("p1", level=1, combo=2, act=1, turns=0, elapsed=None, result="loss"),
+        game(None, level=None, combo=None, act=None, turns=None, elapsed=0, result=None),
+        game("p2", level=2, combo=9, act=1, turns=8, elapsed=200, result=""),
+    ]
+    fights = [{"result": "win"}, {"result": "loss"}, {"result": "loss"}]
+    # NULL player counts once, zero / NULL durations and turns are skipped,
+    # NULL and empty results are bucketed as "unknown"
+    expected = {
+        "total_games": 4,
+        "unique_players": 3,
+        "new_players": 2,
+        "max_level": 3,
+        "max_combo": 9,
+        "max_act": 2,
+        "duration_sum": 800,
+        "duration_count": 2,
+        "turns_sum": 20,
+        "turns_count": 2,
+        "game_results": {"win": 1, "loss": 1, "unknown": 2},
+        "total_boss_fights": 3,
+        "boss_wins": 1,
+        "boss_losses": 2,
+    }
+    assert summarize_activity(games, 2, fights) == expected